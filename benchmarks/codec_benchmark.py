@@ -0,0 +1,85 @@
+"""
+Compare the JSON codecs on representative payloads: a by-uris response
+with many entities and a resolve request body.
+
+Usage: python benchmarks/codec_benchmark.py [--entities 500] [--repeat 20]
+"""
+
+import argparse
+import timeit
+
+from inventaire.utils.codec import CODEC_NAMES, get_codec
+
+
+def by_uris_response(count: int) -> dict:
+    """A by-uris like response with count works"""
+    return {
+        "entities": {
+            f"wd:Q{i}": {
+                "uri": f"wd:Q{i}",
+                "type": "work",
+                "labels": {"en": f"Work {i}", "fr": f"Œuvre {i}", "de": f"Werk {i}"},
+                "descriptions": {"en": "novel by an author of the twentieth century"},
+                "claims": {
+                    "wdt:P31": ["wd:Q47461344"],
+                    "wdt:P50": [f"wd:Q{i + 100000}"],
+                    "wdt:P136": ["wd:Q8261", "wd:Q24925"],
+                    "wdt:P577": ["1947-03-01"],
+                },
+                "image": {"url": f"/img/entities/{i:040x}"},
+                "lastrevid": 1_000_000 + i,
+            }
+            for i in range(count)
+        },
+        "redirects": {},
+    }
+
+
+def resolve_body(count: int) -> dict:
+    """A resolve request body with count entries"""
+    return {
+        "entries": [
+            {
+                "edition": {"isbn": f"978{i:010d}"},
+                "works": [{"labels": {"en": f"Work {i}"}}],
+                "authors": [{"labels": {"en": f"Author {i}"}}],
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "by-uris": by_uris_response(args.entities),
+        "resolve": resolve_body(args.entities),
+    }
+    stdlib = get_codec("stdlib")
+    print(f"{'codec':<8} {'payload':<8} {'size':>10} {'dumps ms':>10} {'loads ms':>10}")
+    for name in CODEC_NAMES:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        for payload_name, payload in payloads.items():
+            encoded = stdlib.dumps(payload)
+            dumps = min(
+                timeit.repeat(lambda: codec.dumps(payload), number=1, repeat=args.repeat)
+            )
+            loads = min(
+                timeit.repeat(lambda: codec.loads(encoded), number=1, repeat=args.repeat)
+            )
+            print(
+                f"{name:<8} {payload_name:<8} {len(encoded):>10} "
+                f"{dumps * 1000:>10.2f} {loads * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
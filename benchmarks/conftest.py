@@ -0,0 +1,73 @@
+import importlib.util
+import os
+
+import pytest
+
+from inventaire.inventaire import Inventaire
+from inventaire.testing.server import StandInServer
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), ".benchmarks")
+# pytest-benchmark default, relative to the working directory
+DEFAULT_STORAGE = "file://./.benchmarks"
+# A regression threshold, e.g. min:25%, to compare the runs to the baseline
+COMPARE_ENV_VAR = "INVENTAIRE_BENCHMARK_COMPARE"
+
+# The suite needs pytest-benchmark, don't collect it when it is missing
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Store the runs next to this file, and only check regressions when asked
+    to and when a baseline exists for this interpreter and platform
+    """
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from pytest_benchmark.utils import get_machine_id, parse_compare_fail
+
+    option = config.option
+    if option.benchmark_storage == DEFAULT_STORAGE:
+        option.benchmark_storage = f"file://{BASELINE_DIR}"
+    threshold = os.environ.get(COMPARE_ENV_VAR)
+    if threshold:
+        option.benchmark_compare = option.benchmark_compare or True
+        option.benchmark_compare_fail = option.benchmark_compare_fail or [
+            parse_compare_fail(threshold)
+        ]
+
+    storage = option.benchmark_storage.removeprefix("file://")
+    if not os.path.isdir(os.path.join(storage, get_machine_id())):
+        option.benchmark_compare = None
+        option.benchmark_compare_fail = None
+
+
+class CannedResponse:
+    """A response returned without any network round-trip"""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="session", name="stand_in")
+def fixture_stand_in():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session", name="inv")
+def fixture_inv(stand_in):
+    return Inventaire(
+        base_url=stand_in.url,
+        username="user",
+        password="pwd",
+        pool={"pool_maxsize": 16},
+    )
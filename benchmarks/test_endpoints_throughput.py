@@ -0,0 +1,42 @@
+"""Throughput of every endpoint class under concurrency, against the stand-in server"""
+
+import pytest
+
+CALLS_PER_ROUND = 32
+MAX_WORKERS = 8
+
+# One representative call per endpoint class. The activity pub and
+# invitations endpoints are not implemented, so they are left out.
+ENDPOINT_CALLS = {
+    "auth": lambda api: api.auth.login_user("user", "pwd"),
+    "data": lambda api: api.data.get_isbn_basic_facts("9782253138938"),
+    "entities": lambda api: api.entities.get_entities_by_uris(
+        [f"wd:Q{i}" for i in range(1, 51)]
+    ),
+    "groups": lambda api: api.groups.get_group_by_id("g1"),
+    "images": lambda api: api.images.upload(image_data=b"\xff\xd8" * 1024),
+    "items": lambda api: api.items.get_items_by_users("u1", limit=50),
+    "search": lambda api: api.search.search("dune", limit=20),
+    "shelves": lambda api: api.shelves.get_shelves_by_owners(["u1", "u2"]),
+    "transactions": lambda api: api.transactions.get_transactions(),
+    "user": lambda api: api.user.get_authentified_user(),
+    "users": lambda api: api.users.get_users_by_ids(["u1", "u2", "u3"]),
+}
+
+
+@pytest.mark.parametrize("endpoint", sorted(ENDPOINT_CALLS))
+def test_endpoint_throughput(benchmark, inv, endpoint):
+    call = ENDPOINT_CALLS[endpoint]
+    calls = [lambda: call(inv.api)] * CALLS_PER_ROUND
+    benchmark.extra_info["calls_per_round"] = CALLS_PER_ROUND
+    benchmark.extra_info["max_workers"] = MAX_WORKERS
+
+    results = benchmark.pedantic(
+        inv.api.session.gather,
+        args=(calls,),
+        kwargs={"max_workers": MAX_WORKERS},
+        rounds=10,
+        warmup_rounds=1,
+    )
+
+    assert len(results) == CALLS_PER_ROUND
@@ -0,0 +1,38 @@
+"""Time to import the package and to build a client"""
+
+import subprocess
+import sys
+
+# Regression threshold of the package own import time, in microseconds
+MAX_IMPORT_US = 20_000
+
+
+def import_time_us(module: str) -> int:
+    """Return the cumulative import time of a module, measured in a fresh interpreter"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} was not imported")
+
+
+def test_import_package(benchmark):
+    cumulative = benchmark.pedantic(import_time_us, args=("inventaire",), rounds=5)
+    benchmark.extra_info["cumulative_us"] = cumulative
+
+    assert cumulative < MAX_IMPORT_US
+
+
+def test_import_client(benchmark):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "from inventaire import Inventaire"],),
+        kwargs={"check": True},
+        rounds=5,
+    )
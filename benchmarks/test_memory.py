@@ -0,0 +1,67 @@
+"""Memory held per cached entity, as a response body, a decoded dict or a model"""
+
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from inventaire.server.models import Entity
+from inventaire.utils.cache import ResponseCache
+
+ENTITIES_COUNT = 2000
+# Regression thresholds in bytes per entity
+MAX_BYTES = {"cached_body": 1000, "decoded_dict": 3000, "model": 2100}
+
+
+def make_entity(index: int) -> dict:
+    return {
+        "uri": f"wd:Q{index}",
+        "type": "work",
+        "labels": {"en": f"Work {index}", "fr": f"Œuvre {index}", "de": f"Werk {index}"},
+        "claims": {
+            "wdt:P31": ["wd:Q47461344"],
+            "wdt:P50": [f"wd:Q{index % 100}"],
+            "wdt:P577": ["1947-03-01"],
+        },
+        "lastrevid": index,
+    }
+
+
+def bytes_per_entity(build) -> float:
+    """Return the memory held by what build returns, per entity"""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    held = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del held
+    return size / ENTITIES_COUNT
+
+
+def cache_bodies():
+    cache = ResponseCache(max_size=ENTITIES_COUNT)
+    for index in range(ENTITIES_COUNT):
+        body = json.dumps({"entities": {f"wd:Q{index}": make_entity(index)}}).encode()
+        cache.set(("entities/by-uris", (("uris", f"wd:Q{index}"),)), body, 3600)
+    return cache
+
+
+def decoded_dicts():
+    return [json.loads(json.dumps(make_entity(index))) for index in range(ENTITIES_COUNT)]
+
+
+def models():
+    return [Entity(json.loads(json.dumps(make_entity(index)))) for index in range(ENTITIES_COUNT)]
+
+
+@pytest.mark.parametrize(
+    "name, build",
+    [("cached_body", cache_bodies), ("decoded_dict", decoded_dicts), ("model", models)],
+)
+def test_memory_per_entity(benchmark, name, build):
+    size = benchmark.pedantic(bytes_per_entity, args=(build,), rounds=3)
+    benchmark.extra_info["bytes_per_entity"] = round(size)
+
+    assert size < MAX_BYTES[name]
@@ -0,0 +1,62 @@
+"""Per-call client overhead, measured without network round-trips"""
+
+import json
+
+import pytest
+
+from inventaire.utils.common import dict_merge
+
+from .conftest import CannedResponse
+
+URIS = [f"wd:Q{i}" for i in range(1, 51)]
+BY_URIS_BODY = json.dumps(
+    {
+        "entities": {
+            uri: {
+                "uri": uri,
+                "type": "work",
+                "labels": {"en": f"Work {uri}", "fr": f"Œuvre {uri}"},
+                "claims": {"wdt:P31": ["wd:Q47461344"], "wdt:P50": ["wd:Q535"]},
+                "lastrevid": 1,
+            }
+            for uri in URIS
+        },
+        "redirects": {},
+    }
+).encode()
+
+
+@pytest.fixture(name="canned_session")
+def fixture_canned_session(inv, mocker):
+    session = inv.api.session
+    mocker.patch.object(
+        session._session, "request", return_value=CannedResponse(BY_URIS_BODY)
+    )
+    return session
+
+
+def test_get_overhead(benchmark, canned_session):
+    benchmark(canned_session.get, "entities/by-uris", params={"uris": "|".join(URIS)})
+
+
+def test_post_overhead(benchmark, canned_session):
+    entries = [{"edition": {"isbn": "9782253138938"}}] * 10
+    benchmark(canned_session.post, "entities/resolve", json={"entries": entries})
+
+
+def test_by_uris_endpoint_overhead(benchmark, inv, canned_session):
+    benchmark(inv.api.entities.get_entities_by_uris, URIS)
+
+
+def test_dict_merge_payload(benchmark):
+    data = {"attributes": ["labels", "claims"], "lang": "fr", "extra": {"a": [1, 2, 3]}}
+    params = {"refresh": "true", "autocreate": "false", "uris": "|".join(URIS)}
+    benchmark(dict_merge, data, params)
+
+
+def test_decode_by_uris(benchmark, inv):
+    benchmark(inv.api.session._decode, BY_URIS_BODY)
+
+
+def test_round_trip(benchmark, inv):
+    benchmark(inv.api.session.get, "entities/by-uris", params={"uris": "wd:Q1"})
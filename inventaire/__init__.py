@@ -1,3 +1,35 @@
-from inventaire.inventaire import Inventaire
-from inventaire.session import InventaireSession
-from inventaire.utils.common import cookie_str_to_dict
+"""
+Inventaire API client. Names are imported lazily on first access, so
+'import inventaire' stays cheap for short-lived processes.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from inventaire.async_session import AsyncInventaireSession
+    from inventaire.inventaire import AsyncInventaire, Inventaire
+    from inventaire.session import InventaireSession
+    from inventaire.utils.common import cookie_str_to_dict
+
+_LAZY_NAMES = {
+    "AsyncInventaire": "inventaire.inventaire",
+    "AsyncInventaireSession": "inventaire.async_session",
+    "Inventaire": "inventaire.inventaire",
+    "InventaireSession": "inventaire.session",
+    "cookie_str_to_dict": "inventaire.utils.common",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
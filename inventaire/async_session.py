@@ -0,0 +1,315 @@
+"""
+A module for Inventaire asyncio session object.
+"""
+
+import asyncio
+import logging
+import time
+from base64 import b64encode
+
+from requests import HTTPError
+
+from inventaire.session import INIT_SESSION_MSG, InvalidAuthData
+from inventaire.utils.codec import encode_json_body, get_codec
+from inventaire.utils.compression import accept_encoding, get_compression
+from inventaire.utils.instrumentation import RequestEvent, RequestHooks
+
+AIOHTTP_MISSING_MSG = (
+    "AsyncInventaireSession requires aiohttp, "
+    "install it with 'pip install inventaire-python-api[async]'"
+)
+
+# The InventaireSession options relying on blocking requests and threads
+BLOCKING_ONLY_OPTIONS = (
+    "cache",
+    "retry",
+    "circuit_breaker",
+    "rate_limiter",
+    "pool",
+    "single_flight",
+)
+ASYNC_OPTIONS = (
+    "session_attrs",
+    "max_connections",
+    "entity_store",
+    "claims_index",
+    "codec",
+    "hooks",
+    "compression",
+)
+
+
+def _aiohttp_accept_encoding() -> str:
+    """Return the Accept-Encoding header value for the encodings aiohttp can decode"""
+    # pylint: disable-next=import-outside-toplevel
+    from aiohttp import compression_utils
+
+    decodable = ["gzip", "deflate"]
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        decodable.append("br")
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        decodable.append("zstd")
+    return accept_encoding(decodable)
+
+
+def _check_options(options: dict):
+    """Reject the options AsyncInventaireSession would otherwise silently ignore"""
+    for name in options:
+        if name in BLOCKING_ONLY_OPTIONS:
+            raise TypeError(
+                f"{name} is only supported by InventaireSession, "
+                "AsyncInventaireSession does not accept it"
+            )
+        if name not in ASYNC_OPTIONS:
+            raise TypeError(
+                f"AsyncInventaireSession got an unexpected keyword argument '{name}'"
+            )
+
+
+def _aiohttp():
+    """Import aiohttp on first use, it is an optional and slow to import dependency"""
+    try:
+        import aiohttp  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(AIOHTTP_MISSING_MSG) from error
+    return aiohttp
+
+
+class AsyncInventaireSession:  # pylint: disable=too-many-instance-attributes
+    """
+    Inventaire asyncio session object. Mirrors InventaireSession, but every
+    request wrapper is a coroutine, so many requests can be in flight at once.
+
+    The underlying aiohttp session is created lazily on the first request,
+    inside the running event loop, and must be released with close()
+    (or by using the session as an async context manager).
+
+    :param base_url: url to make requests to
+    :param token: auth token
+    :param username: username
+    :param password: password
+    :param cookies: cookie dict
+
+    :param keyword session_attrs: a dict with extra aiohttp.ClientSession arguments
+    :param keyword max_connections: max number of simultaneous connections
+    :param keyword entity_store: an EntityStore the entities endpoints read through
+    :param keyword claims_index: a ClaimsIndex filled with the fetched entities,
+                                 answering reverse claims queries locally
+    :param keyword codec: a JsonCodec or codec name for request bodies and responses,
+                          defaults to the fastest installed one (see get_codec)
+    :param keyword hooks: observers of every request, e.g. a LatencyHistogram,
+                          registered on the session RequestHooks
+    :param keyword compression: a RequestCompression for large POST and PUT bodies,
+                                or True to use the default one
+
+    :raises: TypeError if given a blocking only option (cache, retry, circuit_breaker,
+             rate_limiter, pool, single_flight) or an unknown one
+    """
+
+    # Endpoints check it for the features only blocking sessions support
+    is_async = True
+
+    # token is accepted but unused, like in InventaireSession
+    def __init__(  # pylint: disable=unused-argument
+        self, base_url, token=None, username=None, password=None, cookies=None, **kwargs
+    ):
+        _check_options(kwargs)
+        _aiohttp()
+
+        self.base_url = base_url
+        self._session = None
+        self._headers = {"Accept-Encoding": _aiohttp_accept_encoding()}
+        self._cookies = None
+
+        self.logger = logging.getLogger(__name__)
+
+        if username and password:
+            self.logger.debug(INIT_SESSION_MSG.format("username and password"))
+            credentials = b64encode(f"{username}:{password}".encode()).decode()
+            self._headers["Authorization"] = f"Basic {credentials}"
+        elif cookies:
+            self.logger.debug(INIT_SESSION_MSG.format("cookies"))
+            self._cookies = cookies
+        else:
+            raise InvalidAuthData("Insufficient auth data")
+
+        self._session_attrs = kwargs.get("session_attrs") or {}
+        self._max_connections = kwargs.get("max_connections", 100)
+        self.entity_store = kwargs.get("entity_store")
+        self.claims_index = kwargs.get("claims_index")
+        self.codec = get_codec(kwargs.get("codec"))
+        self.hooks = RequestHooks(*(kwargs.get("hooks") or ()))
+        self.compression = get_compression(kwargs.get("compression"))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _create_url(self, *args):
+        """Helper for URL creation"""
+        return self.base_url + "/".join(args)
+
+    def _get_session(self):
+        """Create the aiohttp session on first use, inside the running loop"""
+        if self._session is None or self._session.closed:
+            self.logger.debug(
+                f"Create aiohttp session object with {self._session_attrs}"
+            )
+            connector = _aiohttp().TCPConnector(limit=self._max_connections)
+            self._session = _aiohttp().ClientSession(
+                headers=self._headers,
+                cookies=self._cookies,
+                connector=connector,
+                **self._session_attrs,
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying aiohttp session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def gather(self, calls, max_workers: int | None = None) -> list:
+        """
+        Await request callables concurrently.
+
+        :param calls: iterable of zero-argument callables returning awaitables
+        :param max_workers: max number of requests in flight
+
+        :return: list of the callables results, in the calls order
+        """
+        semaphore = asyncio.Semaphore(max_workers or self._max_connections)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(call) for call in calls))
+
+    async def then(self, result, callback):
+        """
+        Apply a callback to an awaited request result. Endpoints use it to
+        post-process responses the same way for blocking and asyncio sessions.
+        """
+        return callback(await result)
+
+    async def _request(
+        self, method: str, endpoint: str, return_raw: bool = False, **kwargs
+    ):
+        """
+        General request wrapper with logging and handling response
+
+        :param method: request method
+        :param endpoint: endpoint to make request to
+        :param return_raw: whether to return raw response or not
+
+        :raises: HTTPError if response status code is 400 or higher
+
+        :return: response json, empty str or raw response
+        """
+        self.logger.debug(
+            f"{method.capitalize()} data: endpoint={endpoint} and {kwargs}"
+        )
+        url = self._create_url(endpoint)
+        if kwargs.get("params") is None:
+            kwargs.pop("params", None)
+        encode_json_body(self.codec, kwargs)
+        if self.compression is not None:
+            self.compression.compress_body(method, kwargs)
+        event = None
+        if self.hooks:
+            event = RequestEvent.for_request(method, endpoint, kwargs)
+            self.hooks.emit("before_request", event)
+        started = time.perf_counter()
+        try:
+            async with self._get_session().request(method, url, **kwargs) as response:
+                content = await response.read()
+        except Exception as error:
+            if event is not None:
+                event.duration = time.perf_counter() - started
+                event.error = error
+                self.hooks.emit("on_error", event)
+            raise
+        if event is not None:
+            event.duration = time.perf_counter() - started
+            event.status = response.status
+            event.response_bytes = len(content)
+            self.hooks.emit("after_response", event)
+        if response.status < 400:
+            if return_raw:
+                return response
+            if content:
+                return self.codec.loads(content)
+            return ""
+        raise HTTPError(f"Error {response.status}. Response: {content}")
+
+    async def get(self, endpoint: str, params: dict | None = None, **kwargs):
+        """
+        Get request wrapper.
+
+        :param endpoint: endpoint to make request to
+        :param params: dict with params to be passed to request
+
+        :return: response json, empty str or raw response
+        """
+        return await self._request("get", endpoint, params=params, **kwargs)
+
+    async def post(self, endpoint: str, json: dict | None = None, **kwargs):
+        """
+        Post request wrapper.
+
+        :param endpoint: endpoint to make request to
+        :param json: json to be passed to request
+
+        :return: response json, empty str or raw response
+        """
+        return await self._request("post", endpoint, json=json, **kwargs)
+
+    async def put(self, endpoint: str, json: dict | None = None, **kwargs):
+        """
+        Put request wrapper
+
+        :param endpoint: endpoint to make request to
+        :param json: json to be passed to request
+
+        :return: response json, empty str or raw response
+        """
+        return await self._request("put", endpoint, json=json, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs):
+        """
+        Delete request wrapper.
+
+        :param endpoint: endpoint to make request to
+
+        :return: response json, empty str or raw response
+        """
+        return await self._request("delete", endpoint, **kwargs)
+
+    async def post_image(
+        self,
+        endpoint: str,
+        file_path: str | None = None,
+        file_bytes: bytes | None = None,
+        filename: str = "upload.jpg",
+        content_type: str = "image/jpeg",
+        **kwargs,
+    ):
+        """
+        Post wrapper to send an image. Can use either a file path or raw file bytes.
+        """
+        if file_path:
+            with open(file_path, "rb") as file:
+                file_bytes = file.read()
+            filename = filename or file_path
+        elif not file_bytes:
+            raise ValueError("Either file_path or file_bytes must be provided.")
+
+        form = _aiohttp().FormData()
+        form.add_field(
+            "file-1", file_bytes, filename=filename, content_type=content_type
+        )
+        return await self._request("post", endpoint, data=form, **kwargs)
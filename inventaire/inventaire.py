@@ -5,7 +5,7 @@ A module with the Inventaire base object.
 import logging
 
 from inventaire.server.helpers import InventaireHelpers
-from inventaire.server.server_api import InventaireApiWrapper
+from inventaire.server.server_api import AsyncInventaireApiWrapper, InventaireApiWrapper
 from inventaire.session import InventaireSession
 
 DEFAULT_BASE_URL = "https://inventaire.io/api/"
@@ -25,7 +25,10 @@ class Inventaire:
 
         session = InventaireSession(base_url=base_url, **kwargs)
         self.api = InventaireApiWrapper(session)
-        self.api.auth.login_user(**kwargs)
+        if kwargs.get("username") and kwargs.get("password"):
+            self.api.auth.login_user(
+                username=kwargs["username"], password=kwargs["password"]
+            )
         self.helpers = InventaireHelpers(session)
 
         self.logger = logging.getLogger(__name__)
@@ -36,3 +39,52 @@ class Inventaire:
         if base_url:
             return cls(base_url=base_url, **kwargs)
         return cls(base_url=DEFAULT_BASE_URL, **kwargs)
+
+
+class AsyncInventaire:
+    """
+    Inventaire asyncio base object. Every api method returns an awaitable.
+    Login happens on entering the async context (or by awaiting login()).
+
+    :param base_url: base API url to connect with. An example for
+                     Inventaire looks like 'https://inventaire.io/api/'
+    """
+
+    def __init__(self, base_url=None, **kwargs):
+        # pylint: disable-next=import-outside-toplevel
+        from inventaire.async_session import AsyncInventaireSession
+
+        base_url = DEFAULT_BASE_URL if not base_url else base_url
+
+        self.session = AsyncInventaireSession(base_url=base_url, **kwargs)
+        self.api = AsyncInventaireApiWrapper(self.session)
+        self.helpers = InventaireHelpers(self.session)
+        self._credentials = {
+            k: kwargs[k] for k in ("username", "password") if kwargs.get(k)
+        }
+
+        self.logger = logging.getLogger(__name__)
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def login(self):
+        """Log in with the username and password the object was created with"""
+        if len(self._credentials) == 2:
+            return await self.api.auth.login_user(**self._credentials)
+        return None
+
+    async def close(self):
+        """Close the underlying session and its connections"""
+        await self.session.close()
+
+    @classmethod
+    async def server_api(cls, base_url: str | None = None, **kwargs):
+        """Alternative constructor for asyncio Inventaire client, logged in"""
+        client = cls(base_url=base_url or DEFAULT_BASE_URL, **kwargs)
+        await client.login()
+        return client
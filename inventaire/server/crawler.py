@@ -0,0 +1,212 @@
+"""
+A module with the bibliography crawler expanding authors and series
+into a graph of works, series, editions and authors.
+"""
+
+import logging
+
+from inventaire.server import endpoints
+from inventaire.server.endpoints.common import require_blocking
+from inventaire.utils.common import pipe_split
+
+AUTHOR_PROPERTY = "wdt:P50"
+SERIE_PROPERTY = "wdt:P179"
+WORK_PROPERTY = "wdt:P629"
+
+# Graph sections by entity type
+TYPE_SECTIONS = {
+    "human": "authors",
+    "work": "works",
+    "serie": "series",
+    "edition": "editions",
+}
+
+
+class BibliographyGraph:
+    """
+    Deduplicated graph of crawled entities. Edges are (subject, property,
+    object) triples following the entities claims direction, e.g. a work
+    has an author: (work_uri, 'wdt:P50', author_uri). Edges of the last
+    level may point to entities beyond the depth limit, which are not fetched.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.edges = set()
+        self.redirects = {}
+
+    def __repr__(self):
+        counts = ", ".join(
+            f"{name}={len(self.section(name))}" for name in TYPE_SECTIONS.values()
+        )
+        return f"BibliographyGraph({counts}, edges={len(self.edges)})"
+
+    def canonical(self, uri: str) -> str:
+        """Return the URI a redirected URI points to"""
+        return self.redirects.get(uri, uri)
+
+    def add_edge(self, subject: str, prop: str, obj: str):
+        """Add an edge between two entities"""
+        self.edges.add((self.canonical(subject), prop, self.canonical(obj)))
+
+    def section(self, name: str) -> dict:
+        """Return the entities of a section ('authors', 'works', 'series' or 'editions')"""
+        return {
+            uri: entity
+            for uri, entity in self.entities.items()
+            if TYPE_SECTIONS.get(entity.get("type")) == name
+        }
+
+    @property
+    def authors(self) -> dict:
+        """Author entities by URI"""
+        return self.section("authors")
+
+    @property
+    def works(self) -> dict:
+        """Work entities by URI"""
+        return self.section("works")
+
+    @property
+    def series(self) -> dict:
+        """Serie entities by URI"""
+        return self.section("series")
+
+    @property
+    def editions(self) -> dict:
+        """Edition entities by URI"""
+        return self.section("editions")
+
+    def to_json(self) -> dict:
+        """Return the graph sections and sorted edges as json serializable data"""
+        return {
+            **{name: self.section(name) for name in TYPE_SECTIONS.values()},
+            "edges": sorted(self.edges),
+            "redirects": self.redirects,
+        }
+
+
+class BibliographyCrawler:
+    """
+    Breadth-first crawler building bibliographies. Starting from author or
+    serie URIs, each level is fetched with batched by-uris calls, then
+    expanded: authors to their works and series, series to their parts,
+    works to their authors, series and editions, and editions to their works.
+    A visited set ensures every entity is fetched and expanded only once.
+
+    :param entities: entities endpoints, bound to an InventaireSession
+    :param max_depth: number of expansion levels from the start URIs
+    :param max_workers: max number of requests in flight
+    :param editions: whether to expand works to their editions
+    :raises: TypeError if the endpoints are bound to an AsyncInventaireSession
+    """
+
+    def __init__(
+        self,
+        entities: endpoints.EntitiesEndpoints,
+        max_depth: int = 2,
+        max_workers: int = 4,
+        editions: bool = True,
+    ):
+        require_blocking(entities.session, "BibliographyCrawler")
+        self.entities = entities
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.editions = editions
+        self.logger = logging.getLogger(__name__)
+
+    def _expansion_calls(self, uri: str, entity: dict) -> list:
+        """
+        Return the calls expanding an entity. Each call returns a list of
+        (subject, property, object) edges to neighbouring entities.
+        """
+        entity_type = entity.get("type")
+        calls = []
+        if entity_type == "human":
+
+            def author_works():
+                response = self.entities.get_author_works(uri)
+                return [
+                    (record["uri"], AUTHOR_PROPERTY, uri)
+                    for section in ("works", "series")
+                    for record in response.get(section, [])
+                ]
+
+            calls.append(author_works)
+        elif entity_type == "serie":
+
+            def serie_parts():
+                response = self.entities.get_serie_parts(uri)
+                return [
+                    (part["uri"], SERIE_PROPERTY, uri)
+                    for part in response.get("parts", [])
+                ]
+
+            calls.append(serie_parts)
+        elif entity_type == "work" and self.editions:
+
+            def work_editions():
+                response = self.entities.get_entities_by_claims(WORK_PROPERTY, uri)
+                return [
+                    (edition_uri, WORK_PROPERTY, uri)
+                    for edition_uri in response.get("uris", [])
+                ]
+
+            calls.append(work_editions)
+
+        claims = entity.get("claims") or {}
+        props = {
+            "work": (AUTHOR_PROPERTY, SERIE_PROPERTY),
+            "serie": (AUTHOR_PROPERTY,),
+            "edition": (WORK_PROPERTY,),
+        }.get(entity_type, ())
+        graph_edges = [
+            (uri, prop, value) for prop in props for value in claims.get(prop, [])
+        ]
+        if graph_edges:
+            calls.append(lambda: graph_edges)
+        return calls
+
+    def crawl(self, uris: str | list[str]) -> BibliographyGraph:
+        """
+        Crawl the bibliographies of authors or series.
+
+        :param uris: author or serie URIs, as a list or separated by pipes
+        :returns: the BibliographyGraph of the crawled entities
+        """
+        graph = BibliographyGraph()
+        frontier = pipe_split(uris)
+        visited = set(frontier)
+        for depth in range(self.max_depth + 1):
+            if not frontier:
+                break
+            self.logger.debug(f"Crawl level {depth}: {len(frontier)} entities")
+            response = self.entities.get_entities_by_uris(
+                frontier, max_workers=self.max_workers
+            )
+            graph.redirects.update(response.get("redirects", {}))
+            fetched = response.get("entities", {})
+            graph.entities.update(fetched)
+            visited.update(fetched)
+            if depth == self.max_depth:
+                break
+
+            calls = [
+                call
+                for uri, entity in fetched.items()
+                for call in self._expansion_calls(uri, entity)
+            ]
+            frontier = []
+            for edges in self.entities.session.gather(calls, max_workers=self.max_workers):
+                for subject, prop, obj in edges:
+                    graph.add_edge(subject, prop, obj)
+                    for uri in (subject, obj):
+                        if uri not in visited:
+                            visited.add(uri)
+                            frontier.append(uri)
+        # Redirects found at a level also apply to the edges of previous levels
+        graph.edges = {
+            (graph.canonical(subject), prop, graph.canonical(obj))
+            for subject, prop, obj in graph.edges
+        }
+        return graph
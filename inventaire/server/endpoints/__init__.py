@@ -1,13 +1,52 @@
-from .activity_pub import ActivityPubEndpoints
-from .auth import AuthEndpoints
-from .data import DataEndpoints
-from .entities import EntitiesEndpoints
-from .groups import GroupsEndpoints
-from .images import ImagesEndpoints
-from .invitations import InvitationsEndpoints
-from .items import ItemsEndpoints
-from .search import SearchEndpoints
-from .shelves import ShelvesEndpoints
-from .transactions import TransactionsEndpoints
-from .user import UserEndpoints
-from .users import UsersEndpoints
+"""
+Endpoint classes, one module per API group. Modules are imported lazily
+on first access of their class.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .activity_pub import ActivityPubEndpoints
+    from .auth import AuthEndpoints
+    from .data import DataEndpoints
+    from .entities import EntitiesEndpoints
+    from .groups import GroupsEndpoints
+    from .images import ImagesEndpoints
+    from .invitations import InvitationsEndpoints
+    from .items import ItemsEndpoints
+    from .search import SearchEndpoints
+    from .shelves import ShelvesEndpoints
+    from .transactions import TransactionsEndpoints
+    from .user import UserEndpoints
+    from .users import UsersEndpoints
+
+_LAZY_NAMES = {
+    "ActivityPubEndpoints": ".activity_pub",
+    "AuthEndpoints": ".auth",
+    "DataEndpoints": ".data",
+    "EntitiesEndpoints": ".entities",
+    "GroupsEndpoints": ".groups",
+    "ImagesEndpoints": ".images",
+    "InvitationsEndpoints": ".invitations",
+    "ItemsEndpoints": ".items",
+    "SearchEndpoints": ".search",
+    "ShelvesEndpoints": ".shelves",
+    "TransactionsEndpoints": ".transactions",
+    "UserEndpoints": ".user",
+    "UsersEndpoints": ".users",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
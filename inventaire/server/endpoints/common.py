@@ -1,6 +1,26 @@
+from inventaire.server.models import to_models
 from inventaire.session import InventaireSession
 
 
+def require_blocking(session, feature: str):
+    """
+    Reject the features only blocking sessions support, such as streamed
+    responses or helpers running endpoints in threads, for asyncio sessions.
+
+    Args:
+        session: The session the endpoints are bound to.
+        feature (str): The feature name, for the error message.
+
+    Raises:
+        TypeError: If the session is an AsyncInventaireSession.
+    """
+    if session.is_async:
+        raise TypeError(
+            f"{feature} is not supported by AsyncInventaireSession, "
+            "use an InventaireSession"
+        )
+
+
 class EndpointTemplate:
     """Class with basic constructor for endpoint classes"""
 
@@ -33,3 +53,33 @@ class EndpointTemplate:
         if action:
             return f"{base}/{action}"
         return base
+
+    def _require_blocking(self, feature: str):
+        """
+        Reject the features only blocking sessions support, such as
+        streamed responses, when the session is an asyncio one.
+
+        Args:
+            feature (str): The feature name, for the error message.
+
+        Raises:
+            TypeError: If the session is an AsyncInventaireSession.
+        """
+        require_blocking(self.session, feature)
+
+    def _with_models(self, response, model: bool, sections: dict):
+        """
+        Replace the records of response sections with compact models
+        when model is set (see inventaire.server.models).
+
+        Args:
+            response: The response, or its awaitable for asyncio sessions.
+            model (bool): Whether to convert the records.
+            sections (dict): Model classes by response section key.
+
+        Returns:
+            The response, with models if model is set.
+        """
+        if not model:
+            return response
+        return self.session.then(response, lambda result: to_models(result, sections))
@@ -1,3 +1,5 @@
+from inventaire.utils.isbn import canonical_isbn13
+
 from .common import EndpointTemplate
 
 
@@ -35,8 +37,11 @@ class DataEndpoints(EndpointTemplate):
 
         Returns:
             Response: The response object from the GET request.
+
+        Raises:
+            ValueError: If the ISBN is invalid, checked before any request.
         """
-        params = {"isbn": isbn}
+        params = {"isbn": canonical_isbn13(isbn)}
         return self.session.get(self._path("isbn"), params=params)
 
     def get_property_values(self, prop: str, entity_type: str):
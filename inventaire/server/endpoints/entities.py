@@ -1,7 +1,29 @@
-from inventaire.utils.common import dict_merge, str_bool
+from inventaire.server.models import Entity
+from inventaire.utils.common import chunk_values, dict_merge, pipe_split, str_bool
+from inventaire.utils.entity_store import entity_revision
+from inventaire.utils.isbn import normalize_uris
 
 from .common import EndpointTemplate
 
+# Max number of URIs and max url-encoded length of the 'uris' param per by-uris request
+MAX_URIS_PER_REQUEST = 50
+MAX_URIS_PARAM_LENGTH = 4000
+
+
+def merge_by_uris_responses(responses: list[dict]) -> dict:
+    """
+    Merge the 'entities', 'redirects' and 'notFound' sections
+    of several by-uris responses into one response.
+    """
+    merged = {"entities": {}, "redirects": {}, "notFound": []}
+    for response in responses:
+        merged["entities"].update(response.get("entities", {}))
+        merged["redirects"].update(response.get("redirects", {}))
+        merged["notFound"].extend(response.get("notFound", []))
+    if not merged["notFound"]:
+        del merged["notFound"]
+    return merged
+
 
 class EntitiesEndpoints(EndpointTemplate):
     """
@@ -163,47 +185,234 @@ class EntitiesEndpoints(EndpointTemplate):
         """
         raise NotImplementedError
 
-    def get_entities_by_uris(
+    def get_entities_by_uris(  # pylint: disable=too-many-locals
         self,
-        uris: str,
+        uris: str | list[str],
         refresh: bool | None = None,
         autocreate: bool | None = None,
         data: dict | None = None,
+        chunk_size: int = MAX_URIS_PER_REQUEST,
+        max_workers: int | None = None,
+        stream: bool = False,
+        model: bool = False,
     ):
         """
-        Get entities by URIs.
+        Get entities by URIs. Any number of URIs can be passed: they are split
+        into chunks small enough for the server and fetched concurrently, and
+        the 'entities', 'redirects' and 'notFound' sections are merged.
+
+        ISBN URIs are validated and canonicalized locally first: hyphenated
+        and ISBN-10 forms are sent as ISBN-13 and reported as 'redirects',
+        and invalid ones are not sent but reported as 'notFound'.
+
+        If the session has an entity store, fresh stored entities are served
+        from it and only the stale or missing ones are fetched, unless refresh
+        is set or extra data params are passed.
 
         Parameters:
-            uris (str): A title, author, or ISBN (e.g. 'wd:Q3203603|isbn:9782290349229')
+            uris (str or list[str]): A title, author, or ISBN separated
+                by pipes or a list of elements
+                (e.g. 'wd:Q3203603|isbn:9782290349229').
             refresh (bool, optional): Request non-cached data.
             autocreate (bool, optional): If True, create an item if it doesn't exist.
             data (dict, optional): Additional parameters to include in the request.
+            chunk_size (int, optional): Max number of URIs per request.
+                Defaults to MAX_URIS_PER_REQUEST.
+            max_workers (int, optional): Max number of chunks fetched at once.
+            stream (bool, optional): If True, fetch the chunks one after the
+                other, parse them while they are downloaded and return an
+                iterator over the (uri, entity) pairs of the 'entities' sections.
+                Entities of canonicalized ISBN URIs are also yielded under each
+                form passed, while invalid ISBN URIs and the server 'redirects'
+                and 'notFound' sections are not reported.
+                Not supported by asyncio sessions.
+            model (bool, optional): If True, return the entities as compact Entity
+                models instead of dicts (see inventaire.server.models).
 
         Returns:
-            Response: The response object from the GET request.
+            Response: The response object from the GET request,
+                or an iterator over (uri, entity) pairs.
         """
         if data is None:
             data = {}
 
         params = {
-            "uris": uris,
-            **{
-                k: v
-                for k, v in {
-                    "refresh": str_bool(refresh),
-                    "autocreate": str_bool(autocreate),
-                }.items()
-                if v is not None
-            },
+            k: v
+            for k, v in {
+                "refresh": str_bool(refresh),
+                "autocreate": str_bool(autocreate),
+            }.items()
+            if v is not None
         }
         params = dict_merge(data, params)
-        return self.session.get(self._path("by-uris"), params=params)
 
-    def get_entities_by_claims(self, **params):
-        """
-        Get entities URIs by their claims.
+        uris, aliases, invalid = normalize_uris(pipe_split(uris))
+        if stream:
+            self._require_blocking("stream")
+            pairs = self._iter_entities_by_uris(
+                chunk_values(uris, chunk_size, MAX_URIS_PARAM_LENGTH), params, aliases
+            )
+            if model:
+                return ((uri, Entity(entity)) for uri, entity in pairs)
+            return pairs
+        store = self.session.entity_store if not data else None
+        stored = {"redirects": aliases, "notFound": invalid}
+        if store is not None and str_bool(refresh) != "true":
+            stored_entities, uris = store.lookup(uris)
+            if uris and store.revalidate and not self.session.is_async:
+                stored_entities, uris = self._revalidate_stored(
+                    store, stored_entities, uris, chunk_size, max_workers
+                )
+            stored = merge_by_uris_responses([stored, stored_entities])
+
+        chunks = list(chunk_values(uris, chunk_size, MAX_URIS_PARAM_LENGTH))
+        if store is None and len(chunks) <= 1 and not aliases and not invalid:
+            params["uris"] = "|".join(chunks[0]) if chunks else ""
+            return self._fetched_entities(
+                self.session.get(self._path("by-uris"), params=params), model
+            )
+
+        def fetch(chunk):
+            return lambda: self.session.get(
+                self._path("by-uris"), params={**params, "uris": "|".join(chunk)}
+            )
+
+        def merge(responses):
+            if store is not None and responses:
+                store.put(merge_by_uris_responses(responses))
+            return merge_by_uris_responses([stored, *responses])
+
+        responses = self.session.gather(
+            [fetch(chunk) for chunk in chunks], max_workers=max_workers
+        )
+        return self._fetched_entities(self.session.then(responses, merge), model)
+
+    def _revalidate_stored(  # pylint: disable=too-many-arguments
+        self, store, stored: dict, uris: list, chunk_size: int, max_workers: int | None
+    ) -> tuple[dict, list]:
+        """
+        Compare the revisions of stale stored entities to their current ones,
+        fetched with their info attributes only, and serve the unchanged
+        ones from the store again.
+
+        Returns:
+            tuple: The stored by-uris response, extended with the revalidated
+                entities, and the URIs still to fetch.
+        """
+        revisions = store.revisions(uris)
+        if not revisions:
+            return stored, uris
+
+        def fetch_info(chunk):
+            return lambda: self.session.get(
+                self._path("by-uris"),
+                params={"uris": "|".join(chunk), "attributes": "info"},
+            )
+
+        responses = self.session.gather(
+            [
+                fetch_info(chunk)
+                for chunk in chunk_values(
+                    list(revisions), chunk_size, MAX_URIS_PARAM_LENGTH
+                )
+            ],
+            max_workers=max_workers,
+        )
+        current = {
+            uri: entity_revision(entity)[0]
+            for response in responses
+            for uri, entity in response.get("entities", {}).items()
+        }
+        unchanged = [uri for uri, revision in revisions.items() if current.get(uri) == revision]
+        if not unchanged:
+            return stored, uris
+        store.touch(unchanged)
+        revalidated, uris = store.lookup(uris)
+        return merge_by_uris_responses([stored, revalidated]), uris
+
+    def _fetched_entities(self, response, model: bool):
+        """Index the fetched entities claims, and convert them to models if model is set"""
+        index = self.session.claims_index
+        if index is not None:
+            response = self.session.then(response, index.add_entities)
+        return self._with_models(response, model, {"entities": Entity})
+
+    def _iter_entities_by_uris(self, chunks, params: dict, aliases: dict):
+        """
+        Stream the (uri, entity) pairs of by-uris requests, chunk after chunk,
+        with an extra pair for each alias of a canonical URI
+        """
+        index = self.session.claims_index
+        aliases_by_uri = {}
+        for alias, uri in aliases.items():
+            aliases_by_uri.setdefault(uri, []).append(alias)
+        for chunk in chunks:
+            for uri, entity in self.session.iter_records(
+                "get",
+                self._path("by-uris"),
+                "entities",
+                params={**params, "uris": "|".join(chunk)},
+            ):
+                if index is not None and "claims" in entity:
+                    index.add(uri, entity["claims"])
+                yield uri, entity
+                for alias in aliases_by_uri.get(uri, ()):
+                    yield alias, entity
+
+    def get_entities_by_claims(
+        self,
+        prop: str,
+        value: str,
+        refresh: bool | None = None,
+        local: bool = False,
+        data: dict | None = None,
+    ):
         """
-        raise NotImplementedError
+        Get the URIs of the entities having a claim, also known as reverse
+        claims (e.g. the works of an author).
+
+        If the session has a claims index, an answer it knows to be complete
+        is returned without any request, unless refresh is set or extra data
+        params are passed. Server answers are recorded in the index.
+
+        Parameters:
+            prop (str): A property (e.g. 'wdt:P50').
+            value (str): The claim value (e.g. 'wd:Q535').
+            refresh (bool, optional): Request non-cached data.
+            local (bool, optional): If True, only query the claims index, and
+                answer with the indexed entities even if other entities may
+                have the claim.
+            data (dict, optional): Additional parameters to include in the request.
+
+        Returns:
+            Response: The response object from the GET request, with the
+                entities URIs in 'uris'.
+        """
+        index = self.session.claims_index
+        if local and index is None:
+            raise ValueError("Local reverse claims queries need a session claims index.")
+        if index is not None and str_bool(refresh) != "true" and not data:
+            uris = index.uris(prop, value) if local else index.lookup(prop, value)
+            if uris is not None:
+                # Gathering no call gives an awaitable to asyncio sessions
+                return self.session.then(
+                    self.session.gather([]), lambda _: {"uris": uris}
+                )
+
+        params = {"property": prop, "value": value}
+        if refresh is not None:
+            params["refresh"] = str_bool(refresh)
+        response = self.session.get(
+            self._path("reverse-claims"), params=dict_merge(data or {}, params)
+        )
+        if index is None or data:
+            return response
+
+        def record(result):
+            index.set_complete(prop, value, result.get("uris", []))
+            return result
+
+        return self.session.then(response, record)
 
     def get_popularity(self, uris: str | list[str], refresh: bool = False):
         """
@@ -237,7 +446,7 @@ class EntitiesEndpoints(EndpointTemplate):
         params = {"id": entity_id}
         return self.session.get(self._path("history"), params=params)
 
-    def get_author_works(self, uri: str, refresh: bool = False):
+    def get_author_works(self, uri: str, refresh: bool = False, stream: bool = False):
         """
         Pass an author URI, get uris of all works, series and
         articles of the entity that match this claim.
@@ -245,13 +454,26 @@ class EntitiesEndpoints(EndpointTemplate):
         Args:
             uri (str): An author URI (e. g. 'wd:Q2196').
             refresh (bool, optional): Request non-cached data. Defaults to 'False'.
+            stream (bool, optional): If True, parse the response while it is
+                downloaded and return an iterator over (section, record) pairs,
+                the section being 'works', 'series' or 'articles'.
+                Not supported by asyncio sessions.
 
         Returns:
-            Response: The response object from the GET request.
+            Response: The response object from the GET request,
+                or an iterator over (section, record) pairs.
         """
         params = {"uri": uri}
         if refresh:
             params["refresh"] = str_bool(refresh)
+        if stream:
+            self._require_blocking("stream")
+            return self.session.iter_records(
+                "get",
+                self._path("author-works"),
+                ("works", "series", "articles"),
+                params=params,
+            )
         return self.session.get(self._path("author-works"), params=params)
 
     def get_serie_parts(self, uri: str, refresh: bool = False):
@@ -1,3 +1,5 @@
+from inventaire.server.models import Group
+
 from .common import EndpointTemplate
 
 
@@ -11,40 +13,58 @@ class GroupsEndpoints(EndpointTemplate):
         super().__init__(session)
         self.base_path = "groups"
 
-    def get_groups(self):
+    def get_groups(self, model: bool = False):
         """
         Get all the groups the authentified user is a member of.
 
+        Args:
+            model (bool, optional): If True, return the groups as compact Group
+                models instead of dicts (see inventaire.server.models).
+
         Returns:
             Response: The response object from the GET request.
         """
-        return self.session.get(self._path())
+        return self._with_models(
+            self.session.get(self._path()), model, {"groups": Group}
+        )
 
-    def get_group_by_id(self, group_id: str):
+    def get_group_by_id(self, group_id: str, model: bool = False):
         """
         Get a group by its id.
 
         Args:
             group_id (str): A group id (e. g. '85d797f862e362335f3e6144cc12568a').
+            model (bool, optional): If True, return the group as a compact Group
+                model instead of a dict (see inventaire.server.models).
 
         Returns:
             Response: The response object from the GET request.
         """
         params = {"id": group_id}
-        return self.session.get(self._path("by-id"), params=params)
+        return self._with_models(
+            self.session.get(self._path("by-id"), params=params),
+            model,
+            {"group": Group},
+        )
 
-    def get_group_by_slug(self, slug: str):
+    def get_group_by_slug(self, slug: str, model: bool = False):
         """
         Get a group by its slug.
 
         Args:
             slug (str): A group slug (e. g. 'la-myne').
+            model (bool, optional): If True, return the group as a compact Group
+                model instead of a dict (see inventaire.server.models).
 
         Returns:
             Response: The response object from the GET request.
         """
         params = {"slug": slug}
-        return self.session.get(self._path("by-slug"), params=params)
+        return self._with_models(
+            self.session.get(self._path("by-slug"), params=params),
+            model,
+            {"group": Group},
+        )
 
     def get_groups_by_username(self, **params):
         """
@@ -1,4 +1,8 @@
-from inventaire.utils.common import dict_merge
+from inventaire.server.models import Item, User
+from inventaire.utils.bulk import BulkOperation
+from inventaire.utils.common import dict_merge, str_bool
+from inventaire.utils.isbn import normalize_uri
+from inventaire.utils.pagination import iter_pages, reject_page_params
 
 from .common import EndpointTemplate
 
@@ -41,12 +45,18 @@ class ItemsEndpoints(EndpointTemplate):
 
         Returns:
             Response: The HTTP response object from the POST request.
+
+        Raises:
+            ValueError: If the entity is an invalid 'isbn:' uri.
         """
         if data is None:
             data = {}
+        uri = normalize_uri(entity)
+        if uri is None:
+            raise ValueError(f"Invalid ISBN uri: {entity}")
 
         json = {
-            "entity": entity,
+            "entity": uri,
             **{
                 k: v
                 for k, v in {
@@ -62,6 +72,37 @@ class ItemsEndpoints(EndpointTemplate):
         json = dict_merge(data, json)
         return self.session.post(self._path(), json=json)
 
+    def create_items(
+        self, items, max_workers: int = 4, rate: float | None = None
+    ) -> BulkOperation:
+        """
+        Create many items with bounded concurrency. The items are pulled
+        lazily from the iterable, and the session rate limiter, if any,
+        applies to every request.
+
+        Parameters:
+            items (iterable): Item specs: dicts of create_item arguments,
+                or entity URIs (e.g. 'isbn:9782253138938').
+            max_workers (int, optional): Max number of items created at once.
+            rate (float, optional): Max number of items created per second.
+
+        Returns:
+            BulkOperation: Iterate over it to get each item BulkResult as it
+                completes, or call its run() method to get a summary with the
+                failed specs to retry.
+
+        Raises:
+            TypeError: With an asyncio session, whose requests would never be sent.
+        """
+        self._require_blocking("create_items")
+
+        def create(spec):
+            if isinstance(spec, str):
+                return self.create_item(entity=spec)
+            return self.create_item(**spec)
+
+        return BulkOperation(create, items, max_workers=max_workers, rate=rate)
+
     def update_item(self, **params):
         """
         Update an item.
@@ -74,11 +115,51 @@ class ItemsEndpoints(EndpointTemplate):
         """
         raise NotImplementedError
 
-    def get_items_by_users(self, **params):
+    def get_items_by_users(
+        self,
+        users: str | list[str],
+        limit: int | None = None,
+        offset: int | None = None,
+        listing_filter: str | None = None,
+        include_users: bool | None = None,
+        model: bool = False,
+    ):
         """
         Items by users ids.
+
+        Args:
+            users (str or list[str]): User ids separated by pipes
+                as a string or a list of user ids.
+            limit (int, optional): Maximum number of items to return.
+            offset (int, optional): Number of items to skip.
+            listing_filter (str, optional): Only return items with this
+                listing: one of private, network, or public.
+            include_users (bool, optional): If True, include the users data.
+            model (bool, optional): If True, return the items and users as
+                compact Item and User models instead of dicts
+                (see inventaire.server.models).
+
+        Returns:
+            Response: The response object from the GET request.
         """
-        raise NotImplementedError
+        params = {
+            "users": "|".join(users) if isinstance(users, list) else users,
+            **{
+                k: v
+                for k, v in {
+                    "limit": limit,
+                    "offset": offset,
+                    "filter": listing_filter,
+                    "include-users": str_bool(include_users),
+                }.items()
+                if v is not None
+            },
+        }
+        return self._with_models(
+            self.session.get(self._path("by-users"), params=params),
+            model,
+            {"items": Item, "users": User},
+        )
 
     def get_items_by_entities(self, **params):
         """
@@ -86,11 +167,65 @@ class ItemsEndpoints(EndpointTemplate):
         """
         raise NotImplementedError
 
-    def get_last_public_items(self, **params):
+    def get_last_public_items(
+        self, stream: bool = False, model: bool = False, **params
+    ):
         """
         Last public items.
+
+        Args:
+            stream (bool, optional): If True, parse the response while it is
+                downloaded and return an iterator over the items.
+                Not supported by asyncio sessions.
+            model (bool, optional): If True, return the items as compact Item
+                models instead of dicts (see inventaire.server.models).
+            **params: Request params (e.g. limit, offset, lang).
+
+        Returns:
+            Response: The response object from the GET request,
+                or an iterator over the items.
+        """
+        if stream:
+            self._require_blocking("stream")
+            items = self.session.iter_records(
+                "get", self._path("last-public"), "items", params=params
+            )
+            return map(Item, items) if model else items
+        return self._with_models(
+            self.session.get(self._path("last-public"), params=params),
+            model,
+            {"items": Item, "users": User},
+        )
+
+    def iter_last_public_items(
+        self, page_size: int = 50, prefetch: bool = True, **params
+    ):
         """
-        return self.session.get(self._path("last-public"), params=params)
+        Iterate over all the last public items, page after page. The next
+        page is fetched while the current one is processed.
+
+        Args:
+            page_size (int, optional): Number of items per request. Defaults to 50.
+            prefetch (bool, optional): Fetch the next page in the background.
+            **params: Other request params (e.g. lang, assets).
+
+        Returns:
+            Iterator: The items of every page.
+
+        Raises:
+            TypeError: With an asyncio session, which can't iterate lazily.
+            ValueError: If the params set a limit or an offset.
+        """
+        self._require_blocking("iter_last_public_items")
+        reject_page_params(params)
+        return iter_pages(
+            lambda offset, limit: self.get_last_public_items(
+                **params, offset=offset, limit=limit
+            ),
+            page_size,
+            "items",
+            prefetch=prefetch,
+        )
 
     def get_nearby_items(self, **params):
         """
@@ -1,4 +1,5 @@
 from inventaire.utils.common import dict_merge, str_bool
+from inventaire.utils.pagination import iter_pages, reject_page_params
 
 from .common import EndpointTemplate
 
@@ -62,3 +63,47 @@ class SearchEndpoints(EndpointTemplate):
         }
         params = dict_merge(data, params)
         return self.session.get(self._path(), params=params)
+
+    def iter_search(
+        self,
+        search: str,
+        types: str = "works|series|humans",
+        page_size: int = 20,
+        prefetch: bool = True,
+        data: dict | None = None,
+        **kwargs,
+    ):
+        """
+        Iterate over all the search results, page after page. The next
+        page is fetched while the current one is processed.
+
+        Parameters:
+            search (str): The search term or query string.
+            types (str): A pipe-separated string of entity types to search for.
+                Defaults to "works|series|humans".
+            page_size (int, optional): Number of results per request. Defaults to 20.
+            prefetch (bool, optional): Fetch the next page in the background.
+            data (dict, optional): Additional parameters to include in the request.
+            **kwargs: Other search arguments (lang, exact, min_score).
+
+        Returns:
+            Iterator: The results of every page.
+
+        Raises:
+            TypeError: With an asyncio session, which can't iterate lazily.
+            ValueError: If the arguments or data set a limit or an offset.
+        """
+        self._require_blocking("iter_search")
+        reject_page_params(kwargs, data or {})
+        return iter_pages(
+            lambda offset, limit: self.search(
+                search,
+                types=types,
+                limit=limit,
+                data=dict_merge(data or {}, {"offset": offset}),
+                **kwargs,
+            ),
+            page_size,
+            "results",
+            prefetch=prefetch,
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from inventaire.server.models import Shelf
 from inventaire.utils.common import dict_merge
 
 from .common import EndpointTemplate
@@ -17,33 +18,45 @@ class ShelvesEndpoints(EndpointTemplate):
         super().__init__(session)
         self.base_path = "shelves"
 
-    def get_shelves_by_ids(self, ids: str | list[str]):
+    def get_shelves_by_ids(self, ids: str | list[str], model: bool = False):
         """
         Retrieve shelf data for the given shelf IDs.
 
         Args:
             ids (str or list[str]): A shelf ID separated by pipes
                 as a string or a list of shelf IDs.
+            model (bool, optional): If True, return the shelves as compact Shelf
+                models instead of dicts (see inventaire.server.models).
 
         Returns:
             Response: The response object resulting from the GET request to the shelves endpoint.
         """
         ids_str = "|".join(ids) if isinstance(ids, list) else ids
-        return self.session.get(self._path("by-ids"), params={"ids": ids_str})
+        return self._with_models(
+            self.session.get(self._path("by-ids"), params={"ids": ids_str}),
+            model,
+            {"shelves": Shelf},
+        )
 
-    def get_shelves_by_owners(self, owners: str | list[str]):
+    def get_shelves_by_owners(self, owners: str | list[str], model: bool = False):
         """
         Retrieve shelf data for the given owners ID.
 
         Args:
             ids (str or list[str]): A owner ID separated by pipes
                 as a string or a list of owner IDs.
+            model (bool, optional): If True, return the shelves as compact Shelf
+                models instead of dicts (see inventaire.server.models).
 
         Returns:
             Response: The response object resulting from the GET request to the shelves endpoint.
         """
         owners_str = "|".join(owners) if isinstance(owners, list) else owners
-        return self.session.get(self._path("by-owners"), params={"owners": owners_str})
+        return self._with_models(
+            self.session.get(self._path("by-owners"), params={"owners": owners_str}),
+            model,
+            {"shelves": Shelf},
+        )
 
     def create_shelf(
         self, name: str, listing: str, description: str, data: dict | None = None
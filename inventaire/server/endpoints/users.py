@@ -1,3 +1,6 @@
+from inventaire.server.models import User
+from inventaire.utils.pagination import iter_pages
+
 from .common import EndpointTemplate
 
 
@@ -11,44 +14,89 @@ class UsersEndpoints(EndpointTemplate):
         super().__init__(session)
         self.base_path = "users"
 
-    def get_users_by_ids(self, ids: str | list[str]):
+    def get_users_by_ids(self, ids: str | list[str], model: bool = False):
         """
         Users by ids.
 
         Args:
             ids (str or list[str]): Ids separated by pipes as a string or a list ids.
+            model (bool, optional): If True, return the users as compact User
+                models instead of dicts (see inventaire.server.models).
 
         Returns:
             Response: The response object resulting from the GET request.
         """
         ids_str = "|".join(ids) if isinstance(ids, list) else ids
-        return self.session.get(self._path("by-ids"), params={"ids": ids_str})
+        return self._with_models(
+            self.session.get(self._path("by-ids"), params={"ids": ids_str}),
+            model,
+            {"users": User},
+        )
 
-    def get_users_by_usernames(self, usernames: str | list[str]):
+    def get_users_by_usernames(self, usernames: str | list[str], model: bool = False):
         """
         Users by usernames.
 
         Args:
             usernames (str or list[str]): Usernames separated by
                 pipes as a string or a list usernames.
+            model (bool, optional): If True, return the users as compact User
+                models instead of dicts (see inventaire.server.models).
 
         Returns:
             Response: The response object resulting from the GET request.
         """
         users_str = "|".join(usernames) if isinstance(usernames, list) else usernames
-        return self.session.get(
-            self._path("by-usernames"), params={"usernames": users_str}
+        return self._with_models(
+            self.session.get(
+                self._path("by-usernames"), params={"usernames": users_str}
+            ),
+            model,
+            {"users": User},
         )
 
-    def search(self, search):
+    def search(self, search, limit: int | None = None, offset: int | None = None):
         """
         Search users.
 
         Args:
             search (str): Text matching users username or bio.
+            limit (int, optional): Maximum number of users to return.
+            offset (int, optional): Number of users to skip.
 
         Returns:
             Response: The response object from the GET request.
         """
-        params = {"search": search}
+        params = {
+            "search": search,
+            **{
+                k: v
+                for k, v in {"limit": limit, "offset": offset}.items()
+                if v is not None
+            },
+        }
         return self.session.get(self._path("search"), params=params)
+
+    def iter_search(self, search, page_size: int = 20, prefetch: bool = True):
+        """
+        Iterate over all the users matching a search, page after page.
+        The next page is fetched while the current one is processed.
+
+        Args:
+            search (str): Text matching users username or bio.
+            page_size (int, optional): Number of users per request. Defaults to 20.
+            prefetch (bool, optional): Fetch the next page in the background.
+
+        Returns:
+            Iterator: The users of every page.
+
+        Raises:
+            TypeError: With an asyncio session, which can't iterate lazily.
+        """
+        self._require_blocking("iter_search")
+        return iter_pages(
+            lambda offset, limit: self.search(search, limit=limit, offset=offset),
+            page_size,
+            "users",
+            prefetch=prefetch,
+        )
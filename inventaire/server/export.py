@@ -0,0 +1,214 @@
+"""
+A module with the inventory exporter writing users' or groups' items to files.
+"""
+
+import csv
+import logging
+
+from inventaire.server.endpoints.common import require_blocking
+from inventaire.server.pipelines import write_jsonl
+from inventaire.utils.common import batched, open_text
+from inventaire.utils.pagination import iter_pages
+
+EXPORT_FIELDS = (
+    "item_id",
+    "entity",
+    "entity_label",
+    "entity_type",
+    "owner",
+    "transaction",
+    "listing",
+    "details",
+    "notes",
+    "shelves",
+    "created",
+    "updated",
+)
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+PYARROW_MISSING_MSG = (
+    "Parquet export requires pyarrow, "
+    "install it with 'pip install inventaire-python-api[parquet]'"
+)
+
+
+def entity_summary(entity: dict, lang: str = "en") -> dict:
+    """Return the label, in lang if possible, and the type of an entity"""
+    labels = entity.get("labels") or {}
+    label = labels.get(lang) or next(iter(labels.values()), None)
+    return {"entity_label": label, "entity_type": entity.get("type")}
+
+
+def write_csv(rows, destination, fields: tuple[str, ...] = EXPORT_FIELDS) -> int:
+    """
+    Write rows as csv while they are produced.
+
+    :param rows: iterable of dicts
+    :param destination: file path or text file object
+    :param fields: csv columns
+    :returns: number of rows written
+    """
+    count = 0
+    with open_text(destination, "w") as file:
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_parquet(
+    rows,
+    destination: str,
+    fields: tuple[str, ...] = EXPORT_FIELDS,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+) -> int:
+    """
+    Write rows as a parquet file, one row group at a time.
+
+    :param rows: iterable of dicts
+    :param destination: file path
+    :param fields: parquet columns, all stored as strings
+    :param row_group_size: number of rows held in memory and written at once
+    :returns: number of rows written
+    """
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(PYARROW_MISSING_MSG) from error
+
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    count = 0
+    with pq.ParquetWriter(destination, schema) as writer:
+        for group in batched(rows, row_group_size):
+            columns = {
+                field: [
+                    None if row.get(field) is None else str(row[field])
+                    for row in group
+                ]
+                for field in fields
+            }
+            writer.write_table(pa.table(columns, schema=schema))
+            count += len(group)
+    return count
+
+
+class InventoryExporter:
+    """
+    Export the items of users or groups, page after page. The entities of each
+    page are fetched with one batched by-uris call, and rows are written while
+    they are produced, so the memory use doesn't grow with the inventory size.
+
+    :param api: an InventaireApiWrapper bound to an InventaireSession
+    :param page_size: number of items per request
+    :param lang: preferred language of the entities labels
+    :raises: TypeError if the wrapper is bound to an AsyncInventaireSession
+    """
+
+    def __init__(self, api, page_size: int = 100, lang: str = "en"):
+        require_blocking(api.session, "InventoryExporter")
+        self.api = api
+        self.page_size = page_size
+        self.lang = lang
+        self.logger = logging.getLogger(__name__)
+
+    def _owners(self, users: str | list[str] | None, group: str | None) -> list[str]:
+        """Return the ids of the users whose items are exported"""
+        owners = [users] if isinstance(users, str) else list(users or [])
+        if group:
+            group_data = self.api.groups.get_group_by_id(group)["group"]
+            for membership in group_data.get("admins", []) + group_data.get(
+                "members", []
+            ):
+                owners.append(membership["user"])
+        if not owners:
+            raise ValueError("Either users or group must be provided.")
+        return list(dict.fromkeys(owners))
+
+    def _shelves_names(self, owners: list[str]) -> dict:
+        """Return the names of the owners shelves by id"""
+        shelves = self.api.shelves.get_shelves_by_owners(owners).get("shelves", {})
+        return {shelf_id: shelf.get("name") for shelf_id, shelf in shelves.items()}
+
+    def iter_items(self, users: str | list[str] | None = None, group: str | None = None):
+        """
+        Iterate over the items of users or of a group members.
+
+        :param users: user id or list of user ids
+        :param group: group id
+        :returns: generator of items
+        """
+        owners = self._owners(users, group)
+        return iter_pages(
+            lambda offset, limit: self.api.items.get_items_by_users(
+                owners, limit=limit, offset=offset
+            ),
+            self.page_size,
+            "items",
+        )
+
+    def iter_rows(self, users: str | list[str] | None = None, group: str | None = None):
+        """
+        Iterate over flat export rows of the items of users or of a group
+        members, hydrated with their entity label and type.
+
+        :param users: user id or list of user ids
+        :param group: group id
+        :returns: generator of dicts with EXPORT_FIELDS keys
+        """
+        owners = self._owners(users, group)
+        shelves_names = self._shelves_names(owners)
+        pages = batched(self.iter_items(owners), self.page_size)
+        for page in pages:
+            uris = list(dict.fromkeys(item["entity"] for item in page))
+            response = self.api.entities.get_entities_by_uris(uris)
+            found = response.get("entities", {})
+            redirects = response.get("redirects", {})
+            for item in page:
+                entity = found.get(redirects.get(item["entity"], item["entity"]), {})
+                yield {
+                    "item_id": item.get("_id"),
+                    "entity": item["entity"],
+                    **entity_summary(entity, self.lang),
+                    "owner": item.get("owner"),
+                    "transaction": item.get("transaction"),
+                    "listing": item.get("visibility") or item.get("listing"),
+                    "details": item.get("details"),
+                    "notes": item.get("notes"),
+                    "shelves": "|".join(
+                        shelves_names.get(shelf_id) or shelf_id
+                        for shelf_id in item.get("shelves", [])
+                    ),
+                    "created": item.get("created"),
+                    "updated": item.get("updated"),
+                }
+
+    def export(
+        self,
+        destination,
+        fmt: str = "jsonl",
+        users: str | list[str] | None = None,
+        group: str | None = None,
+    ) -> int:
+        """
+        Export the items of users or of a group members to a file.
+
+        :param destination: file path, or text file object for jsonl and csv
+        :param fmt: one of 'jsonl', 'csv' or 'parquet'
+        :param users: user id or list of user ids
+        :param group: group id
+        :returns: number of exported items
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt}, expected one of {EXPORT_FORMATS}")
+        self.logger.debug(f"Export items of users={users} group={group} as {fmt}")
+        rows = self.iter_rows(users, group)
+        if fmt == "csv":
+            return write_csv(rows, destination)
+        if fmt == "parquet":
+            return write_parquet(rows, destination)
+        return write_jsonl(rows, destination)
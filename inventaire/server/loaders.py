@@ -0,0 +1,159 @@
+"""
+A module with batching loaders merging single key lookups into bulk requests.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from inventaire.server import endpoints
+from inventaire.server.endpoints.common import require_blocking
+
+DEFAULT_BATCH_WAIT = 0.005
+
+
+class BatchLoader:
+    """
+    Merge single key lookups into batches. Keys asked for within a short time
+    window, or until the batch is full, are resolved with one batch_fn call,
+    and every caller gets its own value back through a future.
+
+    Loaders run blocking batch functions in a thread pool, so they must be built
+    on endpoints bound to an InventaireSession.
+
+    :param batch_fn: callable taking a list of keys and returning a dict
+                     with keys and their values, missing keys resolve to None
+    :param max_batch_size: max number of keys in a batch
+    :param wait: seconds to wait for more keys before dispatching a batch
+    :param max_workers: max number of batches in flight
+    :raises: TypeError if batch_fn is a coroutine function, or if the loader
+             endpoints are bound to an AsyncInventaireSession
+    """
+
+    def __init__(
+        self,
+        batch_fn,
+        max_batch_size: int = 50,
+        wait: float = DEFAULT_BATCH_WAIT,
+        max_workers: int = 4,
+    ):
+        if inspect.iscoroutinefunction(batch_fn):
+            raise TypeError("BatchLoader needs a blocking batch function, not a coroutine one")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.wait = wait
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+        self.logger = logging.getLogger(__name__)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def load(self, key) -> Future:
+        """
+        Ask for the value of a key.
+
+        :param key: key to look up
+        :returns: a future resolving to the key value
+        """
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._pending[key] = Future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def load_many(self, keys) -> list[Future]:
+        """Ask for the values of several keys, returns a future per key"""
+        return [self.load(key) for key in keys]
+
+    def aload(self, key) -> asyncio.Future:
+        """Ask for the value of a key from a coroutine, returns an awaitable"""
+        return asyncio.wrap_future(self.load(key))
+
+    def flush(self):
+        """Dispatch the pending keys without waiting for the batch window"""
+        with self._lock:
+            self._dispatch()
+
+    def close(self):
+        """Dispatch the pending keys and wait for all the batches to complete"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self):
+        """Send the pending keys as a batch, the lock must be held"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: dict):
+        """Resolve the futures of a batch with one batch_fn call"""
+        self.logger.debug(f"Load a batch of {len(batch)} keys")
+        try:
+            values = self.batch_fn(list(batch))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            for future in batch.values():
+                future.set_exception(error)
+            return
+        for key, future in batch.items():
+            future.set_result(values.get(key))
+
+
+class EntityLoader(BatchLoader):
+    """
+    Batching loader of entities by URI, merging lookups into by-uris requests.
+    Redirected URIs resolve to the entity they redirect to.
+    """
+
+    def __init__(self, entities: endpoints.EntitiesEndpoints, **kwargs):
+        require_blocking(entities.session, type(self).__name__)
+        super().__init__(self._load_entities, **kwargs)
+        self.entities = entities
+
+    def _load_entities(self, uris: list[str]) -> dict:
+        response = self.entities.get_entities_by_uris(uris)
+        found = response.get("entities", {})
+        redirects = response.get("redirects", {})
+        return {uri: found.get(redirects.get(uri, uri)) for uri in uris}
+
+
+class UserLoader(BatchLoader):
+    """Batching loader of users by id, merging lookups into by-ids requests"""
+
+    def __init__(self, users: endpoints.UsersEndpoints, **kwargs):
+        require_blocking(users.session, type(self).__name__)
+        super().__init__(self._load_users, **kwargs)
+        self.users = users
+
+    def _load_users(self, ids: list[str]) -> dict:
+        return self.users.get_users_by_ids(ids).get("users", {})
+
+
+class ShelfLoader(BatchLoader):
+    """Batching loader of shelves by id, merging lookups into by-ids requests"""
+
+    def __init__(self, shelves: endpoints.ShelvesEndpoints, **kwargs):
+        require_blocking(shelves.session, type(self).__name__)
+        super().__init__(self._load_shelves, **kwargs)
+        self.shelves = shelves
+
+    def _load_shelves(self, ids: list[str]) -> dict:
+        return self.shelves.get_shelves_by_ids(ids).get("shelves", {})
@@ -0,0 +1,192 @@
+"""
+A module with compact response models, to hold many records in memory.
+"""
+
+import sys
+
+from inventaire.utils.entity_store import entity_revision
+
+
+def _intern(value):
+    """Intern a string, so that equal URIs and ids share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_tuple(values):
+    return tuple(_intern(value) for value in values or ())
+
+
+def _intern_keys(mapping):
+    return {_intern(key): value for key, value in (mapping or {}).items()} or None
+
+
+def _member_ids(memberships):
+    return tuple(_intern(membership["user"]) for membership in memberships or ())
+
+
+def _keep(value):
+    return value
+
+
+class Model:
+    """
+    Base class of the response models, built from a response record.
+    Models have no instance dict: their FIELDS, mapping attributes to
+    a json key and a converter, are slots.
+    """
+
+    __slots__ = ()
+    FIELDS: dict = {}
+
+    def __init__(self, data: dict):
+        for attr, (key, convert) in self.FIELDS.items():
+            setattr(self, attr, convert(data.get(key)))
+
+    def __repr__(self):
+        key_attr = next(iter(self.FIELDS))
+        return f"{type(self).__name__}({key_attr}={getattr(self, key_attr)!r})"
+
+    def to_json(self) -> dict:
+        """Return the fields as a response-like record"""
+        return {key: getattr(self, attr) for attr, (key, _) in self.FIELDS.items()}
+
+
+class Entity(Model):
+    """
+    An entity. Its claims are only parsed, with interned properties and
+    values, when first accessed.
+    """
+
+    FIELDS = {
+        "uri": ("uri", _intern),
+        "type": ("type", _intern),
+        "labels": ("labels", _intern_keys),
+        "descriptions": ("descriptions", _intern_keys),
+        "image": ("image", _keep),
+        "original_lang": ("originalLang", _intern),
+    }
+    __slots__ = (*FIELDS, "revision", "_raw_claims", "_claims")
+    labels: dict | None
+
+    def __init__(self, data: dict):
+        super().__init__(data)
+        self.revision = entity_revision(data)[0]
+        self._raw_claims = data.get("claims")
+        self._claims = None
+
+    def to_json(self) -> dict:
+        return {**super().to_json(), "claims": self.claims}
+
+    @property
+    def claims(self) -> dict:
+        """Claims by property, with tuples of values"""
+        if self._claims is None:
+            self._claims = {
+                _intern(prop): _intern_tuple(values)
+                for prop, values in (self._raw_claims or {}).items()
+            }
+            self._raw_claims = None
+        return self._claims
+
+    def claim(self, prop: str, default=None):
+        """Return the first value of a property claims"""
+        values = self.claims.get(prop)
+        return values[0] if values else default
+
+    def label(self, lang: str = "en") -> str | None:
+        """Return the label in lang if possible, or any other label"""
+        labels = self.labels or {}
+        return labels.get(lang) or next(iter(labels.values()), None)
+
+
+class Item(Model):
+    """An item, a copy of an edition or a work owned by a user"""
+
+    FIELDS = {
+        "id": ("_id", _keep),
+        "entity": ("entity", _intern),
+        "owner": ("owner", _intern),
+        "transaction": ("transaction", _intern),
+        "listing": ("visibility", _intern_tuple),
+        "details": ("details", _keep),
+        "notes": ("notes", _keep),
+        "shelves": ("shelves", _intern_tuple),
+        "created": ("created", _keep),
+        "updated": ("updated", _keep),
+    }
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, data: dict):
+        super().__init__(data)
+        if "listing" in data:
+            # Older servers have a single listing instead of a visibility list
+            self.listing = (_intern(data["listing"]),)
+
+
+class Shelf(Model):
+    """A shelf, a list of items of one owner"""
+
+    FIELDS = {
+        "id": ("_id", _keep),
+        "name": ("name", _keep),
+        "description": ("description", _keep),
+        "owner": ("owner", _intern),
+        "listing": ("visibility", _intern_tuple),
+        "color": ("color", _keep),
+        "created": ("created", _keep),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class User(Model):
+    """A user public data"""
+
+    FIELDS = {
+        "id": ("_id", _intern),
+        "username": ("username", _keep),
+        "bio": ("bio", _keep),
+        "picture": ("picture", _keep),
+        "language": ("language", _intern),
+        "created": ("created", _keep),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Group(Model):
+    """A group, with the ids of its admins and members"""
+
+    FIELDS = {
+        "id": ("_id", _keep),
+        "name": ("name", _keep),
+        "slug": ("slug", _keep),
+        "description": ("description", _keep),
+        "picture": ("picture", _keep),
+        "admins": ("admins", _member_ids),
+        "members": ("members", _member_ids),
+        "created": ("created", _keep),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+def to_models(response: dict, sections: dict) -> dict:
+    """
+    Replace the records of response sections with models. A section can hold
+    a list of records, a dict of records by id or uri when its key is plural
+    (e.g. 'entities'), or one record when it is singular (e.g. 'group').
+
+    :param response: parsed response, modified in place
+    :param sections: model classes by section key (e.g. {"items": Item})
+    :returns: the response
+    """
+    for key, model in sections.items():
+        records = response.get(key)
+        if isinstance(records, list):
+            response[key] = [model(record) for record in records]
+        elif isinstance(records, dict) and key.endswith("s"):
+            response[key] = {
+                _intern(record_id): model(record)
+                for record_id, record in records.items()
+            }
+        elif isinstance(records, dict):
+            response[key] = model(records)
+    return response
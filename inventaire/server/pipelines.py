@@ -0,0 +1,164 @@
+"""
+A module with streaming pipelines running bulk imports in constant memory.
+"""
+
+import csv
+import json
+import logging
+
+from inventaire.server import endpoints
+from inventaire.server.endpoints.common import require_blocking
+from inventaire.utils.bulk import run_bulk
+from inventaire.utils.common import batched, open_text
+
+# Number of entries sent per resolve request
+RESOLVE_BATCH_SIZE = 10
+
+logger = logging.getLogger(__name__)
+
+
+def read_jsonl(source):
+    """
+    Lazily read json objects, one per line.
+
+    :param source: file path or text file object
+    :returns: generator of parsed lines
+    """
+    with open_text(source) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def csv_row_to_entry(row: dict) -> dict:
+    """
+    Convert a csv row to a resolve entry. Recognized columns: 'isbn',
+    'title', 'authors' (pipe-separated names) and 'lang' (defaults to 'en').
+    """
+    lang = row.get("lang") or "en"
+    entry = {}
+    if row.get("isbn"):
+        entry["edition"] = {"isbn": row["isbn"]}
+    if row.get("title"):
+        entry["works"] = [{"labels": {lang: row["title"]}}]
+    if row.get("authors"):
+        entry["authors"] = [
+            {"labels": {lang: name.strip()}}
+            for name in row["authors"].split("|")
+            if name.strip()
+        ]
+    return entry
+
+
+def read_csv_entries(source, row_to_entry=csv_row_to_entry, **reader_kwargs):
+    """
+    Lazily read resolve entries from a csv file with a header row.
+
+    :param source: file path or text file object
+    :param row_to_entry: callable converting a row dict to a resolve entry
+    :returns: generator of entries
+    """
+    with open_text(source) as file:
+        for row in csv.DictReader(file, **reader_kwargs):
+            yield row_to_entry(row)
+
+
+def write_jsonl(records, destination) -> int:
+    """
+    Write records as json lines while they are produced.
+
+    :param records: iterable of json serializable records
+    :param destination: file path or text file object
+    :returns: number of records written
+    """
+    count = 0
+    with open_text(destination, "w") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def resolved_uris(entry: dict) -> dict:
+    """Extract the URIs of an entry of a resolve response"""
+    edition = entry.get("edition") or {}
+    return {
+        "edition": edition.get("uri"),
+        "works": [work.get("uri") for work in entry.get("works", [])],
+        "authors": [author.get("uri") for author in entry.get("authors", [])],
+    }
+
+
+def resolve_entries(  # pylint: disable=too-many-arguments
+    entities: endpoints.EntitiesEndpoints,
+    entries,
+    batch_size: int = RESOLVE_BATCH_SIZE,
+    max_workers: int = 4,
+    ordered: bool = True,
+    **flags,
+):
+    """
+    Resolve entries in batches posted concurrently. Entries are pulled lazily
+    and results are yielded as soon as their batch is resolved, so any number
+    of entries is resolved in constant memory.
+
+    :param entities: entities endpoints, bound to an InventaireSession
+    :param entries: iterable of resolve entries
+    :param batch_size: number of entries per resolve request
+    :param max_workers: max number of resolve requests in flight
+    :param ordered: yield results in the input order instead of as they complete
+    :param flags: create, update and enrich resolve_entity arguments
+    :raises: TypeError if the endpoints are bound to an AsyncInventaireSession
+    :returns: generator of dicts with the input 'index' and the resolved
+              'edition', 'works' and 'authors' URIs, or an 'error'
+    """
+    require_blocking(entities.session, "resolve_entries")
+    return _resolve_batches(entities, entries, batch_size, max_workers, ordered, flags)
+
+
+def _resolve_batches(  # pylint: disable=too-many-arguments
+    entities: endpoints.EntitiesEndpoints,
+    entries,
+    batch_size: int,
+    max_workers: int,
+    ordered: bool,
+    flags: dict,
+):
+    """Resolve entries in batches, see resolve_entries"""
+
+    def resolve(batch):
+        return entities.resolve_entity(batch, **flags).get("entries", [])
+
+    for result in run_bulk(
+        resolve, batched(entries, batch_size), max_workers=max_workers, ordered=ordered
+    ):
+        start = result.index * batch_size
+        if not result.ok:
+            logger.debug(f"Failed to resolve entries from {start}: {result.error}")
+            for offset in range(len(result.spec)):
+                yield {"index": start + offset, "error": str(result.error)}
+            continue
+        for offset, entry in enumerate(result.value):
+            yield {"index": start + offset, **resolved_uris(entry)}
+
+
+def resolve_file(
+    entities: endpoints.EntitiesEndpoints, source, destination, **kwargs
+) -> int:
+    """
+    Resolve the entries of a jsonl or csv file, chosen by the source
+    extension, and write the results as json lines.
+
+    :param entities: entities endpoints, bound to an InventaireSession
+    :param source: path of a .jsonl or .csv file
+    :param destination: file path or text file object of the results
+    :param kwargs: resolve_entries arguments
+    :raises: TypeError if the endpoints are bound to an AsyncInventaireSession
+    :returns: number of results written
+    """
+    entries = (
+        read_csv_entries(source)
+        if str(source).lower().endswith(".csv")
+        else read_jsonl(source)
+    )
+    return write_jsonl(resolve_entries(entities, entries, **kwargs), destination)
@@ -1,48 +1,56 @@
 import logging
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 from inventaire.server import endpoints
-from inventaire.session import InventaireSession
+
+if TYPE_CHECKING:
+    from inventaire.async_session import AsyncInventaireSession
+    from inventaire.session import InventaireSession
 
 
 # pylint: disable=missing-function-docstring
 class InventaireApiWrapper:
-    """Inventaire API wrapper"""
+    """
+    Inventaire API wrapper. Endpoint groups are built on first access
+    and then reused.
+    """
 
-    def __init__(self, session: InventaireSession):
+    def __init__(self, session: "InventaireSession | AsyncInventaireSession"):
         self.session = session
         self.logger = logging.getLogger(__name__)
 
-    @property
+    @cached_property
     def activitypub(self):
         return endpoints.ActivityPubEndpoints(self.session)
 
-    @property
+    @cached_property
     def auth(self):
         return endpoints.AuthEndpoints(self.session)
 
-    @property
+    @cached_property
     def data(self):
         return endpoints.DataEndpoints(self.session)
 
-    @property
+    @cached_property
     def entities(self):
         return endpoints.EntitiesEndpoints(self.session)
 
-    @property
+    @cached_property
     def groups(self):
         return endpoints.GroupsEndpoints(self.session)
 
-    @property
+    @cached_property
     def images(self):
         return endpoints.ImagesEndpoints(self.session)
 
     # FIXME instances
 
-    @property
+    @cached_property
     def invitations(self):
         return endpoints.InvitationsEndpoints(self.session)
 
-    @property
+    @cached_property
     def items(self):
         return endpoints.ItemsEndpoints(self.session)
 
@@ -50,25 +58,32 @@ class InventaireApiWrapper:
     # FIXME notifications
     # FIXME relations
 
-    @property
+    @cached_property
     def search(self):
         return endpoints.SearchEndpoints(self.session)
 
-    @property
+    @cached_property
     def shelves(self):
         return endpoints.ShelvesEndpoints(self.session)
 
     # FIXME tasks
     # FIXME token
 
-    @property
+    @cached_property
     def transactions(self):
         return endpoints.TransactionsEndpoints(self.session)
 
-    @property
+    @cached_property
     def user(self):
         return endpoints.UserEndpoints(self.session)
 
-    @property
+    @cached_property
     def users(self):
         return endpoints.UsersEndpoints(self.session)
+
+
+class AsyncInventaireApiWrapper(InventaireApiWrapper):
+    """
+    Inventaire asyncio API wrapper. Exposes the same endpoint groups, bound
+    to an AsyncInventaireSession, so every endpoint method returns an awaitable.
+    """
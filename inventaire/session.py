@@ -3,19 +3,34 @@ A module for Inventaire session object.
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from urllib.parse import urlsplit
 
-from requests import HTTPError, Session
+from requests import ConnectionError as RequestsConnectionError
+from requests import HTTPError, Session, Timeout
+
+from inventaire.utils.cache import ResponseCache, get_cache
+from inventaire.utils.codec import encode_json_body, get_codec
+from inventaire.utils.common import str_bool
+from inventaire.utils.compression import accept_encoding, get_compression
+from inventaire.utils.instrumentation import RequestEvent, RequestHooks
+from inventaire.utils.pool import ConnectionPool
+from inventaire.utils.retry import CircuitBreaker, RetryPolicy
+from inventaire.utils.single_flight import SingleFlight
+from inventaire.utils.streaming import STREAM_CHUNK_SIZE, iter_json_records
 
 INIT_SESSION_MSG = "Initialize session by {}"
 LOGIN_PATH = "/auth/login"
+DEFAULT_MAX_WORKERS = 4
 
 
 class InvalidAuthData(Exception):
     """Raised when Invalid authentication data provided."""
 
 
-class InventaireSession:
+class InventaireSession:  # pylint: disable=too-many-instance-attributes
     """
     Inventaire basic session object.
 
@@ -26,13 +41,39 @@ class InventaireSession:
     :param cookies: cookie dict
 
     :param keyword session_attrs: a dict with session attrs to be set as keys and their values
+    :param keyword cache: a ResponseCache for GET responses, or True to use the default one
+    :param keyword entity_store: an EntityStore the entities endpoints read through
+    :param keyword claims_index: a ClaimsIndex filled with the fetched entities,
+                                 answering reverse claims queries locally
+    :param keyword single_flight: whether to coalesce concurrent identical GET requests
+    :param keyword retry: a RetryPolicy for failed requests, or True to use the default one
+    :param keyword circuit_breaker: a per host CircuitBreaker, or True to use the default one
+    :param keyword rate_limiter: a RateLimiter every request waits for
+    :param keyword pool: a ConnectionPool, possibly shared with other sessions,
+                         or a dict with ConnectionPool arguments
+    :param keyword codec: a JsonCodec or codec name for request bodies and responses,
+                          defaults to the fastest installed one (see get_codec)
+    :param keyword hooks: observers of every request, e.g. a LatencyHistogram,
+                          registered on the session RequestHooks
+    :param keyword compression: a RequestCompression for large POST and PUT bodies,
+                                or True to use the default one
     """
 
+    # Endpoints check it for the features only blocking sessions support
+    is_async = False
+
     def __init__(  # pylint: disable=unused-argument
         self, base_url, token=None, username=None, password=None, cookies=None, **kwargs
     ):
         self.base_url = base_url
         self._session = Session()
+        # Responses are decoded while streamed, so iter_records parses them incrementally
+        self._session.headers["Accept-Encoding"] = accept_encoding()
+
+        pool = kwargs.get("pool")
+        self.pool = ConnectionPool(**pool) if isinstance(pool, dict) else pool
+        if self.pool is not None:
+            self.pool.mount(self._session)
 
         self.logger = logging.getLogger(__name__)
 
@@ -48,6 +89,19 @@ class InventaireSession:
         if kwargs.get("session_attrs"):
             self._modify_session(**kwargs.get("session_attrs"))
 
+        self.cache = get_cache(kwargs.get("cache"))
+        self.entity_store = kwargs.get("entity_store")
+        self.claims_index = kwargs.get("claims_index")
+        self.single_flight = SingleFlight() if kwargs.get("single_flight") else None
+        retry = kwargs.get("retry")
+        self.retry = RetryPolicy() if retry is True else retry or None
+        breaker = kwargs.get("circuit_breaker")
+        self.circuit_breaker = CircuitBreaker() if breaker is True else breaker or None
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.codec = get_codec(kwargs.get("codec"))
+        self.hooks = RequestHooks(*(kwargs.get("hooks") or ()))
+        self.compression = get_compression(kwargs.get("compression"))
+
     def _create_url(self, *args):
         """Helper for URL creation"""
         return self.base_url + "/".join(args)
@@ -58,6 +112,29 @@ class InventaireSession:
         for session_attr, value in kwargs.items():
             setattr(self._session, session_attr, value)
 
+    def gather(self, calls, max_workers: int | None = None) -> list:
+        """
+        Run request callables concurrently in a thread pool.
+
+        :param calls: iterable of zero-argument callables making a request
+        :param max_workers: max number of requests in flight
+
+        :return: list of the callables results, in the calls order
+        """
+        calls = list(calls)
+        max_workers = max_workers or DEFAULT_MAX_WORKERS
+        if len(calls) <= 1 or max_workers == 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            return list(executor.map(lambda call: call(), calls))
+
+    def then(self, result, callback):
+        """
+        Apply a callback to a request result. Endpoints use it to post-process
+        responses the same way for blocking and asyncio sessions.
+        """
+        return callback(result)
+
     def _request(self, method: str, endpoint: str, return_raw: bool = False, **kwargs):
         """
         General request wrapper with logging and handling response
@@ -73,26 +150,229 @@ class InventaireSession:
         self.logger.debug(
             f"{method.capitalize()} data: endpoint={endpoint} and {kwargs}"
         )
-        url = self._create_url(endpoint)
-        response = self._session.request(method=method, url=url, **kwargs)
+        encode_json_body(self.codec, kwargs)
+        if self.compression is not None:
+            self.compression.compress_body(method, kwargs)
+        response = self._send(method, endpoint, **kwargs)
         if response.status_code < 400:
             if return_raw:
                 return response
-            if response.text:
-                return response.json()
-            return ""
+            return self._decode(response.content)
         raise HTTPError(f"Error {response.status_code}. Response: {response.content}")
 
+    def _send(self, method: str, endpoint: str, **kwargs):
+        """
+        Send a request, running the session hooks around it.
+
+        :raises: CircuitOpenError, or the last connection error once out of retries
+
+        :return: the last raw response
+        """
+        response, received = self._send_observed(method, endpoint, **kwargs)
+        if received is not None:
+            received(len(response.content))
+        return response
+
+    def _send_observed(self, method: str, endpoint: str, **kwargs):
+        """
+        Send a request, running the before_request and on_error hooks. The
+        after_response hooks are left to the caller, to run once the body is
+        read, so that streamed requests report their full duration.
+
+        :raises: CircuitOpenError, or the last connection error once out of retries
+
+        :return: the last raw response, and a callable taking the number of
+                 body bytes read that runs the after_response hooks, or None
+                 if the session has no hooks
+        """
+        if not self.hooks:
+            return self._send_attempts(method, endpoint, None, **kwargs), None
+
+        event = RequestEvent.for_request(method, endpoint, kwargs)
+        self.hooks.emit("before_request", event)
+        started = time.perf_counter()
+        try:
+            response = self._send_attempts(method, endpoint, event, **kwargs)
+        except Exception as error:
+            event.duration = time.perf_counter() - started
+            event.error = error
+            self.hooks.emit("on_error", event)
+            raise
+
+        def received(response_bytes: int):
+            event.duration = time.perf_counter() - started
+            event.status = response.status_code
+            event.response_bytes = response_bytes
+            self.hooks.emit("after_response", event)
+
+        return response, received
+
+    def _send_attempts(  # pylint: disable=too-many-branches
+        self, method: str, endpoint: str, event: RequestEvent | None, **kwargs
+    ):
+        """
+        Send a request within the rate limits, retrying the failures allowed
+        by the retry policy and failing fast while the host circuit is open.
+
+        :param event: the RequestEvent whose retries are counted, if hooks are set
+
+        :raises: CircuitOpenError, or the last connection error once out of retries
+
+        :return: the last raw response
+        """
+        url = self._create_url(endpoint)
+        host = urlsplit(url).netloc
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(host)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, endpoint)
+            if self.pool is not None:
+                self.pool.touch()
+            try:
+                response = self._session.request(method=method, url=url, **kwargs)
+                error, status = None, response.status_code
+            except (RequestsConnectionError, Timeout) as exc:
+                response, error, status = None, exc, None
+
+            if self.circuit_breaker is not None:
+                if status is None or status >= 500:
+                    self.circuit_breaker.record_failure(host)
+                else:
+                    self.circuit_breaker.record_success(host)
+
+            if self.retry is None or not self.retry.should_retry(
+                method, attempt, status
+            ):
+                break
+            delay = self.retry.backoff(
+                attempt,
+                response.headers.get("Retry-After") if response is not None else None,
+            )
+            if time.monotonic() - started + delay > self.retry.max_total_time:
+                break
+            if response is not None:
+                response.close()
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+            self.logger.debug(
+                f"Retry {method} {url} in {delay:.2f}s "
+                f"(attempt {attempt}, status {status}, error {error})"
+            )
+            time.sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
+
+    def iter_records(self, method: str, endpoint: str, keys: str | tuple, **kwargs):
+        """
+        Streaming request wrapper: the response body is parsed incrementally
+        while it is downloaded, so memory stays flat however big it is.
+        The after_response hooks run once the body is consumed, or the
+        generator closed, with the duration and decoded size of what was read.
+
+        :param method: request method
+        :param endpoint: endpoint to make request to
+        :param keys: top-level key(s) of the response whose records are yielded
+
+        :raises: HTTPError if response status code is 400 or higher
+
+        :return: generator of records, see iter_json_records
+        """
+        self.logger.debug(
+            f"{method.capitalize()} stream: endpoint={endpoint} and {kwargs}"
+        )
+        encode_json_body(self.codec, kwargs)
+        if self.compression is not None:
+            self.compression.compress_body(method, kwargs)
+        response, received = self._send_observed(method, endpoint, stream=True, **kwargs)
+        with response:
+            if response.status_code >= 400:
+                if received is not None:
+                    received(len(response.content))
+                raise HTTPError(
+                    f"Error {response.status_code}. Response: {response.content}"
+                )
+            read = 0
+
+            def chunks():
+                nonlocal read
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    read += len(chunk)
+                    yield chunk
+
+            try:
+                yield from iter_json_records(chunks(), keys)
+            finally:
+                if received is not None:
+                    received(read)
+
+    def _decode(self, content: bytes):
+        """Decode a response body to json, or empty str if there is no body"""
+        if content:
+            return self.codec.loads(content)
+        return ""
+
     def get(self, endpoint: str, params: dict | None = None, **kwargs):
         """
-        Get request wrapper.
+        Get request wrapper. If the session has a cache, cacheable endpoints
+        are served from it unless the 'refresh' param is set. Expired responses
+        with an ETag or Last-Modified validator are revalidated with a conditional
+        request, and served again on 304 Not Modified. With single flight
+        enabled, concurrent identical requests share one round-trip.
 
         :param endpoint: endpoint to make request to
         :param params: dict with params to be passed to request
 
         :return: response json, empty str or raw response
         """
-        return self._request("get", endpoint, params=params, **kwargs)
+        ttl = self.cache.ttl_for(endpoint) if self.cache is not None else None
+        coalesce = self.single_flight is not None and not kwargs
+        if kwargs.get("return_raw") or (ttl is None and not coalesce):
+            return self._request("get", endpoint, params=params, **kwargs)
+
+        key = ResponseCache.make_key(endpoint, params)
+        refresh = str_bool((params or {}).get("refresh")) == "true"
+        if ttl is not None and not refresh:
+            content = self.cache.get(key)
+            if content is not None:
+                return self._decode(content)
+
+        def fetch():
+            stale = None
+            request_kwargs = kwargs
+            if ttl is not None and not refresh:
+                stale = self.cache.get_stale(key)
+            if stale is not None:
+                request_kwargs = {
+                    **kwargs,
+                    "headers": {
+                        **stale.conditional_headers(),
+                        **(kwargs.get("headers") or {}),
+                    },
+                }
+            response = self._request(
+                "get", endpoint, return_raw=True, params=params, **request_kwargs
+            )
+            if stale is not None and response.status_code == 304:
+                return self.cache.revalidate(key, stale, ttl, response.headers)
+            if ttl is not None:
+                self.cache.set(
+                    key,
+                    response.content,
+                    ttl,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            return response.content
+
+        if coalesce:
+            return self._decode(self.single_flight.do((key, refresh), fetch))
+        return self._decode(fetch())
 
     def post(self, endpoint: str, json: dict | None = None, **kwargs):
         """
@@ -0,0 +1 @@
+"""Tools to test and benchmark the client offline"""
@@ -0,0 +1,626 @@
+"""
+A local stand-in for the Inventaire API, to test and benchmark the client
+offline. It serves synthetic, recorded or proxied responses for the routes
+the endpoint classes call, with injected latency, errors, 429 throttling
+and slow bodies.
+
+Run it in-process:
+
+    with StandInServer(faults=Faults(latency=0.01)) as server:
+        inv = Inventaire(base_url=server.url, username="user", password="pwd")
+
+or as a subprocess:
+
+    python -m inventaire.testing.server --port 8080 --latency 0.05 --error-rate 0.1
+"""
+
+import argparse
+import gzip
+import hashlib
+import json as jsonlib
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlsplit
+from urllib.request import Request, urlopen
+
+API_PREFIX = "/api/"
+# Headers not forwarded when recording from an upstream server
+HOP_HEADERS = {"connection", "content-length", "host", "transfer-encoding"}
+SLOW_BODY_CHUNKS = 8
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class Faults:  # pylint: disable=too-many-instance-attributes
+    """
+    Faults injected in the stand-in responses, drawn from a seeded random
+    generator so runs are reproducible.
+
+    :param latency: seconds every response is delayed by
+    :param jitter: max extra random delay in seconds
+    :param error_rate: share of requests answered with a 500 error
+    :param throttle_rate: share of requests answered with a 429 error
+    :param retry_after: Retry-After header value of 429 responses
+    :param slow_body_rate: share of responses whose body is sent slowly
+    :param slow_body_delay: seconds it takes to send a slow body
+    :param seed: random generator seed
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        slow_body_rate: float = 0.0,
+        slow_body_delay: float = 0.5,
+        seed: int | None = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.slow_body_rate = slow_body_rate
+        self.slow_body_delay = slow_body_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, str | None]:
+        """Return the delay of a response and its fault: 'error', 'throttle', 'slow' or None"""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+        for fault, rate in (
+            ("error", self.error_rate),
+            ("throttle", self.throttle_rate),
+            ("slow", self.slow_body_rate),
+        ):
+            if roll < rate:
+                return delay, fault
+            roll -= rate
+        return delay, None
+
+
+def _isbn13(number: int) -> str:
+    """Return a valid ISBN-13 built from a number"""
+    digits = f"978{number % 10**9:09d}"
+    total = sum((3 if i % 2 else 1) * int(digit) for i, digit in enumerate(digits))
+    return digits + str((10 - total % 10) % 10)
+
+
+def _split(value: str | None) -> list[str]:
+    return [part for part in (value or "").split("|") if part]
+
+
+def _not_modified(headers: dict, etag: str, modified_at: int) -> bool:
+    """Evaluate the conditional headers of a request, If-None-Match taking precedence"""
+    if "If-None-Match" in headers:
+        return headers["If-None-Match"] == etag
+    since = headers.get("If-Modified-Since")
+    if since is None:
+        return False
+    try:
+        return parsedate_to_datetime(since).timestamp() >= modified_at
+    except (TypeError, ValueError):
+        return False
+
+
+class SyntheticApi:
+    """
+    Deterministic synthetic responses for the routes of the endpoint classes.
+    Entities can be overridden with fixtures, other records are generated
+    from their ids.
+
+    :param entities: entities by URI served instead of synthetic ones
+    :param items_per_user: number of items of every user
+    :param works_per_author: number of works of every author
+    :param search_results: number of entities and users matching any search
+    :param public_items: number of public items
+    """
+
+    # Route handlers all take the query params and the decoded body
+    # pylint: disable=unused-argument,missing-function-docstring
+
+    def __init__(
+        self,
+        entities: dict | None = None,
+        items_per_user: int = 50,
+        works_per_author: int = 10,
+        search_results: int = 100,
+        public_items: int = 100,
+    ):
+        self.entities = entities or {}
+        self.items_per_user = items_per_user
+        self.works_per_author = works_per_author
+        self.search_results = search_results
+        self.public_items = public_items
+        self.routes = {
+            ("GET", "entities/by-uris"): self.by_uris,
+            ("GET", "entities/author-works"): self.author_works,
+            ("GET", "entities/serie-parts"): self.serie_parts,
+            ("GET", "entities/reverse-claims"): self.reverse_claims,
+            ("GET", "entities/popularity"): self.popularity,
+            ("GET", "entities/history"): lambda params, body: {"patches": []},
+            ("POST", "entities/resolve"): self.resolve,
+            ("POST", "entities/create"): self.create_entity,
+            ("GET", "search"): self.search,
+            ("POST", "items"): self.create_item,
+            ("GET", "items/by-users"): self.items_by_users,
+            ("GET", "items/last-public"): self.last_public_items,
+            ("GET", "shelves/by-ids"): self.shelves_by_ids,
+            ("GET", "shelves/by-owners"): self.shelves_by_owners,
+            ("POST", "shelves/create"): self.create_shelf,
+            ("POST", "shelves/update"): self.create_shelf,
+            ("POST", "shelves/delete"): lambda params, body: {"ok": True},
+            ("GET", "users/by-ids"): self.users_by_ids,
+            ("GET", "users/by-usernames"): self.users_by_usernames,
+            ("GET", "users/search"): self.users_search,
+            ("GET", "groups"): lambda params, body: {"groups": [self.group("g0")]},
+            ("GET", "groups/by-id"): lambda params, body: {"group": self.group(params["id"])},
+            ("GET", "groups/by-slug"): lambda params, body: {
+                "group": self.group(params["slug"])
+            },
+            ("GET", "user"): lambda params, body: self.user("u0"),
+            ("PUT", "user"): lambda params, body: {"ok": True},
+            ("GET", "transactions"): lambda params, body: {"transactions": []},
+            ("GET", "transactions/get-messages"): lambda params, body: {"messages": []},
+            ("GET", "data/isbn"): self.isbn_facts,
+            ("GET", "data/wp-extract"): lambda params, body: {"extract": "", "url": ""},
+            ("GET", "data/property-values"): lambda params, body: {"values": {}},
+            ("POST", "auth/login"): lambda params, body: {"ok": True},
+            ("POST", "images/upload"): self.upload,
+            ("GET", "images/data-url"): lambda params, body: {
+                "data-url": "data:image/jpeg;base64,"
+            },
+        }
+
+    def entity(self, uri: str) -> dict:
+        """Return a fixture entity, or a synthetic one"""
+        if uri in self.entities:
+            return self.entities[uri]
+        number = int(hashlib.sha1(uri.encode()).hexdigest()[:8], 16)
+        entity_type = "edition" if uri.startswith("isbn:") else "work"
+        if entity_type == "edition":
+            claims = {"wdt:P31": ["wd:Q3331189"], "wdt:P629": [f"wd:Q{number % 100000}"]}
+        else:
+            claims = {"wdt:P31": ["wd:Q47461344"], "wdt:P50": [f"wd:Q{number % 1000 + 10**6}"]}
+        return {
+            "uri": uri,
+            "type": entity_type,
+            "labels": {"en": f"Label of {uri}", "fr": f"Titre de {uri}"},
+            "claims": claims,
+            "lastrevid": number,
+        }
+
+    def by_uris(self, params, body):
+        uris = _split(params.get("uris"))
+        return {"entities": {uri: self.entity(uri) for uri in uris}, "redirects": {}}
+
+    def author_works(self, params, body):
+        uri = params["uri"]
+        return {
+            "works": [
+                {"uri": f"{uri}-w{i}", "date": str(1900 + i)}
+                for i in range(self.works_per_author)
+            ],
+            "series": [],
+            "articles": [],
+        }
+
+    def serie_parts(self, params, body):
+        return {
+            "parts": [
+                {"uri": f"{params['uri']}-p{i}", "ordinal": str(i + 1)} for i in range(3)
+            ]
+        }
+
+    def reverse_claims(self, params, body):
+        prop, value = params.get("property"), params.get("value")
+        return {
+            "uris": [
+                uri
+                for uri, entity in self.entities.items()
+                if value in entity.get("claims", {}).get(prop, [])
+            ]
+        }
+
+    def popularity(self, params, body):
+        return {"scores": {uri: len(uri) for uri in _split(params.get("uris"))}}
+
+    def resolve(self, params, body):
+        return {
+            "entries": [
+                {
+                    "edition": {"uri": f"isbn:{_isbn13(index)}"},
+                    "works": [{"uri": f"wd:Q{index + 1}"} for _ in entry.get("works", [])],
+                    "authors": [
+                        {"uri": f"wd:Q{index + 100001}"} for _ in entry.get("authors", [])
+                    ],
+                }
+                for index, entry in enumerate((body or {}).get("entries", []))
+            ]
+        }
+
+    def create_entity(self, params, body):
+        return {"uri": "inv:" + hashlib.sha1(jsonlib.dumps(body).encode()).hexdigest()[:32]}
+
+    def search(self, params, body):
+        limit = int(params.get("limit", 10))
+        offset = int(params.get("offset", 0))
+        indexes = range(offset, min(offset + limit, self.search_results))
+        return {
+            "results": [
+                {"uri": f"wd:Q{index + 1}", "label": f"{params.get('search')} {index}"}
+                for index in indexes
+            ],
+            "total": self.search_results,
+        }
+
+    def item(self, user: str, index: int) -> dict:
+        """Return the synthetic item of a user at an index"""
+        return {
+            "_id": hashlib.sha1(f"{user}:{index}".encode()).hexdigest()[:32],
+            "entity": f"isbn:{_isbn13(index)}",
+            "owner": user,
+            "transaction": "inventorying",
+            "visibility": ["public"],
+            "shelves": [f"{user}-shelf"],
+            "created": 1_600_000_000_000 + index,
+        }
+
+    def create_item(self, params, body):
+        return {**self.item("u0", 0), **(body or {})}
+
+    def items_by_users(self, params, body):
+        users = _split(params.get("users"))
+        limit = int(params.get("limit", self.items_per_user * len(users)))
+        offset = int(params.get("offset", 0))
+        items = [
+            self.item(user, index)
+            for user in users
+            for index in range(self.items_per_user)
+        ]
+        return {"items": items[offset : offset + limit], "total": len(items)}
+
+    def last_public_items(self, params, body):
+        limit = int(params.get("limit", 15))
+        offset = int(params.get("offset", 0))
+        indexes = range(offset, min(offset + limit, self.public_items))
+        return {
+            "items": [self.item("u0", index) for index in indexes],
+            "total": self.public_items,
+        }
+
+    def shelf(self, shelf_id: str, owner: str = "u0") -> dict:
+        """Return a synthetic shelf"""
+        return {"_id": shelf_id, "name": f"Shelf {shelf_id}", "owner": owner, "visibility": []}
+
+    def shelves_by_ids(self, params, body):
+        return {
+            "shelves": {shelf_id: self.shelf(shelf_id) for shelf_id in _split(params.get("ids"))}
+        }
+
+    def shelves_by_owners(self, params, body):
+        return {
+            "shelves": {
+                f"{owner}-shelf": self.shelf(f"{owner}-shelf", owner)
+                for owner in _split(params.get("owners"))
+            }
+        }
+
+    def create_shelf(self, params, body):
+        return {"shelf": {**self.shelf("s0"), **(body or {})}}
+
+    def user(self, user_id: str) -> dict:
+        """Return a synthetic user"""
+        return {"_id": user_id, "username": f"user-{user_id}", "language": "en"}
+
+    def users_by_ids(self, params, body):
+        return {
+            "users": {user_id: self.user(user_id) for user_id in _split(params.get("ids"))}
+        }
+
+    def users_by_usernames(self, params, body):
+        return {
+            "users": {name: self.user(name) for name in _split(params.get("usernames"))}
+        }
+
+    def users_search(self, params, body):
+        limit = int(params.get("limit", 10))
+        offset = int(params.get("offset", 0))
+        indexes = range(offset, min(offset + limit, self.search_results))
+        return {"users": [self.user(f"u{index}") for index in indexes]}
+
+    def group(self, group_id: str) -> dict:
+        """Return a synthetic group"""
+        return {
+            "_id": group_id,
+            "name": f"Group {group_id}",
+            "slug": group_id,
+            "admins": [{"user": "u0"}],
+            "members": [{"user": "u1"}, {"user": "u2"}],
+        }
+
+    def isbn_facts(self, params, body):
+        return {"isbn13h": params.get("isbn"), "groupLang": "en"}
+
+    def upload(self, params, body):
+        digest = hashlib.sha1(body or b"").hexdigest()
+        return {"url": f"/img/{params.get('container', 'entities')}/{digest}"}
+
+
+def fixture_key(method: str, route: str, params: dict) -> str:
+    """Return the key of a request in recorded fixtures"""
+    query = "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+    return f"{method} {route}?{query}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't delay the body
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        stand_in = self.server.stand_in
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        status, headers, content, slow = stand_in.handle(
+            self.command, self.path, dict(self.headers), body
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if not slow:
+            self.wfile.write(content)
+            return
+        chunk_size = max(1, len(content) // SLOW_BODY_CHUNKS + 1)
+        for start in range(0, len(content), chunk_size):
+            self.wfile.write(content[start : start + chunk_size])
+            self.wfile.flush()
+            time.sleep(stand_in.faults.slow_body_delay / SLOW_BODY_CHUNKS)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        self.server.stand_in.logger.debug(format % args)
+
+
+class StandInServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Local stand-in for the Inventaire API. Requests are answered from the
+    recorded fixtures when they match, else proxied to the upstream server
+    and recorded when one is set, else with synthetic responses.
+
+    :param host: interface to listen on
+    :param port: port to listen on, 0 for a free one
+    :param faults: Faults injected in the responses
+    :param fixtures: recorded responses by fixture_key, or the path of a json file of them
+    :param upstream: API base url to proxy and record unknown requests to
+    :param api: SyntheticApi answering the other requests
+    :param compress_min_size: size from which responses are gzip encoded when
+                              the client accepts it, None to never encode them
+
+    The requests counter counts the requests by method and route, and
+    faults_served the injected faults by kind. Successful GET responses
+    have an ETag and a Last-Modified date, the time their body was first
+    served, and not_modified counts the 304 answers to If-None-Match or,
+    without it, If-Modified-Since.
+    Gzip encoded request bodies are decoded, and compressed counts the
+    gzip encoded request and response bodies.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Faults | None = None,
+        fixtures: dict | str | None = None,
+        upstream: str | None = None,
+        api: SyntheticApi | None = None,
+        compress_min_size: int | None = None,
+    ):
+        if isinstance(fixtures, str):
+            with open(fixtures, encoding="utf-8") as file:
+                fixtures = jsonlib.load(file)
+        self.fixtures = fixtures or {}
+        self.faults = faults or Faults()
+        self.upstream = upstream
+        self.api = api or SyntheticApi()
+        self.requests = Counter()
+        self.faults_served = Counter()
+        self.not_modified = 0
+        self._modified_at = {}
+        self.compressed = Counter()
+        self.compress_min_size = compress_min_size
+        self._lock = threading.Lock()
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """API base url of the server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        self.logger.debug(f"Stand-in server listening on {self.url}")
+        return self
+
+    def serve_forever(self):
+        """Serve in the current thread, until interrupted"""
+        self.logger.debug(f"Stand-in server listening on {self.url}")
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def save_fixtures(self, path: str):
+        """Write the recorded fixtures to a json file"""
+        with self._lock:
+            fixtures = dict(self.fixtures)
+        with open(path, "w", encoding="utf-8") as file:
+            jsonlib.dump(fixtures, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def _record(self, method: str, path: str, headers: dict, body: bytes | None) -> dict:
+        """Proxy a request to the upstream server and return it as a fixture"""
+        url = self.upstream.rstrip("/") + "/" + path[len(API_PREFIX) :]
+        request = Request(
+            url,
+            data=body,
+            method=method,
+            headers={k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS},
+        )
+        try:
+            with urlopen(request) as response:
+                status, content = response.status, response.read()
+        except HTTPError as error:
+            status, content = error.code, error.read()
+        return {"status": status, "body": content.decode("utf-8")}
+
+    def _answer(self, method: str, path: str, headers: dict, body: bytes | None):
+        """Return the status and body of the response to a request"""
+        parts = urlsplit(path)
+        route = parts.path[len(API_PREFIX) :].strip("/")
+        params = dict(parse_qsl(parts.query))
+        key = fixture_key(method, route, params)
+        fixture = self.fixtures.get(key)
+        if fixture is None and self.upstream:
+            fixture = self._record(method, path, headers, body)
+            with self._lock:
+                self.fixtures[key] = fixture
+        if fixture is not None:
+            return fixture["status"], fixture["body"].encode("utf-8")
+
+        handler = self.api.routes.get((method, route))
+        if handler is None or not parts.path.startswith(API_PREFIX):
+            error = {"status": 404, "error": f"unknown route {method} {parts.path}"}
+            return 404, jsonlib.dumps(error).encode()
+        if body and "json" in headers.get("Content-Type", ""):
+            body = jsonlib.loads(body)
+        return 200, jsonlib.dumps(handler(params, body)).encode()
+
+    def handle(self, method: str, path: str, headers: dict, body: bytes | None):
+        """
+        Answer a request, with the faults drawn for it.
+
+        :returns: status, headers, body bytes and whether the body is sent slowly
+        """
+        delay, fault = self.faults.draw()
+        with self._lock:
+            self.requests[(method, urlsplit(path).path[len(API_PREFIX) :].strip("/"))] += 1
+            if fault is not None:
+                self.faults_served[fault] += 1
+        if delay:
+            time.sleep(delay)
+        if fault == "error":
+            return 500, dict(JSON_HEADERS), b'{"status":500}', False
+        if fault == "throttle":
+            throttle_headers = {**JSON_HEADERS, "Retry-After": str(self.faults.retry_after)}
+            return 429, throttle_headers, b'{"status":429}', False
+        encoding = headers.get("Content-Encoding")
+        if body and encoding == "gzip":
+            body = gzip.decompress(body)
+            with self._lock:
+                self.compressed["request"] += 1
+        elif body and encoding not in (None, "identity"):
+            error = {"status": 415, "error": f"unsupported content encoding {encoding}"}
+            return 415, dict(JSON_HEADERS), jsonlib.dumps(error).encode(), False
+        status, content = self._answer(method, path, headers, body)
+        response_headers = dict(JSON_HEADERS)
+        if method == "GET" and status == 200:
+            etag = f'"{hashlib.sha1(content).hexdigest()[:16]}"'
+            with self._lock:
+                modified_at = self._modified_at.setdefault(etag, int(time.time()))
+            response_headers["ETag"] = etag
+            response_headers["Last-Modified"] = formatdate(modified_at, usegmt=True)
+            if _not_modified(headers, etag, modified_at):
+                with self._lock:
+                    self.not_modified += 1
+                return 304, response_headers, b"", False
+        if (
+            self.compress_min_size is not None
+            and len(content) >= self.compress_min_size
+            and "gzip" in headers.get("Accept-Encoding", "")
+        ):
+            content = gzip.compress(content, compresslevel=6)
+            response_headers["Content-Encoding"] = "gzip"
+            with self._lock:
+                self.compressed["response"] += 1
+        return status, response_headers, content, fault == "slow"
+
+
+def main():
+    """Run the stand-in server from the command line"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Inventaire API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", help="json file of recorded responses to serve")
+    parser.add_argument("--upstream", help="API base url to proxy and record requests to")
+    parser.add_argument("--record", help="json file to save the recorded responses to on exit")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--compress-min-size", type=int, help="gzip encode responses from this size"
+    )
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        slow_body_rate=args.slow_body_rate,
+        seed=args.seed,
+    )
+    server = StandInServer(
+        args.host,
+        args.port,
+        faults=faults,
+        fixtures=args.fixtures,
+        upstream=args.upstream,
+        compress_min_size=args.compress_min_size,
+    )
+    print(f"Serving the Inventaire stand-in API on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        if args.record:
+            server.save_fixtures(args.record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Bulk operations running many requests with bounded concurrency"""
+
+import inspect
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from inventaire.utils.rate_limit import TokenBucket
+
+
+class BulkResult:
+    """Outcome of one operation of a bulk: its input index and spec, and value or error"""
+
+    __slots__ = ("index", "spec", "value", "error")
+
+    def __init__(self, index: int, spec, value=None, error: Exception | None = None):
+        self.index = index
+        self.spec = spec
+        self.value = value
+        self.error = error
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else f"value={self.value!r}"
+        return f"BulkResult(index={self.index}, {outcome})"
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded"""
+        return self.error is None
+
+
+class BulkSummary:
+    """Counts of a bulk outcomes, keeping only the failures so they can be retried"""
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failures = []
+
+    def __repr__(self):
+        return f"BulkSummary(succeeded={self.succeeded}, failed={len(self.failures)})"
+
+    def add(self, result: BulkResult):
+        """Count a result"""
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failures.append(result)
+
+    @property
+    def failed_specs(self) -> list:
+        """Specs of the failed operations, to be retried"""
+        return [result.spec for result in self.failures]
+
+
+def _blocking_result(future, pending):
+    """Return the result of a call, which must not be a coroutine nobody awaits"""
+    result = future.result()
+    if inspect.iscoroutine(result):
+        wait(pending)
+        for call in (future, *pending):
+            if not call.exception() and inspect.iscoroutine(call.result()):
+                call.result().close()
+        raise TypeError(
+            "Bulk operations need blocking calls, got a coroutine: "
+            "use an InventaireSession rather than an AsyncInventaireSession"
+        )
+    return result
+
+
+def run_bulk(func, specs, max_workers: int = 4, ordered: bool = False, rate=None):
+    """
+    Run func over specs in a thread pool. Specs are pulled lazily from the
+    iterable, with at most twice max_workers in flight, so the input is never
+    held in memory as a whole.
+
+    :param func: callable taking a spec
+    :param specs: iterable of specs
+    :param max_workers: max number of calls running at once
+    :param ordered: yield results in the input order instead of as they complete
+    :param rate: max number of calls started per second
+    :raises: TypeError if func returns awaitables, e.g. endpoints bound to an
+             AsyncInventaireSession, as nothing would await them
+    :returns: generator of BulkResult
+    """
+    bucket = TokenBucket(rate) if rate else None
+    specs = enumerate(specs)
+    window = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit(count):
+            if count <= 0:
+                return
+            for index, spec in specs:
+                if bucket is not None:
+                    bucket.acquire()
+                pending[executor.submit(func, spec)] = (index, spec)
+                count -= 1
+                if not count:
+                    return
+
+        submit(window)
+        while pending:
+            if ordered:
+                done = list(pending)[:1]
+                wait(done)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, spec = pending.pop(future)
+                error = future.exception()
+                yield BulkResult(
+                    index, spec, None if error else _blocking_result(future, pending), error
+                )
+            submit(window - len(pending))
+
+
+class BulkOperation:
+    """
+    A lazily run bulk operation. Iterate over it to run the operations and
+    get their BulkResult as they complete, or call run() to only get the
+    summary. The summary is filled in while iterating.
+
+    :param func: callable taking a spec
+    :param specs: iterable of specs
+    :param keyword max_workers: max number of calls running at once
+    :param keyword ordered: yield results in the input order
+    :param keyword rate: max number of calls started per second
+    """
+
+    def __init__(self, func, specs, **kwargs):
+        self.func = func
+        self.specs = specs
+        self.kwargs = kwargs
+        self.summary = BulkSummary()
+
+    def __iter__(self):
+        for result in run_bulk(self.func, self.specs, **self.kwargs):
+            self.summary.add(result)
+            yield result
+
+    def run(self) -> BulkSummary:
+        """Run all the operations and return their summary"""
+        for _ in self:
+            pass
+        return self.summary
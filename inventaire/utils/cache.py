@@ -0,0 +1,196 @@
+"""Response cache to use with the session for idempotent GET requests"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from inventaire.utils.common import str_bool
+
+# Default time to live in seconds per endpoint, endpoints missing here are not cached
+DEFAULT_CACHE_TTLS = {
+    "entities/by-uris": 60 * 60,
+    "entities/popularity": 60 * 60,
+    "data/isbn": 24 * 60 * 60,
+    "data/wp-extract": 24 * 60 * 60,
+}
+
+
+class CacheEntry:
+    """A cached response body with its expiration time and HTTP validators"""
+
+    __slots__ = ("content", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        content: bytes,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        self.content = content
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> dict:
+        """Return the headers asking the server to only send the body if it changed"""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache of GET response bodies with LRU eviction.
+
+    Raw bodies are stored rather than decoded json, so every caller gets
+    its own freshly decoded object and can't alter the cached data.
+    Expired responses with an ETag or Last-Modified validator are kept
+    until evicted, so they can be revalidated with a conditional request.
+
+    :param ttls: dict with endpoints as keys and time to live in seconds as values
+    :param default_ttl: time to live for endpoints missing from ttls,
+                        None to not cache them
+    :param max_size: max number of cached responses
+    :param clock: function returning the current time in seconds
+    """
+
+    def __init__(
+        self,
+        ttls: dict | None = None,
+        default_ttl: float | None = None,
+        max_size: int = 1024,
+        clock=time.monotonic,
+    ):
+        self.ttls = DEFAULT_CACHE_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "revalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        """Return the time to live of an endpoint, None if it's not cached"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict | None = None) -> tuple:
+        """
+        Build a cache key from an endpoint and its params. Params are sorted
+        and normalized, and 'refresh' is left out so a refreshed response
+        replaces the regular one.
+        """
+        normalized = []
+        for key, value in (params or {}).items():
+            if key == "refresh" or value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = "|".join(map(str, value))
+            normalized.append((key, str(str_bool(value))))
+        return endpoint, tuple(sorted(normalized))
+
+    def get(self, key: tuple) -> bytes | None:
+        """Return a cached response body, None if it's missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None and entry.etag is None and entry.last_modified is None:
+                    del self._entries[key]
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry.content
+
+    def get_stale(self, key: tuple) -> CacheEntry | None:
+        """Return a cached entry with validators, fresh or not, to revalidate it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.etag is None and entry.last_modified is None):
+                return None
+            return entry
+
+    def revalidate(
+        self, key: tuple, entry: CacheEntry, ttl: float, headers: dict | None = None
+    ) -> bytes:
+        """
+        Store again an entry the server answered is not modified.
+
+        :param headers: headers of the 304 response, whose ETag and Last-Modified
+                        validators replace the entry ones
+        :returns: the entry body
+        """
+        headers = headers or {}
+        self.set(
+            key,
+            entry.content,
+            ttl,
+            headers.get("ETag", entry.etag),
+            headers.get("Last-Modified", entry.last_modified),
+        )
+        with self._lock:
+            self._counters["revalidations"] += 1
+        return entry.content
+
+    def set(
+        self,
+        key: tuple,
+        content: bytes,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        """
+        Store a response body, evicting the least recently used ones if full.
+
+        :param etag: ETag header of the response
+        :param last_modified: Last-Modified header of the response
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(
+                content, self._clock() + ttl, etag, last_modified
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, endpoint: str | None = None):
+        """Drop the cached responses of an endpoint, or all of them"""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == endpoint]:
+                del self._entries[key]
+
+    @property
+    def stats(self) -> dict:
+        """Hits, misses, evictions and revalidations counters to tune the cache"""
+        with self._lock:
+            hits, misses = self._counters["hits"], self._counters["misses"]
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+
+
+def get_cache(cache: ResponseCache | bool | None = None) -> ResponseCache | None:
+    """
+    Return the response cache of a session option.
+
+    :param cache: a ResponseCache, True for the default one,
+                  or None or False to not cache responses
+    """
+    if cache is True:
+        return ResponseCache()
+    # An empty cache is falsy, so test for the disabled values only
+    return None if cache is None or cache is False else cache
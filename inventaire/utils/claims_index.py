@@ -0,0 +1,119 @@
+"""In-memory claims index answering reverse claims queries locally"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_MAX_AGE = 60 * 60
+
+
+def _claim_pairs(claims: dict) -> frozenset:
+    """Return the (property, value) pairs of claims, skipping unhashable values"""
+    return frozenset(
+        (sys.intern(prop), sys.intern(value) if isinstance(value, str) else value)
+        for prop, values in (claims or {}).items()
+        for value in values
+        if isinstance(value, (str, int))
+    )
+
+
+class ClaimsIndex:
+    """
+    Thread-safe inverted index of entities claims: property -> value -> URIs.
+    It is filled with every entity fetched through the entities endpoints.
+
+    As fetched entities only give a partial view, an answer is only complete
+    once the server answered the same reverse claims query. Complete answers
+    are trusted for max_age seconds, and kept up to date with the entities
+    fetched since.
+
+    :param max_age: seconds during which a server answer is trusted
+    :param clock: function returning the current time in seconds
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, clock=time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._uris = defaultdict(lambda: defaultdict(set))
+        self._pairs = {}
+        self._complete = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def _unlink(self, uri: str):
+        """Remove the pairs of an entity from the index"""
+        for prop, value in self._pairs.pop(uri, ()):
+            uris = self._uris[prop][value]
+            uris.discard(uri)
+            if not uris:
+                del self._uris[prop][value]
+
+    def add(self, uri: str, claims: dict):
+        """Index an entity claims, replacing the ones of a previous revision"""
+        pairs = _claim_pairs(claims)
+        uri = sys.intern(uri)
+        with self._lock:
+            self._unlink(uri)
+            self._pairs[uri] = pairs
+            for prop, value in pairs:
+                self._uris[prop][value].add(uri)
+
+    def add_entities(self, response: dict) -> dict:
+        """
+        Index the entities of a by-uris like response.
+
+        :returns: the response, unchanged
+        """
+        for uri, entity in (response.get("entities") or {}).items():
+            if isinstance(entity, dict) and "claims" in entity:
+                self.add(uri, entity["claims"])
+        return response
+
+    def set_complete(self, prop: str, value, uris: list[str]):
+        """Record a server answer to a reverse claims query"""
+        with self._lock:
+            for uri in uris:
+                uri = sys.intern(uri)
+                pairs = self._pairs.get(uri, frozenset())
+                self._pairs[uri] = pairs | {(sys.intern(prop), value)}
+                self._uris[prop][value].add(uri)
+            self._complete[(prop, value)] = self._clock() + self.max_age
+
+    def uris(self, prop: str, value) -> list[str]:
+        """Return the URIs of the indexed entities with a claim"""
+        with self._lock:
+            return sorted(self._uris.get(prop, {}).get(value, ()))
+
+    def lookup(self, prop: str, value) -> list[str] | None:
+        """
+        Return the URIs of the entities with a claim if the answer is complete,
+        None otherwise.
+        """
+        with self._lock:
+            expires_at = self._complete.get((prop, value))
+            if expires_at is None or expires_at <= self._clock():
+                self._complete.pop((prop, value), None)
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            return sorted(self._uris.get(prop, {}).get(value, ()))
+
+    def invalidate(self, uri: str | None = None):
+        """Forget an entity, or the whole index if no uri is given"""
+        with self._lock:
+            if uri is None:
+                self._uris.clear()
+                self._pairs.clear()
+                self._complete.clear()
+            else:
+                self._unlink(uri)
+
+    @property
+    def stats(self) -> dict:
+        """Index hits, misses and number of indexed entities"""
+        with self._lock:
+            return {**self._counters, "entities": len(self._pairs)}
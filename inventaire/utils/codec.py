@@ -0,0 +1,92 @@
+"""JSON codecs encoding request bodies and decoding responses"""
+
+import json as jsonlib
+
+CODEC_NAMES = ("orjson", "ujson", "stdlib")
+
+
+class JsonCodec:
+    """
+    A JSON codec: loads takes bytes or str, dumps returns utf-8 bytes.
+
+    :param name: codec name, for logs and reprs
+    :param loads: callable decoding a JSON document
+    :param dumps: callable encoding an object to utf-8 JSON bytes
+    """
+
+    __slots__ = ("name", "loads", "dumps")
+
+    def __init__(self, name: str, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"JsonCodec({self.name!r})"
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        "stdlib",
+        jsonlib.loads,
+        lambda obj: jsonlib.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(),
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    # pylint: disable=import-outside-toplevel,import-error,no-member
+    import orjson
+
+    return JsonCodec(
+        "orjson", orjson.loads, lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    )
+
+
+def _ujson_codec() -> JsonCodec:
+    import ujson  # pylint: disable=import-outside-toplevel,import-error
+
+    return JsonCodec(
+        "ujson", ujson.loads, lambda obj: ujson.dumps(obj, ensure_ascii=False).encode()
+    )
+
+
+_FACTORIES = {"orjson": _orjson_codec, "ujson": _ujson_codec, "stdlib": _stdlib_codec}
+
+
+def get_codec(codec: str | JsonCodec | None = None) -> JsonCodec:
+    """
+    Return a JSON codec.
+
+    :param codec: a JsonCodec, one of CODEC_NAMES, or None or 'auto'
+                  for the fastest installed one
+    :raises: ImportError if the named codec library is not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec in (None, "auto"):
+        for name in CODEC_NAMES:
+            try:
+                return _FACTORIES[name]()
+            except ImportError:
+                continue
+    if codec not in _FACTORIES:
+        raise ValueError(f"Unknown JSON codec {codec}, expected one of {CODEC_NAMES}")
+    return _FACTORIES[codec]()
+
+
+def encode_json_body(codec: JsonCodec, kwargs: dict) -> dict:
+    """
+    Replace the 'json' argument of a request with a body encoded by the codec.
+
+    :param codec: JsonCodec encoding the body
+    :param kwargs: request arguments, modified in place
+    :returns: the request arguments
+    """
+    body = kwargs.pop("json", None)
+    if body is not None:
+        kwargs["data"] = codec.dumps(body)
+        kwargs["headers"] = {
+            "Content-Type": "application/json",
+            **(kwargs.get("headers") or {}),
+        }
+    return kwargs
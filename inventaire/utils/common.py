@@ -1,6 +1,9 @@
 """Common helper functions to use with the package"""
 
+from contextlib import nullcontext
 from copy import deepcopy
+from itertools import islice
+from urllib.parse import quote
 
 
 def cookie_str_to_dict(cookie_str: str) -> dict:
@@ -35,3 +38,59 @@ def str_bool(boolean: bool | None) -> str | None:
     Convert a Python boolean type into a typescript boolean type
     """
     return str(boolean).lower() if isinstance(boolean, bool) else boolean
+
+
+def pipe_split(values: str | list[str]) -> list[str]:
+    """
+    Convert a pipe-separated string or a list of values into a list
+    of unique values, keeping their order
+    """
+    if isinstance(values, str):
+        values = values.split("|")
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def chunk_values(values: list[str], max_count: int, max_length: int | None = None):
+    """
+    Split values into chunks to be sent pipe-joined in a query string.
+
+    :param values: values to split
+    :param max_count: max number of values in a chunk
+    :param max_length: max url-encoded length of a pipe-joined chunk
+    :returns: generator of lists of values
+    """
+    chunk, length = [], 0
+    for value in values:
+        # each value is followed by an url-encoded pipe: '%7C'
+        value_length = len(quote(value, safe="")) + 3
+        if chunk and (
+            len(chunk) >= max_count
+            or (max_length and length + value_length > max_length)
+        ):
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(value)
+        length += value_length
+    if chunk:
+        yield chunk
+
+
+def batched(iterable, size: int):
+    """
+    Lazily split an iterable into lists of at most size elements
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def open_text(source, mode: str = "r"):
+    """
+    Open a text file path for reading or writing, or pass an already
+    opened file object through, to be used as a context manager
+    """
+    if hasattr(source, "read") or hasattr(source, "write"):
+        return nullcontext(source)
+    return open(  # pylint: disable=consider-using-with
+        source, mode, encoding="utf-8", newline=""
+    )
@@ -0,0 +1,137 @@
+"""Content encodings negotiated for responses and used to compress request bodies"""
+
+import gzip
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Most to least preferred response encodings, when they can be decoded
+ENCODING_PREFERENCE = ("zstd", "br", "gzip", "deflate")
+
+# Request bodies smaller than this are not worth compressing
+DEFAULT_MIN_SIZE = 64 * 1024
+
+ENCODING_MISSING_MSG = (
+    "Compressing request bodies with {} requires a library that is not installed: {}"
+)
+
+
+def accept_encoding(decodable: str | list[str] = ACCEPT_ENCODING) -> str:
+    """
+    Return the Accept-Encoding header value listing the encodings the HTTP
+    client can decode while streaming, from most to least preferred.
+
+    :param decodable: encodings the client decodes, as a list or separated
+                      by commas. Defaults to urllib3 ones: gzip and deflate,
+                      plus zstd and br if their libraries are installed
+    """
+    if isinstance(decodable, str):
+        decodable = decodable.split(",")
+    available = {encoding.strip() for encoding in decodable}
+    return ", ".join(
+        encoding for encoding in ENCODING_PREFERENCE if encoding in available
+    )
+
+
+def _gzip_compressor():
+    return lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _zstd_compressor():
+    # pylint: disable=import-outside-toplevel,import-error
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            from backports import zstd
+        except ImportError:
+            import zstandard
+
+            return zstandard.ZstdCompressor(level=3).compress
+    return zstd.compress
+
+
+def _brotli_compressor():
+    # pylint: disable=import-outside-toplevel,import-error
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+    return lambda data: brotli.compress(data, quality=5)
+
+
+_COMPRESSORS = {
+    "gzip": (_gzip_compressor, "gzip"),
+    "zstd": (_zstd_compressor, "backports.zstd or zstandard"),
+    "br": (_brotli_compressor, "brotli or brotlicffi"),
+}
+
+
+class RequestCompression:
+    """
+    Compress large request bodies. The Inventaire server accepts gzip
+    encoded bodies; zstd and br are for servers or proxies decoding them.
+
+    :param encoding: 'gzip', 'zstd' or 'br'
+    :param min_size: size in bytes from which bodies are compressed
+    :param methods: methods whose bodies are compressed
+    :raises: ImportError if the encoding library is not installed
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        min_size: int = DEFAULT_MIN_SIZE,
+        methods: tuple = ("post", "put"),
+    ):
+        if encoding not in _COMPRESSORS:
+            raise ValueError(
+                f"Unknown encoding {encoding}, expected one of {tuple(_COMPRESSORS)}"
+            )
+        factory, library = _COMPRESSORS[encoding]
+        try:
+            self._compress = factory()
+        except ImportError as error:
+            raise ImportError(ENCODING_MISSING_MSG.format(encoding, library)) from error
+        self.encoding = encoding
+        self.min_size = min_size
+        self.methods = tuple(method.lower() for method in methods)
+
+    def __repr__(self):
+        return f"RequestCompression({self.encoding!r}, min_size={self.min_size})"
+
+    def compress_body(self, method: str, kwargs: dict) -> dict:
+        """
+        Compress the encoded body of a request if it is large enough,
+        and set its Content-Encoding header.
+
+        :param method: request method
+        :param kwargs: request arguments, modified in place
+        :returns: the request arguments
+        """
+        data = kwargs.get("data")
+        if (
+            method.lower() not in self.methods
+            or not isinstance(data, bytes)
+            or len(data) < self.min_size
+        ):
+            return kwargs
+        headers = kwargs.get("headers") or {}
+        if any(name.lower() == "content-encoding" for name in headers):
+            return kwargs
+        kwargs["data"] = self._compress(data)
+        kwargs["headers"] = {**headers, "Content-Encoding": self.encoding}
+        return kwargs
+
+
+def get_compression(
+    compression: RequestCompression | bool | None = None,
+) -> RequestCompression | None:
+    """
+    Return the request compression of a session option.
+
+    :param compression: a RequestCompression, True for the default one,
+                        or None or False to not compress request bodies
+    """
+    if compression is True:
+        return RequestCompression()
+    return compression or None
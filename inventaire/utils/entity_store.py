@@ -0,0 +1,224 @@
+"""Persistent entity store to use with the entities endpoints"""
+
+import json as jsonlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+# SQLite caps the number of bound parameters of a query
+MAX_QUERY_PARAMS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    uri TEXT PRIMARY KEY,
+    revision TEXT,
+    revnum INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS redirects (
+    from_uri TEXT PRIMARY KEY,
+    to_uri TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+UPSERT_ENTITY = """
+INSERT INTO entities (uri, revision, revnum, fetched_at, body) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(uri) DO UPDATE SET
+    revision = excluded.revision,
+    revnum = excluded.revnum,
+    fetched_at = excluded.fetched_at,
+    body = excluded.body
+WHERE excluded.revnum >= entities.revnum
+"""
+
+UPSERT_REDIRECT = """
+INSERT INTO redirects (from_uri, to_uri, fetched_at) VALUES (?, ?, ?)
+ON CONFLICT(from_uri) DO UPDATE SET
+    to_uri = excluded.to_uri,
+    fetched_at = excluded.fetched_at
+"""
+
+
+def entity_revision(entity: dict) -> tuple[str | None, int]:
+    """
+    Return the revision of an entity and its sequence number: Wikidata
+    entities have a 'lastrevid', Inventaire ones a CouchDB '_rev' ('12-abc...').
+    """
+    if entity.get("lastrevid") is not None:
+        return str(entity["lastrevid"]), int(entity["lastrevid"])
+    rev = entity.get("_rev")
+    if rev:
+        number = rev.split("-", maxsplit=1)[0]
+        return rev, int(number) if number.isdigit() else 0
+    return None, 0
+
+
+class EntityStore:
+    """
+    SQLite-backed entity store surviving restarts. Entities endpoints read through
+    it: fresh stored entities are served locally and only stale or missing ones
+    are fetched. Each entity revision is recorded, and an entity is never
+    overwritten by an older revision, so several processes on one host can
+    share the same database file.
+
+    With revalidate set, the revisions of stale entities are first checked
+    with a cheap request for their info only: the unchanged ones are marked
+    fresh again and served from the store, and only the changed ones are
+    fetched in full. Store queries are blocking SQLite calls: with an
+    AsyncInventaireSession, they run on the event loop thread and stale
+    entities are fetched in full.
+
+    :param path: database file path
+    :param max_age: seconds after which a stored entity is stale
+    :param timeout: seconds to wait for another process to release the database lock
+    :param revalidate: whether to check stale entities revisions before re-fetching them
+    :param clock: function returning the current time in seconds
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        max_age: float = DEFAULT_MAX_AGE,
+        timeout: float = 30.0,
+        revalidate: bool = True,
+        clock=time.time,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.timeout = timeout
+        self.revalidate = revalidate
+        self._clock = clock
+        self._local = threading.local()
+        self.logger = logging.getLogger(__name__)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return a connection for the current thread and process"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            self.logger.debug(f"Open entity store {self.path}")
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self):
+        """Close the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _select(self, query: str, values: list[str]) -> list[tuple]:
+        """Run a select with an 'IN' clause over values, in batches"""
+        rows = []
+        for i in range(0, len(values), MAX_QUERY_PARAMS):
+            batch = values[i : i + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(
+                self._connection().execute(query.format(placeholders), batch)
+            )
+        return rows
+
+    def lookup(self, uris: list[str]) -> tuple[dict, list[str]]:
+        """
+        Look up fresh entities, following stored redirects.
+
+        :param uris: entities URIs
+        :returns: a by-uris like response with the fresh stored entities
+                  and redirects, and the list of URIs still to be fetched
+        """
+        min_fetched_at = self._clock() - self.max_age
+        redirects = {
+            from_uri: to_uri
+            for from_uri, to_uri, fetched_at in self._select(
+                "SELECT from_uri, to_uri, fetched_at FROM redirects "
+                "WHERE from_uri IN ({})",
+                uris,
+            )
+            if fetched_at >= min_fetched_at
+        }
+        targets = list(dict.fromkeys(redirects.get(uri, uri) for uri in uris))
+        entities = {
+            uri: jsonlib.loads(body)
+            for uri, body, fetched_at in self._select(
+                "SELECT uri, body, fetched_at FROM entities WHERE uri IN ({})",
+                targets,
+            )
+            if fetched_at >= min_fetched_at
+        }
+        redirects = {k: v for k, v in redirects.items() if v in entities}
+        missing = [uri for uri in uris if redirects.get(uri, uri) not in entities]
+        return {"entities": entities, "redirects": redirects}, missing
+
+    def put(self, response: dict):
+        """
+        Store the entities and redirects of a by-uris response.
+
+        :param response: by-uris response
+        """
+        fetched_at = self._clock()
+        entity_rows = []
+        for uri, entity in response.get("entities", {}).items():
+            revision, revnum = entity_revision(entity)
+            entity_rows.append(
+                (uri, revision, revnum, fetched_at, jsonlib.dumps(entity))
+            )
+        redirect_rows = [
+            (from_uri, to_uri, fetched_at)
+            for from_uri, to_uri in response.get("redirects", {}).items()
+        ]
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(UPSERT_ENTITY, entity_rows)
+            connection.executemany(UPSERT_REDIRECT, redirect_rows)
+
+    def revisions(self, uris: list[str]) -> dict:
+        """Return the stored revision of entities, fresh or stale, that have one"""
+        return dict(
+            self._select(
+                "SELECT uri, revision FROM entities "
+                "WHERE revision IS NOT NULL AND uri IN ({})",
+                uris,
+            )
+        )
+
+    def touch(self, uris: list[str]):
+        """Mark stored entities as fresh, once their revision is known to be current"""
+        fetched_at = self._clock()
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "UPDATE entities SET fetched_at = ? WHERE uri = ?",
+                [(fetched_at, uri) for uri in uris],
+            )
+
+    def invalidate(self, uris: list[str] | None = None):
+        """Drop stored entities and redirects, or all of them"""
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if uris is None:
+                connection.execute("DELETE FROM entities")
+                connection.execute("DELETE FROM redirects")
+                return
+            for i in range(0, len(uris), MAX_QUERY_PARAMS):
+                batch = uris[i : i + MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                connection.execute(
+                    f"DELETE FROM entities WHERE uri IN ({placeholders})", batch
+                )
+                connection.execute(
+                    f"DELETE FROM redirects WHERE from_uri IN ({placeholders})", batch
+                )
@@ -0,0 +1,330 @@
+"""Request instrumentation hooks, with latency histogram, Prometheus and OpenTelemetry adapters"""
+
+import bisect
+import logging
+import re
+import threading
+from collections import defaultdict
+
+HOOK_NAMES = ("before_request", "after_response", "on_error")
+
+# Upper bounds in seconds, the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OPENTELEMETRY_MISSING_MSG = (
+    "OpenTelemetrySpans requires opentelemetry-api, "
+    "install it with 'pip install opentelemetry-api'"
+)
+
+_ID_SEGMENT = re.compile(r"^[0-9a-f]{32}$|^\d+$")
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Return a low cardinality label for an endpoint, replacing ids in its path,
+    e.g. 'users/0123...cdef' becomes 'users/:id'.
+    """
+    return "/".join(
+        ":id" if _ID_SEGMENT.match(segment) else segment
+        for segment in endpoint.split("?")[0].split("/")
+    )
+
+
+def _escape_label(value) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestEvent:  # pylint: disable=too-many-instance-attributes
+    """
+    What the request hooks get. The same event goes through the hooks of a
+    request, filled as it progresses: status, duration, response_bytes and
+    retries are set when it ends, and error if it failed without a response.
+
+    :param method: request method
+    :param endpoint: endpoint the request is made to
+    :param request_bytes: size of the request body
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "status",
+        "duration",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "error",
+        "context",
+    )
+
+    def __init__(self, method: str, endpoint: str, request_bytes: int = 0):
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.status = None
+        self.duration = None
+        self.request_bytes = request_bytes
+        self.response_bytes = None
+        self.retries = 0
+        self.error = None
+        # Scratch space for hooks to keep state between callbacks, e.g. a span
+        self.context = {}
+
+    @classmethod
+    def for_request(cls, method: str, endpoint: str, kwargs: dict) -> "RequestEvent":
+        """Return the event of a request, sized from its encoded body"""
+        data = kwargs.get("data")
+        return cls(method, endpoint, len(data) if isinstance(data, (bytes, str)) else 0)
+
+    def __repr__(self):
+        return (
+            f"RequestEvent({self.method} {self.endpoint}, status={self.status}, "
+            f"duration={self.duration}, retries={self.retries})"
+        )
+
+
+class RequestHooks:
+    """
+    Callbacks run around every request sent by a session, with a RequestEvent:
+    before_request, after_response (any status, once retries are over) and
+    on_error (no response: connection error, timeout or open circuit).
+    Exceptions raised by hooks are logged, never propagated to the request.
+
+    :param observers: objects whose before_request, after_response and
+                      on_error methods are registered
+    """
+
+    def __init__(self, *observers):
+        self._callbacks = {name: [] for name in HOOK_NAMES}
+        for observer in observers:
+            self.register(observer)
+
+    def __bool__(self):
+        return any(self._callbacks.values())
+
+    def add(self, name: str, callback):
+        """Register a callback for one of HOOK_NAMES"""
+        if name not in self._callbacks:
+            raise ValueError(f"Unknown hook {name}, expected one of {HOOK_NAMES}")
+        self._callbacks[name].append(callback)
+
+    def register(self, observer):
+        """Register the hook methods an observer defines, e.g. an adapter"""
+        for name in HOOK_NAMES:
+            callback = getattr(observer, name, None)
+            if callable(callback):
+                self.add(name, callback)
+        return observer
+
+    def emit(self, name: str, event: RequestEvent):
+        """Run the callbacks of a hook"""
+        for callback in self._callbacks[name]:
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception(f"Request hook {name} failed for {event}")
+
+
+class LatencyHistogram:
+    """
+    Thread-safe per endpoint latency histograms, by method and endpoint label.
+
+    :param buckets: ascending bucket upper bounds, in seconds
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._sums = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, endpoint: str, duration: float):
+        """Record the duration of a request"""
+        key = (method.upper(), endpoint_label(endpoint))
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            self._counts[key][index] += 1
+            self._sums[key] += duration
+
+    def after_response(self, event: RequestEvent):
+        """Hook recording the duration of answered requests"""
+        self.observe(event.method, event.endpoint, event.duration)
+
+    on_error = after_response
+
+    def snapshot(self) -> dict:
+        """
+        Return the histograms by (method, endpoint label), with
+        cumulative bucket counts, the total count and sum of durations.
+        """
+        with self._lock:
+            snapshot = {}
+            for key, counts in self._counts.items():
+                cumulative, total = [], 0
+                for count in counts:
+                    total += count
+                    cumulative.append(total)
+                snapshot[key] = {
+                    "buckets": dict(zip((*self.buckets, float("inf")), cumulative)),
+                    "count": total,
+                    "sum": self._sums[key],
+                }
+            return snapshot
+
+    def percentile(self, method: str, endpoint: str, quantile: float) -> float | None:
+        """
+        Return the upper bound of the bucket holding a quantile (0 to 1)
+        of an endpoint durations, or None if it has none.
+        """
+        histogram = self.snapshot().get((method.upper(), endpoint_label(endpoint)))
+        if histogram is None:
+            return None
+        rank = quantile * histogram["count"]
+        return next(
+            bound for bound, count in histogram["buckets"].items() if count >= rank
+        )
+
+
+class PrometheusMetrics(LatencyHistogram):
+    """
+    Prometheus-style request counters: requests by status, errors, retries,
+    bytes sent and received, and the latency histogram, rendered in the
+    Prometheus text exposition format, to serve or push as is.
+
+    :param prefix: metric names prefix
+    :param buckets: ascending latency bucket upper bounds, in seconds
+    """
+
+    def __init__(self, prefix: str = "inventaire_client", buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(buckets)
+        self.prefix = prefix
+        self._counters = defaultdict(float)
+
+    def _count(self, name: str, labels: tuple, value: float = 1):
+        with self._lock:
+            self._counters[(name, labels)] += value
+
+    def after_response(self, event: RequestEvent):
+        super().after_response(event)
+        labels = (event.method, endpoint_label(event.endpoint))
+        self._count("requests_total", (*labels, str(event.status)))
+        self._count("retries_total", labels, event.retries)
+        self._count("sent_bytes_total", labels, event.request_bytes or 0)
+        self._count("received_bytes_total", labels, event.response_bytes or 0)
+
+    def on_error(self, event: RequestEvent):
+        """Hook counting the requests failing without a response"""
+        super().after_response(event)
+        labels = (event.method, endpoint_label(event.endpoint))
+        self._count("errors_total", (*labels, type(event.error).__name__))
+        self._count("retries_total", labels, event.retries)
+        self._count("sent_bytes_total", labels, event.request_bytes or 0)
+
+    def counter(self, name: str, **labels) -> float:
+        """Return the sum of a counter values matching some labels"""
+        names = self._label_names(name)
+        with self._lock:
+            return sum(
+                value
+                for (counter, values), value in self._counters.items()
+                if counter == name
+                and all(dict(zip(names, values)).get(key) == val for key, val in labels.items())
+            )
+
+    @staticmethod
+    def _label_names(name: str) -> tuple:
+        if name == "requests_total":
+            return ("method", "endpoint", "status")
+        if name == "errors_total":
+            return ("method", "endpoint", "error")
+        return ("method", "endpoint")
+
+    @staticmethod
+    def _labels(names: tuple, values: tuple) -> str:
+        pairs = ",".join(
+            f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)
+        )
+        return "{" + pairs + "}"
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+        for name in sorted({counter for (counter, _), _ in counters}):
+            lines.append(f"# TYPE {self.prefix}_{name} counter")
+            names = self._label_names(name)
+            lines.extend(
+                f"{self.prefix}_{name}{self._labels(names, values)} {value:g}"
+                for (counter, values), value in counters
+                if counter == name
+            )
+        histogram = f"{self.prefix}_request_duration_seconds"
+        lines.append(f"# TYPE {histogram} histogram")
+        for key, data in sorted(self.snapshot().items()):
+            for bound, count in data["buckets"].items():
+                bound = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = self._labels(("method", "endpoint", "le"), (*key, bound))
+                lines.append(f"{histogram}_bucket{labels} {count}")
+            labels = self._labels(("method", "endpoint"), key)
+            lines.append(f"{histogram}_count{labels} {data['count']}")
+            lines.append(f"{histogram}_sum{labels} {data['sum']:g}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetrySpans:
+    """
+    Trace every request as an OpenTelemetry client span, with the HTTP
+    semantic conventions attributes, plus the retries and bytes counts.
+
+    :param tracer: an opentelemetry Tracer, defaults to the global tracer provider one
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            # pylint: disable-next=import-outside-toplevel,import-error
+            from opentelemetry import trace
+        except ImportError as error:
+            raise ImportError(OPENTELEMETRY_MISSING_MSG) from error
+        self.tracer = trace.get_tracer("inventaire") if tracer is None else tracer
+        self._client_kind = trace.SpanKind.CLIENT
+        self._error_status = trace.StatusCode.ERROR
+
+    def before_request(self, event: RequestEvent):
+        """Hook starting the request span"""
+        event.context["span"] = self.tracer.start_span(
+            f"{event.method} {endpoint_label(event.endpoint)}",
+            kind=self._client_kind,
+            attributes={
+                "http.request.method": event.method,
+                "url.path": event.endpoint,
+                "http.request.body.size": event.request_bytes or 0,
+            },
+        )
+
+    def after_response(self, event: RequestEvent):
+        """Hook ending the request span with the response attributes"""
+        span = event.context.pop("span", None)
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", event.status)
+        span.set_attribute("http.request.resend_count", event.retries)
+        if event.response_bytes is not None:
+            span.set_attribute("http.response.body.size", event.response_bytes)
+        if event.status >= 400:
+            span.set_attribute("error.type", str(event.status))
+            span.set_status(self._error_status, f"HTTP {event.status}")
+        span.end()
+
+    def on_error(self, event: RequestEvent):
+        """Hook ending the request span with the error"""
+        span = event.context.pop("span", None)
+        if span is None:
+            return
+        span.set_attribute("http.request.resend_count", event.retries)
+        span.set_attribute("error.type", type(event.error).__name__)
+        span.record_exception(event.error)
+        span.set_status(self._error_status, str(event.error))
+        span.end()
@@ -0,0 +1,103 @@
+"""ISBN validation and normalization, to avoid requests with malformed ISBNs"""
+
+ISBN_PREFIX = "isbn:"
+# Hyphens and spaces are only separators in ISBNs
+_SEPARATORS = str.maketrans("", "", "- ‐‑‒–")
+_DIGITS = frozenset("0123456789")
+
+
+def _isbn10_check_digit(digits: str) -> str:
+    total = sum((10 - i) * int(digit) for i, digit in enumerate(digits[:9]))
+    check = (11 - total % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def _isbn13_check_digit(digits: str) -> str:
+    total = sum((3 if i % 2 else 1) * int(digit) for i, digit in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def normalize_isbn(value: str) -> str | None:
+    """
+    Validate an ISBN-10 or ISBN-13, with or without hyphens,
+    and return it as a bare ISBN-13.
+
+    :param value: ISBN to normalize (e.g. '2-253-13893-2')
+    :returns: the ISBN-13 (e.g. '9782253138938'), or None if it is invalid
+    """
+    isbn = value.translate(_SEPARATORS).upper()
+    if len(isbn) == 13:
+        if _DIGITS.issuperset(isbn) and isbn[:3] in ("978", "979"):
+            return isbn if _isbn13_check_digit(isbn) == isbn[12] else None
+        return None
+    if len(isbn) == 10 and _DIGITS.issuperset(isbn[:9]):
+        if _isbn10_check_digit(isbn) != isbn[9]:
+            return None
+        isbn13 = "978" + isbn[:9]
+        return isbn13 + _isbn13_check_digit(isbn13)
+    return None
+
+
+def canonical_isbn13(value: str) -> str:
+    """
+    Return the bare ISBN-13 of an ISBN-10 or ISBN-13, with or without hyphens.
+    Unlike normalize_isbn, raise on invalid ISBNs.
+
+    :param value: ISBN-10 or ISBN-13 (e.g. '2-253-13893-2' or '978-2-253-13893-8')
+    :returns: the ISBN-13 (e.g. '9782253138938')
+    :raises: ValueError if the ISBN is invalid
+    """
+    isbn = normalize_isbn(value)
+    if isbn is None:
+        raise ValueError(f"Invalid ISBN: {value}")
+    return isbn
+
+
+def normalize_isbns(values) -> tuple[list[str], list[str]]:
+    """
+    Normalize many ISBNs in one pass, collapsing duplicates.
+
+    :param values: iterable of ISBNs
+    :returns: the unique valid ISBN-13s in input order, and the invalid inputs
+    """
+    valid, invalid = {}, []
+    for value in values:
+        isbn = normalize_isbn(value)
+        if isbn is None:
+            invalid.append(value)
+        else:
+            valid[isbn] = None
+    return list(valid), invalid
+
+
+def normalize_uri(uri: str) -> str | None:
+    """
+    Canonicalize an 'isbn:' URI to its ISBN-13 form, other URIs are left as is.
+
+    :returns: the canonical URI, or None if it is an invalid 'isbn:' URI
+    """
+    if not uri.lower().startswith(ISBN_PREFIX):
+        return uri
+    isbn = normalize_isbn(uri[len(ISBN_PREFIX) :])
+    return ISBN_PREFIX + isbn if isbn else None
+
+
+def normalize_uris(uris) -> tuple[list[str], dict, list[str]]:
+    """
+    Canonicalize many entity URIs in one pass, collapsing duplicates.
+
+    :param uris: iterable of entity URIs
+    :returns: the unique canonical URIs in input order, a dict with the
+              rewritten inputs as keys and their canonical URI as values,
+              and the invalid 'isbn:' URIs
+    """
+    canonical, aliases, invalid = {}, {}, []
+    for uri in uris:
+        normalized = normalize_uri(uri)
+        if normalized is None:
+            invalid.append(uri)
+            continue
+        if normalized != uri:
+            aliases[uri] = normalized
+        canonical[normalized] = None
+    return list(canonical), aliases, invalid
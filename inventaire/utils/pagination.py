@@ -0,0 +1,70 @@
+"""Pagination helpers walking list-style endpoints page after page"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_PARAMS = ("limit", "offset")
+
+
+def reject_page_params(*params: dict):
+    """
+    Check request params given to a pagination iterator, which sets the
+    limit and offset of every page itself.
+
+    :raises: ValueError if the params set a limit or an offset
+    """
+    for name in PAGE_PARAMS:
+        if any(name in group for group in params):
+            raise ValueError(
+                f"Pagination iterators set the {name} param of every page, "
+                "use page_size instead"
+            )
+
+
+def _next_offset(page: dict, records: list, offset: int, page_size: int) -> int | None:
+    """Return the offset of the page following this one, or None if it is the last"""
+    total = page.get("total")
+    if isinstance(total, int):
+        next_offset = offset + len(records)
+        return next_offset if records and next_offset < total else None
+    return offset + page_size if len(records) >= page_size else None
+
+
+def iter_pages(fetch_page, page_size: int, key: str, prefetch: bool = True):
+    """
+    Walk every page of a list-style endpoint and yield their records. While
+    the caller processes a page, the next one is fetched in the background.
+
+    When the response has a total count, pages are walked until it is reached,
+    even if the server returns fewer records than asked for. Otherwise the first
+    page shorter than page_size is taken as the last one: with a server capping
+    the limit below page_size, the walk stops after the first page.
+
+    :param fetch_page: callable taking offset and limit args and returning a response
+    :param page_size: number of records per page
+    :param key: response key holding the page records
+    :param prefetch: whether to fetch the next page while the current one is processed
+    :returns: generator of records
+    """
+    if page_size <= 0:
+        raise ValueError("The page size must be positive")
+
+    if not prefetch:
+        offset = 0
+        while offset is not None:
+            page = fetch_page(offset, page_size)
+            records = page.get(key) or []
+            offset = _next_offset(page, records, offset, page_size)
+            yield from records
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_page, 0, page_size)
+        offset = 0
+        while pending is not None:
+            page = pending.result()
+            records = page.get(key) or []
+            offset = _next_offset(page, records, offset, page_size)
+            pending = (
+                None if offset is None else executor.submit(fetch_page, offset, page_size)
+            )
+            yield from records
@@ -0,0 +1,92 @@
+"""HTTP connection pool to share between sessions"""
+
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+class _PoolAdapter(HTTPAdapter):
+    """HTTPAdapter passing socket options to its pool manager"""
+
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def keepalive_socket_options(idle: float | None = None) -> list[tuple]:
+    """
+    Return socket options enabling TCP keep-alive probes.
+
+    :param idle: seconds of inactivity before probes are sent, where supported,
+                 rounded down to whole seconds and at least 1 as the kernel requires
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if idle is not None and hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, max(1, int(idle))))
+    return options
+
+
+class ConnectionPool:
+    """
+    HTTP connection pool configuration. The same pool can be given to several
+    InventaireSession objects so they reuse each other's kept-alive connections.
+
+    :param pool_connections: number of per host pools to keep
+    :param pool_maxsize: max number of connections kept per host, should be at least
+                         the number of threads sharing the pool
+    :param pool_block: whether to wait for a free connection when all are in use,
+                       instead of opening a connection that is discarded afterwards
+    :param idle_timeout: seconds after which idle kept-alive connections are dropped
+                         before the next request, as servers may have closed them
+    :param tcp_keepalive: whether to send TCP keep-alive probes on idle connections
+    :param keepalive_idle: seconds of inactivity before keep-alive probes are sent,
+                           the system default when None
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        idle_timeout: float | None = None,
+        tcp_keepalive: bool = False,
+        keepalive_idle: float | None = None,
+    ):
+        self.idle_timeout = idle_timeout
+        socket_options = (
+            keepalive_socket_options(keepalive_idle) if tcp_keepalive else None
+        )
+        self.adapter = _PoolAdapter(
+            socket_options=socket_options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+
+    def mount(self, session):
+        """Make a requests session use the pool for http and https"""
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+
+    def touch(self):
+        """Mark the pool used, dropping its connections first if idle for too long"""
+        with self._lock:
+            now = time.monotonic()
+            if self.idle_timeout is not None and now - self._last_used > self.idle_timeout:
+                self.adapter.poolmanager.clear()
+            self._last_used = now
+
+    def close(self):
+        """Close all the pool connections"""
+        self.adapter.close()
@@ -0,0 +1,172 @@
+"""Client-side rate limiting to use with the session"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: tokens refill at a steady rate up to capacity,
+    and every request takes one, waiting for it if the bucket is empty.
+
+    :param rate: tokens added per second, i.e. the sustained requests rate
+    :param capacity: max number of tokens, i.e. the allowed burst. Defaults to rate
+    """
+
+    def __init__(
+        self, rate: float, capacity: float | None = None, clock=time.monotonic
+    ):
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity or rate, 1)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = clock()
+
+    def _take(self, tokens: float, state: tuple) -> tuple[float, tuple]:
+        """
+        Refill a bucket state and try to take tokens from it.
+
+        :returns: seconds to wait before retrying (0 if taken) and the new state
+        """
+        available, updated_at = state
+        now = self._clock()
+        available = min(self.capacity, available + (now - updated_at) * self.rate)
+        if available >= tokens:
+            return 0.0, (available - tokens, now)
+        return (tokens - available) / self.rate, (available, now)
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens without blocking.
+
+        :returns: 0 if the tokens were taken, otherwise seconds to wait for them
+        """
+        with self._lock:
+            wait, (self._tokens, self._updated_at) = self._take(
+                tokens, (self._tokens, self._updated_at)
+            )
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, blocking until they are available.
+
+        :returns: total seconds waited
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a local file locked on every access, so
+    every process on a host using the same path shares one budget.
+
+    :param path: bucket state file path, created if missing
+    :param rate: tokens added per second, i.e. the sustained requests rate
+    :param capacity: max number of tokens, i.e. the allowed burst. Defaults to rate
+    :raises: OSError on systems without POSIX file locks (e.g. Windows)
+    """
+
+    def __init__(self, path: str, rate: float, capacity: float | None = None):
+        if fcntl is None:
+            raise OSError(
+                "FileTokenBucket requires POSIX file locks, which this system lacks: "
+                "use a TokenBucket instead"
+            )
+        # The file state is read by other processes, so it uses wall clock time
+        super().__init__(rate, capacity, clock=time.time)
+        self.path = path
+        # O_CREAT without O_TRUNC keeps the state other processes already wrote
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o644))
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        with open(self.path, "r+", encoding="utf-8") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                content = file.read().split()
+                state = (
+                    (float(content[0]), float(content[1]))
+                    if len(content) == 2
+                    else (self.capacity, self._clock())
+                )
+                wait, state = self._take(tokens, state)
+                file.seek(0)
+                file.truncate()
+                file.write(f"{state[0]} {state[1]}")
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        return wait
+
+
+class RateLimiter:
+    """
+    Rate limiter with separate budgets per endpoint group. A request counts
+    against the 'writes' bucket if it isn't a GET and that bucket exists,
+    else against the bucket named like its endpoint base path (e.g. 'entities'
+    for 'entities/by-uris'), else against the 'default' bucket if any.
+
+    :param buckets: dict with group names as keys and token buckets as values
+    """
+
+    WRITES = "writes"
+    DEFAULT = "default"
+
+    def __init__(self, buckets: dict):
+        self.buckets = buckets
+
+    @classmethod
+    def from_rates(cls, rates: dict, state_dir: str | None = None):
+        """
+        Build a rate limiter from requests per second per group.
+
+        :param rates: dict with group names as keys and requests per second as values,
+                      e.g. {"entities": 10, "search": 5, "writes": 2, "default": 10}
+        :param state_dir: if set, directory of the bucket files shared between
+                          processes, else buckets are only shared between threads
+        """
+        if state_dir is None:
+            return cls({group: TokenBucket(rate) for group, rate in rates.items()})
+        return cls(
+            {
+                group: FileTokenBucket(
+                    os.path.join(state_dir, f"inventaire-{group}.bucket"), rate
+                )
+                for group, rate in rates.items()
+            }
+        )
+
+    def group_for(self, method: str, endpoint: str) -> str | None:
+        """Return the group whose budget a request counts against"""
+        if method.lower() != "get" and self.WRITES in self.buckets:
+            return self.WRITES
+        base = endpoint.split("/", maxsplit=1)[0]
+        if base in self.buckets:
+            return base
+        return self.DEFAULT if self.DEFAULT in self.buckets else None
+
+    def acquire(self, method: str, endpoint: str) -> float:
+        """
+        Wait for the budget of a request.
+
+        :returns: seconds waited
+        """
+        group = self.group_for(method, endpoint)
+        if group is None:
+            return 0.0
+        return self.buckets[group].acquire()
@@ -0,0 +1,158 @@
+"""Retry policy and circuit breaker to use with the session"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from requests import RequestException
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "delete"})
+
+
+class CircuitOpenError(RequestException):
+    """Raised when requests to a host are refused because its circuit is open."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value, either delay seconds or an HTTP date.
+
+    :param value: Retry-After header value
+    :returns: seconds to wait, or None if missing or invalid
+    """
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Which failed requests to retry and how long to wait in between: exponential
+    backoff with full jitter, or the server Retry-After delay when it sends one.
+
+    :param max_retries: max number of retries of a request
+    :param methods: request methods to retry, non-idempotent POST is left out by default
+    :param statuses: response status codes to retry
+    :param backoff_factor: base delay in seconds, doubled at each retry
+    :param max_backoff: max computed backoff delay in seconds, a server Retry-After
+                        delay is honoured as is, within max_total_time
+    :param max_total_time: max seconds spent on a request, retries included
+    :param respect_retry_after: whether to wait for the Retry-After header delay
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_retries: int = 3,
+        methods=IDEMPOTENT_METHODS,
+        statuses=RETRY_STATUSES,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_total_time: float = 60.0,
+        respect_retry_after: bool = True,
+    ):
+        self.max_retries = max_retries
+        self.methods = frozenset(method.lower() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_total_time = max_total_time
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(
+        self, method: str, attempt: int, status: int | None = None
+    ) -> bool:
+        """
+        Whether a failed attempt should be retried.
+
+        :param method: request method
+        :param attempt: number of retries already done
+        :param status: response status code, None on connection errors
+        """
+        if attempt >= self.max_retries or method.lower() not in self.methods:
+            return False
+        return status is None or status in self.statuses
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Return the delay in seconds before the next attempt. Only the computed
+        backoff is capped by max_backoff: the session gives up, rather than
+        retrying early, when the Retry-After delay exceeds max_total_time.
+
+        :param attempt: number of retries already done
+        :param retry_after: Retry-After header value of the failed response
+        """
+        delay = parse_retry_after(retry_after) if self.respect_retry_after else None
+        if delay is not None:
+            return delay
+        return min(random.uniform(0, self.backoff_factor * 2**attempt), self.max_backoff)
+
+
+class CircuitBreaker:
+    """
+    Per host circuit breaker. After failure_threshold consecutive failures
+    the circuit opens and requests fail fast with CircuitOpenError. Once
+    recovery_timeout has passed, one trial request is let through: the circuit
+    closes if it succeeds and opens again if it fails.
+
+    :param failure_threshold: consecutive failures opening the circuit
+    :param recovery_timeout: seconds before a trial request is let through
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+
+    def is_open(self, host: str) -> bool:
+        """Whether requests to the host currently fail fast"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            return (
+                opened_at is not None
+                and self._clock() - opened_at < self.recovery_timeout
+            )
+
+    def before_request(self, host: str):
+        """
+        Check the host circuit before sending a request.
+
+        :raises: CircuitOpenError if the circuit is open
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if self._clock() - opened_at < self.recovery_timeout:
+                raise CircuitOpenError(f"Circuit open for {host}, failing fast")
+            # half-open: let this trial request through, hold the others back
+            self._opened_at[host] = self._clock()
+
+    def record_success(self, host: str):
+        """Close the host circuit"""
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str):
+        """Count a failure, opening the host circuit past the threshold"""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[host] = self._clock()
@@ -0,0 +1,61 @@
+"""Deduplication of concurrent identical calls"""
+
+import threading
+
+
+class _Call:
+    """An in-flight call, waited on by the duplicate callers"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing the same key: the first caller runs
+    the function, the others wait for it and get the same result, or the same
+    error raised. Nothing is kept once the call is done, it is not a cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, func):
+        """
+        Run func unless a call with the same key is already in flight,
+        in which case wait for it and share its outcome.
+
+        :param key: hashable key identifying identical calls
+        :param func: zero-argument callable
+        :returns: the func result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -0,0 +1,127 @@
+"""Incremental parsing of large json responses"""
+
+import codecs
+import json as jsonlib
+
+STREAM_CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+NUMBER_CONTINUATION = ".eE+-"
+
+
+class _JsonStreamReader:
+    """Pull json values out of a stream of text or bytes chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = jsonlib.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, False if the stream is exhausted"""
+        if self._exhausted:
+            return False
+        # drop the consumed part of the buffer so memory stays flat
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            if chunk:
+                self._buffer += chunk
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, without consuming it"""
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                raise ValueError("Unexpected end of the json stream")
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of chars"""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in json stream, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Consume and decode the next json value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except jsonlib.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a value at the end of the buffer, or a number followed by the start
+            # of a fraction or an exponent, might continue in the next chunk
+            rest = self._buffer[end:]
+            incomplete = not rest or (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and not rest.strip(NUMBER_CONTINUATION)
+            )
+            if incomplete and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_container(reader: _JsonStreamReader):
+    """Yield the elements of an array, or the (key, value) pairs of an object"""
+    opening = reader.expect("[{")
+    closing = "]" if opening == "[" else "}"
+    if reader.peek() == closing:
+        reader.expect(closing)
+        return
+    while True:
+        if opening == "[":
+            yield reader.value()
+        else:
+            key = reader.value()
+            reader.expect(":")
+            yield key, reader.value()
+        if reader.expect("," + closing) == closing:
+            return
+
+
+def iter_json_records(chunks, keys: str | tuple):
+    """
+    Incrementally parse a json object and yield the records of some of its top-level
+    containers: elements of arrays and (key, value) pairs of objects. Only one
+    record at a time is held in memory, other top-level values are skipped.
+
+    :param chunks: iterable of bytes or str chunks of a json object
+    :param keys: a top-level key, or a tuple of keys
+    :returns: generator of records, or of (key, record) pairs if a tuple of keys is given
+    """
+    several = not isinstance(keys, str)
+    wanted = set(keys) if several else {keys}
+    reader = _JsonStreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key not in wanted:
+            reader.value()
+        elif reader.peek() in "[{":
+            for record in _iter_container(reader):
+                yield (key, record) if several else record
+        else:
+            record = reader.value()
+            yield (key, record) if several else record
+        if reader.expect(",}") == "}":
+            return
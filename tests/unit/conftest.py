@@ -0,0 +1,43 @@
+import pytest
+
+from inventaire.inventaire import DEFAULT_BASE_URL, InventaireSession
+
+
+class FakeClock:
+    """A clock only moving when its now attribute is set"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    """A requests response returned without any network round-trip"""
+
+    def __init__(self, content=b"{}", status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+def make_session(base_url=DEFAULT_BASE_URL, **kwargs):
+    return InventaireSession(base_url, username="user", password="pwd", **kwargs)
+
+
+@pytest.fixture(name="session")
+def fixture_session():
+    return make_session()
+
+
+@pytest.fixture(name="async_session")
+def fixture_async_session():
+    pytest.importorskip("aiohttp")
+    # pylint: disable-next=import-outside-toplevel
+    from inventaire.async_session import AsyncInventaireSession
+
+    return AsyncInventaireSession(DEFAULT_BASE_URL, username="user", password="pwd")
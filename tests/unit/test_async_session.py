@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from requests import HTTPError
+
+from inventaire.async_session import AsyncInventaireSession
+from inventaire.server.server_api import AsyncInventaireApiWrapper
+from inventaire.session import InvalidAuthData
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+
+def _make_app():
+    async def by_uris(request):
+        uris = request.query["uris"].split("|")
+        return web.json_response({"entities": {uri: {"uri": uri} for uri in uris}})
+
+    async def fail(request):
+        return web.Response(status=500, text="boom")
+
+    app = web.Application()
+    app.router.add_get("/api/entities/by-uris", by_uris)
+    app.router.add_get("/api/fail", fail)
+    return app
+
+
+async def _run_with_server(coro_factory):
+    server = test_utils.TestServer(_make_app())
+    await server.start_server()
+    try:
+        base_url = str(server.make_url("/api/"))
+        async with AsyncInventaireSession(
+            base_url, username="user", password="pwd"
+        ) as session:
+            return await coro_factory(session)
+    finally:
+        await server.close()
+
+
+@pytest.mark.unit
+class TestAsyncInventaireSession:
+    def test_auth_exception(self):
+        with pytest.raises(InvalidAuthData):
+            AsyncInventaireSession("http://test/api/", username="user")
+
+    def test_concurrent_endpoint_calls(self):
+        async def scenario(session):
+            entities = AsyncInventaireApiWrapper(session).entities
+            return await asyncio.gather(
+                *(entities.get_entities_by_uris(uris=f"wd:Q{i}") for i in range(20))
+            )
+
+        results = asyncio.run(_run_with_server(scenario))
+
+        assert [list(r["entities"]) for r in results] == [
+            [f"wd:Q{i}"] for i in range(20)
+        ]
+
+    def test_http_error(self):
+        async def scenario(session):
+            return await session.get("fail")
+
+        with pytest.raises(HTTPError):
+            asyncio.run(_run_with_server(scenario))
+
+    def test_stream_is_rejected(self):
+        api = AsyncInventaireApiWrapper(
+            AsyncInventaireSession("http://test/api/", username="user", password="pwd")
+        )
+
+        with pytest.raises(TypeError, match="AsyncInventaireSession"):
+            api.entities.get_entities_by_uris(["wd:Q1"], stream=True)
+        with pytest.raises(TypeError, match="AsyncInventaireSession"):
+            api.entities.get_author_works("wd:Q1", stream=True)
+        with pytest.raises(TypeError, match="AsyncInventaireSession"):
+            api.items.get_last_public_items(stream=True)
+
+    def test_pagination_iterators_are_rejected(self):
+        api = AsyncInventaireApiWrapper(
+            AsyncInventaireSession("http://test/api/", username="user", password="pwd")
+        )
+
+        with pytest.raises(TypeError, match="iter_search"):
+            api.search.iter_search("dune")
+        with pytest.raises(TypeError, match="iter_search"):
+            api.users.iter_search("alice")
+        with pytest.raises(TypeError, match="iter_last_public_items"):
+            api.items.iter_last_public_items()
+
+    @pytest.mark.parametrize(
+        "option",
+        ["cache", "retry", "circuit_breaker", "rate_limiter", "pool", "single_flight"],
+    )
+    def test_blocking_only_options_are_rejected(self, option):
+        with pytest.raises(TypeError, match=option):
+            AsyncInventaireSession(
+                "http://test/api/", username="user", password="pwd", **{option: True}
+            )
+
+    def test_unknown_options_are_rejected(self):
+        with pytest.raises(TypeError, match="max_conections"):
+            AsyncInventaireSession(
+                "http://test/api/", username="user", password="pwd", max_conections=10
+            )
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from inventaire.server.endpoints import ItemsEndpoints
+from inventaire.utils.bulk import run_bulk
+
+from .conftest import make_session
+
+
+def slow_square(value):
+    time.sleep(0.001 * (value % 3))
+    if value == 5:
+        raise ValueError("boom")
+    return value * value
+
+
+@pytest.mark.unit
+class TestBulk:
+    def test_ordered_results(self):
+        results = list(run_bulk(slow_square, range(10), max_workers=3, ordered=True))
+
+        assert [result.index for result in results] == list(range(10))
+        assert [result.value for result in results if result.ok] == [
+            value * value for value in range(10) if value != 5
+        ]
+        assert isinstance(results[5].error, ValueError)
+
+    def test_specs_are_pulled_lazily(self):
+        pulled = []
+
+        def specs():
+            for value in range(100):
+                pulled.append(value)
+                yield value
+
+        results = run_bulk(slow_square, specs(), max_workers=2)
+        next(results)
+
+        assert len(pulled) <= 5
+
+    def test_create_items_summary(self, mocker):
+        def fake_post(endpoint, json):
+            if json["entity"] == "wd:bad":
+                raise ValueError("bad")
+            return {"_id": json["entity"]}
+
+        session = make_session()
+        post_mock = mocker.patch.object(session, "post", side_effect=fake_post)
+        specs = ["isbn:9782253138938", {"entity": "wd:bad"}, {"entity": "wd:Q1"}]
+
+        summary = ItemsEndpoints(session).create_items(specs, max_workers=2).run()
+
+        assert post_mock.call_count == 3
+        assert summary.succeeded == 2
+        assert summary.failed_specs == [{"entity": "wd:bad"}]
+
+    def test_awaitable_calls_are_rejected(self):
+        async def create(spec):
+            return spec
+
+        with pytest.raises(TypeError, match="coroutine"):
+            list(run_bulk(create, range(3)))
+
+    def test_create_items_rejects_async_sessions(self):
+        # pylint: disable-next=import-outside-toplevel
+        from inventaire.async_session import AsyncInventaireSession
+        from inventaire.testing.server import StandInServer
+
+        pytest.importorskip("aiohttp")
+        with StandInServer() as server:
+            session = AsyncInventaireSession(server.url, username="user", password="pwd")
+            with pytest.raises(TypeError, match="AsyncInventaireSession"):
+                ItemsEndpoints(session).create_items(
+                    ["isbn:9782253138938", "isbn:9782070368228"]
+                ).run()
+
+        assert not server.requests
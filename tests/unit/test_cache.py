@@ -0,0 +1,119 @@
+import pytest
+
+from inventaire.utils.cache import ResponseCache
+
+from .conftest import FakeClock, FakeResponse, make_session
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(max_size=2, clock=clock)
+        key = cache.make_key("data/isbn", {"isbn": "9782253138938"})
+
+        cache.set(key, b"{}", ttl=10)
+        clock.now = 9
+        assert cache.get(key) == b"{}"
+        clock.now = 10
+        assert cache.get(key) is None
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_size=2)
+        cache.set(("a", ()), b"1", ttl=60)
+        cache.set(("b", ()), b"2", ttl=60)
+        cache.get(("a", ()))
+        cache.set(("c", ()), b"3", ttl=60)
+
+        assert cache.get(("b", ())) is None
+        assert cache.get(("a", ())) == b"1"
+        assert cache.stats["evictions"] == 1
+
+    def test_stale_entries_with_validators_are_kept(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set(("a", ()), b"1", ttl=10, etag='"v1"')
+        cache.set(("b", ()), b"2", ttl=10)
+        clock.now = 10
+
+        assert cache.get(("a", ())) is None
+        assert cache.get(("b", ())) is None
+        assert cache.get_stale(("b", ())) is None
+        stale = cache.get_stale(("a", ()))
+        assert stale.conditional_headers() == {"If-None-Match": '"v1"'}
+        assert cache.revalidate(("a", ()), stale, ttl=10) == b"1"
+        assert cache.get(("a", ())) == b"1"
+        assert cache.stats["revalidations"] == 1
+
+    def test_key_normalization(self):
+        assert ResponseCache.make_key(
+            "entities/by-uris", {"uris": ["wd:Q1", "wd:Q2"], "refresh": "true"}
+        ) == ResponseCache.make_key("entities/by-uris", {"uris": "wd:Q1|wd:Q2"})
+        assert ResponseCache.make_key("items/by-ids", {"ids": [1, 2]}) == (
+            "items/by-ids",
+            (("ids", "1|2"),),
+        )
+
+
+@pytest.mark.unit
+class TestSessionCache:
+    def test_cache_option(self):
+        cache = ResponseCache(max_size=10)
+        assert len(cache) == 0
+
+        assert make_session(cache=cache).cache is cache
+        assert isinstance(make_session(cache=True).cache, ResponseCache)
+        assert make_session(cache=False).cache is None
+        assert make_session().cache is None
+
+    def test_cached_get_and_refresh_bypass(self, mocker):
+        session = make_session(cache=True)
+        request_mock = mocker.patch.object(
+            session._session, "request", return_value=FakeResponse(b'{"a": 1}')
+        )
+        params = {"isbn": "9782253138938"}
+
+        first = session.get("data/isbn", params=params)
+        first["a"] = 2
+        second = session.get("data/isbn", params=params)
+        session.get("data/isbn", params={**params, "refresh": "true"})
+        session.get("user")
+        session.get("user")
+
+        assert second == {"a": 1}
+        assert request_mock.call_count == 4
+        assert session.cache.stats["hits"] == 1
+
+    def test_conditional_revalidation(self, mocker):
+        clock = FakeClock()
+        session = make_session(cache=ResponseCache(clock=clock))
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        request_mock = mocker.patch.object(
+            session._session,
+            "request",
+            side_effect=[
+                FakeResponse(b'{"a": 1}', headers={"ETag": '"v1"', "Last-Modified": last_modified}),
+                FakeResponse(b"", status_code=304, headers={"ETag": '"v1b"'}),
+                FakeResponse(b'{"a": 2}', headers={"ETag": '"v2"'}),
+            ],
+        )
+        params = {"isbn": "9782253138938"}
+
+        assert session.get("data/isbn", params=params) == {"a": 1}
+        clock.now = 10**6
+        assert session.get("data/isbn", params=params) == {"a": 1}
+        assert request_mock.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": last_modified,
+        }
+        # the 304 validators replace the stored ones, the missing ones are kept
+        key = session.cache.make_key("data/isbn", params)
+        assert session.cache.get_stale(key).conditional_headers() == {
+            "If-None-Match": '"v1b"',
+            "If-Modified-Since": last_modified,
+        }
+        clock.now = 2 * 10**6
+        assert session.get("data/isbn", params=params) == {"a": 2}
+        assert session.cache.get_stale(session.cache.make_key("data/isbn", params)).etag == '"v2"'
+        assert session.cache.stats["revalidations"] == 1
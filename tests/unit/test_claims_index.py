@@ -0,0 +1,95 @@
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints
+from inventaire.utils.claims_index import ClaimsIndex
+
+from .conftest import FakeClock, make_session
+
+
+@pytest.mark.unit
+class TestClaimsIndex:
+    def test_add_and_query(self):
+        index = ClaimsIndex()
+        index.add("wd:Q1", {"wdt:P50": ["wd:Q535"], "wdt:P577": ["1862"]})
+        index.add("wd:Q2", {"wdt:P50": ["wd:Q535", "wd:Q9"]})
+
+        assert index.uris("wdt:P50", "wd:Q535") == ["wd:Q1", "wd:Q2"]
+        assert index.uris("wdt:P50", "wd:Q404") == []
+        assert len(index) == 2
+
+    def test_new_revision_replaces_claims(self):
+        index = ClaimsIndex()
+        index.add("wd:Q1", {"wdt:P50": ["wd:Q535"]})
+        index.add("wd:Q1", {"wdt:P50": ["wd:Q9"]})
+
+        assert index.uris("wdt:P50", "wd:Q535") == []
+        assert index.uris("wdt:P50", "wd:Q9") == ["wd:Q1"]
+
+    def test_lookup_only_answers_complete_and_fresh_queries(self):
+        clock = FakeClock()
+        index = ClaimsIndex(max_age=10, clock=clock)
+        index.add("wd:Q1", {"wdt:P50": ["wd:Q535"]})
+
+        assert index.lookup("wdt:P50", "wd:Q535") is None
+
+        index.set_complete("wdt:P50", "wd:Q535", ["wd:Q1", "wd:Q3"])
+        assert index.lookup("wdt:P50", "wd:Q535") == ["wd:Q1", "wd:Q3"]
+
+        clock.now = 11
+        assert index.lookup("wdt:P50", "wd:Q535") is None
+        assert index.stats == {"hits": 1, "misses": 2, "entities": 2}
+
+    def test_invalidate(self):
+        index = ClaimsIndex()
+        index.add("wd:Q1", {"wdt:P50": ["wd:Q535"]})
+        index.invalidate("wd:Q1")
+
+        assert index.uris("wdt:P50", "wd:Q535") == []
+
+
+@pytest.mark.unit
+class TestReverseClaimsEndpoint:
+    def test_without_index(self, mocker):
+        session = make_session()
+        get_mock = mocker.patch.object(session, "get", return_value={"uris": ["wd:Q1"]})
+
+        result = EntitiesEndpoints(session).get_entities_by_claims("wdt:P50", "wd:Q535")
+
+        assert result == {"uris": ["wd:Q1"]}
+        get_mock.assert_called_once_with(
+            "entities/reverse-claims", params={"property": "wdt:P50", "value": "wd:Q535"}
+        )
+
+    def test_repeated_query_is_answered_locally(self, mocker):
+        session = make_session(claims_index=ClaimsIndex())
+        get_mock = mocker.patch.object(session, "get", return_value={"uris": ["wd:Q1"]})
+        entities = EntitiesEndpoints(session)
+
+        entities.get_entities_by_claims("wdt:P50", "wd:Q535")
+        result = entities.get_entities_by_claims("wdt:P50", "wd:Q535")
+        entities.get_entities_by_claims("wdt:P50", "wd:Q535", refresh=True)
+
+        assert result == {"uris": ["wd:Q1"]}
+        assert get_mock.call_count == 2
+
+    def test_index_is_filled_by_fetched_entities(self, mocker):
+        session = make_session(claims_index=ClaimsIndex())
+        entity = {"uri": "isbn:9782253138938", "claims": {"wdt:P629": ["wd:Q3203603"]}}
+        get_mock = mocker.patch.object(
+            session,
+            "get",
+            return_value={"entities": {"isbn:9782253138938": entity}, "redirects": {}},
+        )
+        entities = EntitiesEndpoints(session)
+
+        entities.get_entities_by_uris("isbn:9782253138938")
+        result = entities.get_entities_by_claims("wdt:P629", "wd:Q3203603", local=True)
+
+        assert result == {"uris": ["isbn:9782253138938"]}
+        assert get_mock.call_count == 1
+
+    def test_local_requires_index(self):
+        with pytest.raises(ValueError):
+            EntitiesEndpoints(make_session()).get_entities_by_claims(
+                "wdt:P50", "wd:Q535", local=True
+            )
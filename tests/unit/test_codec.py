@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+
+from inventaire.utils.codec import JsonCodec, encode_json_body, get_codec
+
+from .conftest import FakeResponse, make_session
+
+
+@pytest.mark.unit
+class TestCodec:
+    @pytest.mark.parametrize("name", ["stdlib", "auto", None])
+    def test_roundtrip(self, name):
+        codec = get_codec(name)
+        data = {"labels": {"fr": "L'Écume des jours"}, "claims": {"wdt:P31": ["wd:Q1"]}}
+
+        encoded = codec.dumps(data)
+
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == data
+        assert codec.loads(encoded.decode()) == data
+
+    def test_auto_prefers_orjson(self):
+        pytest.importorskip("orjson")
+
+        assert get_codec().name == "orjson"
+
+    def test_auto_falls_back_to_stdlib(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        monkeypatch.setitem(sys.modules, "ujson", None)
+
+        assert get_codec("auto").name == "stdlib"
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+    def test_encode_json_body_keeps_headers(self):
+        kwargs = encode_json_body(
+            get_codec("stdlib"), {"json": {"a": 1}, "headers": {"X-Test": "1"}}
+        )
+
+        assert kwargs == {
+            "data": b'{"a":1}',
+            "headers": {"Content-Type": "application/json", "X-Test": "1"},
+        }
+
+    def test_session_uses_codec_for_bodies_and_responses(self, mocker):
+        loads = mocker.Mock(return_value={"decoded": True})
+        codec = JsonCodec("test", loads, lambda obj: b"encoded")
+        session = make_session(codec=codec)
+        response = FakeResponse(b'{"ok": true}')
+        request_mock = mocker.patch.object(
+            session._session, "request", return_value=response
+        )
+
+        result = session.post("entities/resolve", json={"entries": []})
+
+        assert result == {"decoded": True}
+        loads.assert_called_once_with(response.content)
+        assert request_mock.call_args.kwargs["data"] == b"encoded"
+        assert "json" not in request_mock.call_args.kwargs
@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import sys
+
+import pytest
+
+from inventaire.testing.server import StandInServer
+from inventaire.utils.compression import (
+    RequestCompression,
+    accept_encoding,
+    get_compression,
+)
+
+from .conftest import make_session
+
+
+class BodySizes:
+    def __init__(self):
+        self.sizes = []
+
+    def after_response(self, event):
+        self.sizes.append((event.request_bytes, event.response_bytes))
+
+
+@pytest.mark.unit
+class TestCompression:
+    def test_accept_encoding(self):
+        assert accept_encoding("gzip,deflate,br,zstd") == "zstd, br, gzip, deflate"
+        assert accept_encoding(["deflate", "gzip", "snappy"]) == "gzip, deflate"
+        assert "gzip" in accept_encoding()
+
+    def test_compress_body(self):
+        compression = RequestCompression(min_size=100)
+        large = {"data": b"x" * 1000, "headers": {"Content-Type": "application/json"}}
+
+        compression.compress_body("post", large)
+
+        assert gzip.decompress(large["data"]) == b"x" * 1000
+        assert large["headers"] == {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        }
+        small = {"data": b"x" * 10}
+        assert compression.compress_body("put", small) == {"data": b"x" * 10}
+        assert compression.compress_body("get", {"data": b"x" * 1000})["data"] == b"x" * 1000
+        encoded = {"data": b"x" * 1000, "headers": {"content-encoding": "br"}}
+        assert compression.compress_body("post", encoded)["data"] == b"x" * 1000
+
+    def test_get_compression(self, monkeypatch):
+        assert get_compression() is None
+        assert get_compression(True).encoding == "gzip"
+        with pytest.raises(ValueError):
+            RequestCompression("lz4")
+        monkeypatch.setitem(sys.modules, "brotli", None)
+        monkeypatch.setitem(sys.modules, "brotlicffi", None)
+        with pytest.raises(ImportError, match="brotli"):
+            RequestCompression("br")
+
+    def test_session_compressed_transfers(self):
+        sizes = BodySizes()
+        entries = [{"edition": {"title": "Dune"}, "works": [{}], "authors": [{}]}] * 200
+        with StandInServer(compress_min_size=0) as server:
+            session = make_session(
+                server.url, compression=RequestCompression(min_size=1024), hooks=[sizes]
+            )
+            resolved = session.post("entities/resolve", json={"entries": entries})
+            records = list(
+                session.iter_records(
+                    "get",
+                    "entities/by-uris",
+                    "entities",
+                    params={"uris": "|".join(f"wd:Q{i}" for i in range(50))},
+                )
+            )
+            compressed = dict(server.compressed)
+
+        assert len(resolved["entries"]) == 200
+        assert len(records) == 50
+        assert compressed == {"request": 1, "response": 2}
+        # the resolve body is sent compressed
+        assert sizes.sizes[0][0] < len(str(entries))
+
+    def test_streamed_transfers(self):
+        sizes = BodySizes()
+        entries = [{"edition": {"title": "Dune"}, "works": [{}], "authors": [{}]}] * 200
+        with StandInServer(compress_min_size=0) as server:
+            session = make_session(
+                server.url, compression=RequestCompression(min_size=1024), hooks=[sizes]
+            )
+            resolved = session.post("entities/resolve", json={"entries": entries})
+            records = session.iter_records(
+                "post", "entities/resolve", "entries", json={"entries": entries}
+            )
+            first = next(records)
+            sizes_while_streaming = list(sizes.sizes)
+            rest = list(records)
+            compressed = dict(server.compressed)
+
+        assert [first, *rest] == resolved["entries"]
+        assert compressed == {"request": 2, "response": 2}
+        assert len(sizes_while_streaming) == 1
+        # once consumed, the stream reports the same sizes as the blocking request
+        assert sizes.sizes[1] == sizes.sizes[0]
+
+    def test_async_session_compressed_transfers(self):
+        # pylint: disable-next=import-outside-toplevel
+        from inventaire.async_session import AsyncInventaireSession
+
+        pytest.importorskip("aiohttp")
+        entries = [{"edition": {"title": "Dune"}}] * 200
+
+        async def scenario(server):
+            async with AsyncInventaireSession(
+                server.url, username="user", password="pwd", compression=True
+            ) as session:
+                session.compression.min_size = 1024
+                return await session.post("entities/resolve", json={"entries": entries})
+
+        with StandInServer(compress_min_size=0) as server:
+            resolved = asyncio.run(scenario(server))
+            compressed = dict(server.compressed)
+
+        assert len(resolved["entries"]) == 200
+        assert compressed == {"request": 1, "response": 1}
@@ -0,0 +1,81 @@
+import pytest
+
+from inventaire.server.crawler import BibliographyCrawler
+from inventaire.server.endpoints import EntitiesEndpoints
+
+from .conftest import make_session
+
+ENTITIES = {
+    "wd:A": {"type": "human", "claims": {}},
+    "wd:W1": {"type": "work", "claims": {"wdt:P50": ["wd:A"], "wdt:P179": ["wd:S"]}},
+    "wd:W2": {"type": "work", "claims": {"wdt:P50": ["wd:A", "wd:B"]}},
+    "wd:S": {"type": "serie", "claims": {"wdt:P50": ["wd:A"]}},
+    "wd:B": {"type": "human", "claims": {}},
+    "isbn:9782253138938": {"type": "edition", "claims": {"wdt:P629": ["wd:W1"]}},
+}
+RESPONSES = {
+    "entities/author-works": {
+        "wd:A": {"works": [{"uri": "wd:W1"}, {"uri": "wd:W2"}], "series": [{"uri": "wd:S"}]},
+        "wd:B": {"works": [{"uri": "wd:W2"}]},
+    },
+    "entities/serie-parts": {"wd:S": {"parts": [{"uri": "wd:W1"}]}},
+}
+
+
+def fake_get(endpoint, params=None, **kwargs):
+    if endpoint == "entities/by-uris":
+        uris = params["uris"].split("|")
+        return {
+            "entities": {uri: {"uri": uri, **ENTITIES[uri]} for uri in uris},
+            "redirects": {},
+        }
+    if endpoint == "entities/reverse-claims":
+        return {"uris": ["isbn:9782253138938"] if params["value"] == "wd:W1" else []}
+    return RESPONSES[endpoint][params["uri"]]
+
+
+@pytest.fixture(name="session")
+def fixture_session(mocker):
+    session = make_session()
+    mocker.patch.object(session, "get", side_effect=fake_get)
+    return session
+
+
+@pytest.mark.unit
+class TestBibliographyCrawler:
+    def test_crawl_builds_deduplicated_graph(self, session):
+        graph = BibliographyCrawler(EntitiesEndpoints(session), max_depth=3).crawl("wd:A")
+
+        assert set(graph.authors) == {"wd:A", "wd:B"}
+        assert set(graph.works) == {"wd:W1", "wd:W2"}
+        assert set(graph.series) == {"wd:S"}
+        assert set(graph.editions) == {"isbn:9782253138938"}
+        assert ("wd:W1", "wdt:P179", "wd:S") in graph.edges
+        assert ("isbn:9782253138938", "wdt:P629", "wd:W1") in graph.edges
+        assert ("wd:W2", "wdt:P50", "wd:B") in graph.edges
+
+    def test_entities_are_fetched_once(self, session):
+        BibliographyCrawler(EntitiesEndpoints(session), max_depth=3).crawl("wd:A")
+
+        fetched = [
+            uri
+            for call in session.get.call_args_list
+            if call.args[0] == "entities/by-uris"
+            for uri in call.kwargs["params"]["uris"].split("|")
+        ]
+        assert sorted(fetched) == sorted(ENTITIES)
+
+    def test_depth_limit(self, session):
+        graph = BibliographyCrawler(
+            EntitiesEndpoints(session), max_depth=1, editions=False
+        ).crawl(["wd:A"])
+
+        assert set(graph.entities) == {"wd:A", "wd:W1", "wd:W2", "wd:S"}
+        assert not any(
+            call.args[0] == "entities/reverse-claims"
+            for call in session.get.call_args_list
+        )
+
+    def test_async_sessions_are_rejected(self, async_session):
+        with pytest.raises(TypeError, match="BibliographyCrawler"):
+            BibliographyCrawler(EntitiesEndpoints(async_session))
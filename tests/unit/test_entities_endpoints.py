@@ -0,0 +1,43 @@
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints
+from inventaire.server.endpoints.entities import MAX_URIS_PER_REQUEST
+
+
+def fake_by_uris(endpoint, params=None, **kwargs):
+    uris = params["uris"].split("|")
+    response = {
+        "entities": {uri: {"uri": uri} for uri in uris if not uri.endswith("0")},
+        "redirects": {},
+    }
+    missing = [uri for uri in uris if uri.endswith("0")]
+    if missing:
+        response["notFound"] = missing
+    return response
+
+
+@pytest.mark.unit
+class TestEntitiesEndpoints:
+    def test_single_chunk_is_one_request(self, session, mocker):
+        get_mock = mocker.patch.object(session, "get", side_effect=fake_by_uris)
+
+        EntitiesEndpoints(session).get_entities_by_uris(
+            "wd:Q1|wd:Q2", refresh=True
+        )
+
+        get_mock.assert_called_once_with(
+            "entities/by-uris", params={"refresh": "true", "uris": "wd:Q1|wd:Q2"}
+        )
+
+    def test_large_uri_list_is_chunked_and_merged(self, session, mocker):
+        get_mock = mocker.patch.object(session, "get", side_effect=fake_by_uris)
+        uris = [f"wd:Q{i}" for i in range(1, 2 * MAX_URIS_PER_REQUEST + 2)]
+
+        result = EntitiesEndpoints(session).get_entities_by_uris(
+            uris + uris[:5], max_workers=3
+        )
+
+        assert get_mock.call_count == 3
+        assert len(result["entities"]) + len(result["notFound"]) == len(uris)
+        assert result["notFound"] == [uri for uri in uris if uri.endswith("0")]
+        assert result["redirects"] == {}
@@ -0,0 +1,97 @@
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints
+from inventaire.utils.entity_store import EntityStore
+
+from .conftest import FakeClock, make_session
+
+
+def fake_by_uris(endpoint, params=None, **kwargs):
+    return {
+        "entities": {
+            uri: {"uri": uri, "lastrevid": 2} for uri in params["uris"].split("|")
+        },
+        "redirects": {},
+    }
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path):
+    store = EntityStore(str(tmp_path / "entities.sqlite"))
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestEntityStore:
+    def test_lookup_follows_redirects(self, store):
+        store.put(
+            {
+                "entities": {"wd:Q1": {"uri": "wd:Q1", "lastrevid": 1}},
+                "redirects": {"isbn:9782253138938": "wd:Q1"},
+            }
+        )
+
+        found, missing = store.lookup(["isbn:9782253138938", "wd:Q2"])
+
+        assert found["entities"] == {"wd:Q1": {"uri": "wd:Q1", "lastrevid": 1}}
+        assert found["redirects"] == {"isbn:9782253138938": "wd:Q1"}
+        assert missing == ["wd:Q2"]
+
+    def test_older_revision_does_not_overwrite(self, store):
+        store.put({"entities": {"inv:1": {"_rev": "3-b", "label": "new"}}})
+        store.put({"entities": {"inv:1": {"_rev": "2-a", "label": "old"}}})
+
+        found, _ = store.lookup(["inv:1"])
+
+        assert found["entities"]["inv:1"]["label"] == "new"
+        assert store.revisions(["inv:1"]) == {"inv:1": "3-b"}
+
+    def test_stale_entities_are_missing(self, tmp_path):
+        store = EntityStore(str(tmp_path / "stale.sqlite"), max_age=-1)
+        store.put({"entities": {"wd:Q1": {"lastrevid": 1}}})
+
+        assert store.lookup(["wd:Q1"])[1] == ["wd:Q1"]
+
+    def test_endpoint_reads_through_store(self, store, mocker):
+        session = make_session(entity_store=store)
+        get_mock = mocker.patch.object(session, "get", side_effect=fake_by_uris)
+        entities = EntitiesEndpoints(session)
+
+        entities.get_entities_by_uris(["wd:Q1", "wd:Q2"])
+        result = entities.get_entities_by_uris(["wd:Q1", "wd:Q2", "wd:Q3"])
+        entities.get_entities_by_uris(["wd:Q1"], refresh=True)
+
+        assert set(result["entities"]) == {"wd:Q1", "wd:Q2", "wd:Q3"}
+        assert [call.kwargs["params"]["uris"] for call in get_mock.call_args_list] == [
+            "wd:Q1|wd:Q2",
+            "wd:Q3",
+            "wd:Q1",
+        ]
+
+    def test_stale_entities_are_revalidated(self, tmp_path, mocker):
+        clock = FakeClock(1000.0)
+        store = EntityStore(str(tmp_path / "revalidated.sqlite"), max_age=10, clock=clock)
+        store.put(
+            {
+                "entities": {
+                    "wd:Q1": {"uri": "wd:Q1", "lastrevid": 2, "labels": {"en": "one"}},
+                    "wd:Q2": {"uri": "wd:Q2", "lastrevid": 1},
+                }
+            }
+        )
+        clock.now = 1020.0
+        session = make_session(entity_store=store)
+        get_mock = mocker.patch.object(session, "get", side_effect=fake_by_uris)
+
+        result = EntitiesEndpoints(session).get_entities_by_uris(["wd:Q1", "wd:Q2"])
+
+        assert [call.kwargs["params"] for call in get_mock.call_args_list] == [
+            {"uris": "wd:Q1|wd:Q2", "attributes": "info"},
+            {"uris": "wd:Q2"},
+        ]
+        # wd:Q1 revision did not change, it is served from the store
+        assert result["entities"]["wd:Q1"]["labels"] == {"en": "one"}
+        assert result["entities"]["wd:Q2"]["lastrevid"] == 2
+        assert store.lookup(["wd:Q1", "wd:Q2"])[1] == []
+        store.close()
@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pytest
+
+from inventaire.server.export import InventoryExporter
+from inventaire.server.server_api import AsyncInventaireApiWrapper
+
+
+def fake_items_by_users(owners, limit, offset):
+    items = [
+        {
+            "_id": f"item{i}",
+            "entity": f"isbn:97800000000{i % 3}",
+            "owner": owners[i % len(owners)],
+            "shelves": ["shelf1"] if i % 2 else [],
+        }
+        for i in range(7)
+    ]
+    return {"items": items[offset : offset + limit]}
+
+
+def fake_by_uris(uris):
+    return {
+        "entities": {
+            uri.replace("isbn:", "wd:"): {"labels": {"en": uri}, "type": "edition"}
+            for uri in uris
+        },
+        "redirects": {uri: uri.replace("isbn:", "wd:") for uri in uris},
+    }
+
+
+@pytest.fixture(name="api")
+def fixture_api(mocker):
+    api = mocker.Mock()
+    api.session.is_async = False
+    api.groups.get_group_by_id.return_value = {
+        "group": {"admins": [{"user": "u1"}], "members": [{"user": "u2"}]}
+    }
+    api.shelves.get_shelves_by_owners.return_value = {
+        "shelves": {"shelf1": {"name": "Favorites"}}
+    }
+    api.items.get_items_by_users.side_effect = fake_items_by_users
+    api.entities.get_entities_by_uris.side_effect = fake_by_uris
+    return api
+
+
+@pytest.mark.unit
+class TestInventoryExporter:
+    def test_export_group_jsonl(self, api, tmp_path):
+        destination = tmp_path / "inventory.jsonl"
+
+        count = InventoryExporter(api, page_size=3).export(
+            str(destination), group="g1"
+        )
+
+        rows = [json.loads(line) for line in destination.read_text().splitlines()]
+        assert count == len(rows) == 7
+        assert api.entities.get_entities_by_uris.call_count == 3
+        assert rows[1]["entity_label"] == "isbn:978000000001"
+        assert rows[1]["shelves"] == "Favorites"
+        assert {row["owner"] for row in rows} == {"u1", "u2"}
+
+    def test_export_csv(self, api, tmp_path):
+        destination = tmp_path / "inventory.csv"
+
+        InventoryExporter(api).export(str(destination), fmt="csv", users="u1")
+
+        with open(destination, encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 7
+        assert rows[0]["entity_type"] == "edition"
+
+    def test_export_parquet(self, api, tmp_path):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        destination = tmp_path / "inventory.parquet"
+
+        InventoryExporter(api).export(str(destination), fmt="parquet", users="u1")
+
+        assert parquet.read_table(destination).num_rows == 7
+
+    def test_async_sessions_are_rejected(self, async_session):
+        with pytest.raises(TypeError, match="InventoryExporter"):
+            InventoryExporter(AsyncInventaireApiWrapper(async_session))
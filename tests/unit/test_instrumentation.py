@@ -0,0 +1,225 @@
+import asyncio
+import enum
+import sys
+import types
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+from requests import HTTPError
+
+from inventaire.testing.server import Faults, StandInServer
+from inventaire.utils.instrumentation import (
+    LatencyHistogram,
+    OpenTelemetrySpans,
+    PrometheusMetrics,
+    RequestEvent,
+    RequestHooks,
+    endpoint_label,
+)
+from inventaire.utils.retry import RetryPolicy
+
+from .conftest import make_session
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(("before_request", event.method, event.endpoint))
+
+    def after_response(self, event):
+        self.calls.append(("after_response", event.status, event.retries))
+
+    def on_error(self, event):
+        self.calls.append(("on_error", type(event.error).__name__))
+
+
+class FakeSpan:
+    def __init__(self, name, kind, attributes):
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.exceptions = []
+        self.status = None
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_status(self, status, description=None):
+        self.status = (status, description)
+
+    def record_exception(self, error):
+        self.exceptions.append(error)
+
+    def end(self):
+        self.ended = True
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, kind=None, attributes=None):
+        self.spans.append(FakeSpan(name, kind, attributes or {}))
+        return self.spans[-1]
+
+
+@pytest.fixture(name="trace")
+def fixture_trace(monkeypatch):
+    """A stand-in opentelemetry.trace module, for when opentelemetry-api is missing"""
+    trace = types.ModuleType("opentelemetry.trace")
+    trace.SpanKind = enum.Enum("SpanKind", "INTERNAL SERVER CLIENT")
+    trace.StatusCode = enum.Enum("StatusCode", "UNSET OK ERROR")
+    package = types.ModuleType("opentelemetry")
+    package.trace = trace
+    monkeypatch.setitem(sys.modules, "opentelemetry", package)
+    monkeypatch.setitem(sys.modules, "opentelemetry.trace", trace)
+    return trace
+
+
+def make_event(status=200, duration=0.02, endpoint="entities/by-uris"):
+    event = RequestEvent("get", endpoint, request_bytes=10)
+    event.status, event.duration, event.response_bytes = status, duration, 100
+    return event
+
+
+@pytest.mark.unit
+class TestInstrumentation:
+    def test_endpoint_label(self):
+        assert endpoint_label("users/by-ids") == "users/by-ids"
+        assert endpoint_label(f"groups/{'a' * 32}/members") == "groups/:id/members"
+
+    def test_hooks_registry(self):
+        hooks = RequestHooks()
+        assert not hooks
+        hooks.register(Recorder())
+        assert hooks
+        with pytest.raises(ValueError):
+            hooks.add("on_success", print)
+
+    def test_failing_hook_is_isolated(self, caplog):
+        hooks = RequestHooks()
+        hooks.add("after_response", lambda event: 1 / 0)
+        hooks.emit("after_response", make_event())
+
+        assert "Request hook after_response failed" in caplog.text
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1))
+        for duration in (0.005, 0.05, 0.06, 0.5, 5):
+            histogram.after_response(make_event(duration=duration))
+
+        data = histogram.snapshot()[("GET", "entities/by-uris")]
+        assert list(data["buckets"].values()) == [1, 3, 4, 5]
+        assert data["count"] == 5
+        assert histogram.percentile("get", "entities/by-uris", 0.5) == 0.1
+        assert histogram.percentile("get", "search", 0.5) is None
+
+    def test_prometheus_metrics(self):
+        metrics = PrometheusMetrics(buckets=(0.1,))
+        metrics.after_response(make_event())
+        metrics.after_response(make_event(status=404))
+        error_event = RequestEvent("get", "entities/by-uris")
+        error_event.duration, error_event.retries = 1.5, 2
+        error_event.error = RequestsConnectionError()
+        metrics.on_error(error_event)
+
+        assert metrics.counter("requests_total", status="200") == 1
+        assert metrics.counter("requests_total", endpoint="entities/by-uris") == 2
+        assert metrics.counter("received_bytes_total") == 200
+        assert metrics.counter("retries_total") == 2
+        text = metrics.render()
+        assert (
+            'inventaire_client_errors_total{method="GET",endpoint="entities/by-uris",'
+            'error="ConnectionError"} 1' in text
+        )
+        assert (
+            'inventaire_client_request_duration_seconds_bucket{method="GET",'
+            'endpoint="entities/by-uris",le="+Inf"} 3' in text
+        )
+
+    def test_opentelemetry_spans(self, trace):
+        tracer = FakeTracer()
+        spans = OpenTelemetrySpans(tracer)
+        event = make_event(status=500)
+        spans.before_request(event)
+        spans.after_response(event)
+        failed = RequestEvent("post", "items")
+        failed.error = RequestsConnectionError()
+        spans.before_request(failed)
+        spans.on_error(failed)
+
+        first, second = tracer.spans
+        assert first.name == "GET entities/by-uris"
+        assert first.kind is trace.SpanKind.CLIENT
+        assert first.attributes["http.response.status_code"] == 500
+        assert first.attributes["error.type"] == "500"
+        assert first.status == (trace.StatusCode.ERROR, "HTTP 500")
+        assert first.ended
+        assert second.exceptions == [failed.error]
+        assert second.status[0] is trace.StatusCode.ERROR
+        assert second.ended
+
+    def test_session_hooks(self):
+        recorder, metrics = Recorder(), PrometheusMetrics()
+        with StandInServer(faults=Faults(error_rate=0.5, seed=4)) as server:
+            session = make_session(
+                server.url,
+                retry=RetryPolicy(max_retries=10, backoff_factor=0),
+                hooks=[recorder, metrics],
+            )
+            session.get("entities/by-uris", params={"uris": "wd:Q1"})
+            retries = server.faults_served["error"]
+
+        assert retries > 0
+        assert recorder.calls == [
+            ("before_request", "GET", "entities/by-uris"),
+            ("after_response", 200, retries),
+        ]
+        assert metrics.counter("retries_total") == retries
+        assert metrics.counter("received_bytes_total", endpoint="entities/by-uris") > 0
+
+    def test_session_hooks_http_error(self):
+        recorder = Recorder()
+        with StandInServer() as server:
+            with pytest.raises(HTTPError):
+                make_session(server.url, hooks=[recorder]).get("nothing/here")
+
+        assert recorder.calls == [
+            ("before_request", "GET", "nothing/here"),
+            ("after_response", 404, 0),
+        ]
+
+    def test_session_hooks_on_error(self):
+        recorder = Recorder()
+        session = make_session("http://127.0.0.1:9/api/", hooks=[recorder])
+        with pytest.raises(RequestsConnectionError):
+            session.get("search")
+
+        assert recorder.calls == [
+            ("before_request", "GET", "search"),
+            ("on_error", "ConnectionError"),
+        ]
+
+    def test_async_session_hooks(self):
+        # pylint: disable-next=import-outside-toplevel
+        from inventaire.async_session import AsyncInventaireSession
+
+        pytest.importorskip("aiohttp")
+        recorder = Recorder()
+
+        async def scenario(server):
+            async with AsyncInventaireSession(
+                server.url, username="user", password="pwd", hooks=[recorder]
+            ) as session:
+                await session.get("entities/by-uris", params={"uris": "wd:Q1"})
+
+        with StandInServer() as server:
+            asyncio.run(scenario(server))
+
+        assert recorder.calls == [
+            ("before_request", "GET", "entities/by-uris"),
+            ("after_response", 200, 0),
+        ]
@@ -0,0 +1,120 @@
+import pytest
+
+from inventaire.server.endpoints import DataEndpoints, EntitiesEndpoints, ItemsEndpoints
+from inventaire.utils.isbn import (
+    canonical_isbn13,
+    normalize_isbn,
+    normalize_isbns,
+    normalize_uris,
+)
+
+
+@pytest.mark.unit
+class TestIsbn:
+    @pytest.mark.parametrize(
+        "value",
+        ["9782253138938", "978-2-253-13893-8", "2-253-13893-2", "2253138932"],
+    )
+    def test_valid_isbns_are_normalized_to_isbn13(self, value):
+        assert normalize_isbn(value) == "9782253138938"
+
+    def test_isbn10_with_x_check_digit(self):
+        assert normalize_isbn("0-8044-2957-x") == "9780804429573"
+
+    @pytest.mark.parametrize(
+        "value", ["9782253138939", "2253138938", "1234567890123", "978225313893", "bad"]
+    )
+    def test_invalid_isbns(self, value):
+        assert normalize_isbn(value) is None
+
+    @pytest.mark.parametrize("value", ["2-253-13893-2", "978-2-253-13893-8", "9782253138938"])
+    def test_canonical_isbn13_accepts_both_forms(self, value):
+        assert canonical_isbn13(value) == "9782253138938"
+
+    def test_canonical_isbn13_raises_on_invalid_isbn(self):
+        with pytest.raises(ValueError):
+            canonical_isbn13("2253138938")
+
+    def test_normalize_isbns_collapses_duplicates(self):
+        valid, invalid = normalize_isbns(["2253138932", "978-2-253-13893-8", "bad"])
+
+        assert valid == ["9782253138938"]
+        assert invalid == ["bad"]
+
+    def test_normalize_uris(self):
+        uris, aliases, invalid = normalize_uris(
+            ["wd:Q1", "isbn:2-253-13893-2", "isbn:9782253138938", "isbn:123"]
+        )
+
+        assert uris == ["wd:Q1", "isbn:9782253138938"]
+        assert aliases == {"isbn:2-253-13893-2": "isbn:9782253138938"}
+        assert invalid == ["isbn:123"]
+
+
+@pytest.mark.unit
+class TestIsbnEndpoints:
+    def test_by_uris_sends_canonical_uris_only(self, session, mocker):
+        get_mock = mocker.patch.object(
+            session,
+            "get",
+            return_value={"entities": {"isbn:9782253138938": {}}, "redirects": {}},
+        )
+
+        result = EntitiesEndpoints(session).get_entities_by_uris(
+            "isbn:2253138932|isbn:978-2-253-13893-8|isbn:bad"
+        )
+
+        get_mock.assert_called_once_with(
+            "entities/by-uris", params={"uris": "isbn:9782253138938"}
+        )
+        assert result["redirects"] == {
+            "isbn:2253138932": "isbn:9782253138938",
+            "isbn:978-2-253-13893-8": "isbn:9782253138938",
+        }
+        assert result["notFound"] == ["isbn:bad"]
+
+    def test_streamed_by_uris_yields_aliases(self, session, mocker):
+        iter_mock = mocker.patch.object(
+            session,
+            "iter_records",
+            return_value=iter([("isbn:9782253138938", {"type": "edition"})]),
+        )
+
+        pairs = EntitiesEndpoints(session).get_entities_by_uris(
+            "isbn:2253138932|isbn:9782253138938|isbn:bad", stream=True
+        )
+
+        assert list(pairs) == [
+            ("isbn:9782253138938", {"type": "edition"}),
+            ("isbn:2253138932", {"type": "edition"}),
+        ]
+        iter_mock.assert_called_once_with(
+            "get", "entities/by-uris", "entities", params={"uris": "isbn:9782253138938"}
+        )
+
+    def test_by_uris_without_valid_uris_makes_no_request(self, session, mocker):
+        get_mock = mocker.patch.object(session, "get")
+
+        result = EntitiesEndpoints(session).get_entities_by_uris("isbn:bad")
+
+        get_mock.assert_not_called()
+        assert result == {"entities": {}, "redirects": {}, "notFound": ["isbn:bad"]}
+
+    def test_isbn_basic_facts_rejects_invalid_isbn(self, session, mocker):
+        get_mock = mocker.patch.object(session, "get")
+
+        with pytest.raises(ValueError):
+            DataEndpoints(session).get_isbn_basic_facts("2253138938")
+        DataEndpoints(session).get_isbn_basic_facts("2-253-13893-2")
+
+        get_mock.assert_called_once_with(
+            "data/isbn", params={"isbn": "9782253138938"}
+        )
+
+    def test_create_item_rejects_invalid_isbn(self, session, mocker):
+        post_mock = mocker.patch.object(session, "post")
+
+        with pytest.raises(ValueError):
+            ItemsEndpoints(session).create_item("isbn:2253138938")
+
+        post_mock.assert_not_called()
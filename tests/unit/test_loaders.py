@@ -0,0 +1,70 @@
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints, ShelvesEndpoints, UsersEndpoints
+from inventaire.server.loaders import BatchLoader, EntityLoader, ShelfLoader, UserLoader
+
+
+@pytest.mark.unit
+class TestBatchLoader:
+    def test_lookups_are_batched(self):
+        batches = []
+
+        def batch_fn(keys):
+            batches.append(keys)
+            return {key: key.upper() for key in keys if key != "missing"}
+
+        with BatchLoader(batch_fn, max_batch_size=4, wait=1) as loader:
+            futures = loader.load_many(["a", "b", "c", "a", "d", "e", "missing"])
+            loader.flush()
+            values = [future.result(timeout=1) for future in futures]
+
+        assert values == ["A", "B", "C", "A", "D", "E", None]
+        assert sorted(len(batch) for batch in batches) == [2, 4]
+
+    def test_batch_error_is_shared(self):
+        def batch_fn(keys):
+            raise ValueError("boom")
+
+        with BatchLoader(batch_fn) as loader:
+            futures = loader.load_many(["a", "b"])
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=1)
+
+    def test_entity_loader_follows_redirects(self, mocker):
+        entities = mocker.Mock()
+        entities.session.is_async = False
+        entities.get_entities_by_uris.return_value = {
+            "entities": {"wd:Q1": {"uri": "wd:Q1"}},
+            "redirects": {"isbn:9782253138938": "wd:Q1"},
+        }
+
+        with EntityLoader(entities) as loader:
+            futures = loader.load_many(["isbn:9782253138938", "wd:Q1"])
+
+        assert [future.result(timeout=1) for future in futures] == [
+            {"uri": "wd:Q1"}
+        ] * 2
+        entities.get_entities_by_uris.assert_called_once_with(
+            ["isbn:9782253138938", "wd:Q1"]
+        )
+
+    @pytest.mark.parametrize(
+        "loader_class, endpoints_class",
+        [
+            (EntityLoader, EntitiesEndpoints),
+            (UserLoader, UsersEndpoints),
+            (ShelfLoader, ShelvesEndpoints),
+        ],
+    )
+    def test_async_sessions_are_rejected(self, async_session, loader_class, endpoints_class):
+        with pytest.raises(TypeError, match=loader_class.__name__):
+            loader_class(endpoints_class(async_session))
+
+    def test_coroutine_batch_functions_are_rejected(self):
+        async def batch_fn(keys):
+            return {}
+
+        with pytest.raises(TypeError, match="coroutine"):
+            BatchLoader(batch_fn)
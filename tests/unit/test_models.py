@@ -0,0 +1,91 @@
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints, GroupsEndpoints, ItemsEndpoints
+from inventaire.server.models import Entity, Group, Item, User, to_models
+
+ENTITY = {
+    "uri": "wd:Q3203603",
+    "type": "work",
+    "labels": {"fr": "L'Écume des jours", "en": "Froth on the Daydream"},
+    "claims": {"wdt:P31": ["wd:Q47461344"], "wdt:P50": ["wd:Q207576"]},
+    "lastrevid": 1234,
+}
+
+
+@pytest.mark.unit
+class TestModels:
+    def test_models_have_no_instance_dict(self):
+        entity = Entity(ENTITY)
+
+        assert not hasattr(entity, "__dict__")
+        with pytest.raises(AttributeError):
+            entity.extra = True
+
+    def test_entity_fields(self):
+        entity = Entity(ENTITY)
+
+        assert entity.uri == "wd:Q3203603"
+        assert entity.type == "work"
+        assert entity.revision == "1234"
+        assert entity.label("en") == "Froth on the Daydream"
+        assert entity.label("de") == "L'Écume des jours"
+
+    def test_claims_are_parsed_on_first_access(self):
+        entity = Entity(ENTITY)
+
+        assert entity._claims is None
+        assert entity.claim("wdt:P50") == "wd:Q207576"
+        assert entity.claims["wdt:P31"] == ("wd:Q47461344",)
+        assert entity._raw_claims is None
+        assert entity.claim("wdt:P123", "none") == "none"
+
+    def test_uris_are_interned(self):
+        first = Entity({**ENTITY, "uri": "".join(["wd:", "Q1"])})
+        second = Entity({**ENTITY, "uri": "".join(["wd:", "Q1"])})
+
+        assert first.uri is second.uri
+
+    def test_item_listing_from_visibility_or_listing(self):
+        assert Item({"_id": "a", "visibility": ["public"]}).listing == ("public",)
+        assert Item({"_id": "b", "listing": "network"}).listing == ("network",)
+
+    def test_to_models_sections(self):
+        response = to_models(
+            {
+                "items": [{"_id": "a", "entity": "wd:Q1"}],
+                "users": {"u1": {"_id": "u1", "username": "alice"}},
+                "group": {"_id": "g1", "admins": [{"user": "u1"}], "members": []},
+            },
+            {"items": Item, "users": User, "group": Group},
+        )
+
+        assert response["items"][0].entity == "wd:Q1"
+        assert response["users"]["u1"].username == "alice"
+        assert response["group"].admins == ("u1",)
+
+
+@pytest.mark.unit
+class TestEndpointsModels:
+    def test_entities_by_uris_model(self, session, mocker):
+        mocker.patch.object(
+            session, "get", return_value={"entities": {"wd:Q3203603": ENTITY}, "redirects": {}}
+        )
+
+        result = EntitiesEndpoints(session).get_entities_by_uris("wd:Q3203603", model=True)
+
+        assert isinstance(result["entities"]["wd:Q3203603"], Entity)
+        assert result["redirects"] == {}
+
+    def test_raw_json_by_default(self, session, mocker):
+        mocker.patch.object(session, "get", return_value={"group": {"_id": "g1"}})
+
+        assert GroupsEndpoints(session).get_group_by_id("g1") == {"group": {"_id": "g1"}}
+
+    def test_streamed_items_model(self, session, mocker):
+        mocker.patch.object(
+            session, "iter_records", return_value=iter([{"_id": "a"}, {"_id": "b"}])
+        )
+
+        items = ItemsEndpoints(session).get_last_public_items(stream=True, model=True)
+
+        assert [item.id for item in items] == ["a", "b"]
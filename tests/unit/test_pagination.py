@@ -0,0 +1,59 @@
+import pytest
+
+from inventaire.server.endpoints import ItemsEndpoints, SearchEndpoints
+from inventaire.utils.pagination import iter_pages
+
+from .conftest import make_session
+
+
+def make_fetch(total, calls):
+    def fetch(offset, limit):
+        calls.append((offset, limit))
+        return {"items": list(range(offset, min(offset + limit, total)))}
+
+    return fetch
+
+
+@pytest.mark.unit
+class TestPagination:
+    @pytest.mark.parametrize("prefetch", [True, False])
+    @pytest.mark.parametrize("total", [0, 9, 10, 23])
+    def test_walks_every_page(self, total, prefetch):
+        calls = []
+
+        records = list(iter_pages(make_fetch(total, calls), 5, "items", prefetch))
+
+        assert records == list(range(total))
+        assert calls == [(offset, 5) for offset in range(0, total // 5 * 5 + 1, 5)]
+
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_total_outlasts_capped_pages(self, prefetch):
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append((offset, limit))
+            return {"items": list(range(offset, min(offset + 3, 7))), "total": 7}
+
+        records = list(iter_pages(fetch, 5, "items", prefetch))
+
+        assert records == list(range(7))
+        assert calls == [(0, 5), (3, 5), (6, 5)]
+
+    def test_page_params_are_rejected(self):
+        session = make_session()
+
+        with pytest.raises(ValueError, match="limit"):
+            ItemsEndpoints(session).iter_last_public_items(limit=10)
+        with pytest.raises(ValueError, match="offset"):
+            SearchEndpoints(session).iter_search("dune", data={"offset": 5})
+
+    def test_search_pages(self, mocker):
+        session = make_session()
+        get_mock = mocker.patch.object(
+            session, "get", side_effect=[{"results": [1, 2]}, {"results": [3]}]
+        )
+
+        results = list(SearchEndpoints(session).iter_search("dune", page_size=2))
+
+        assert results == [1, 2, 3]
+        assert get_mock.call_args.kwargs["params"]["offset"] == 2
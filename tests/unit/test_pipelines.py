@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from inventaire.server.endpoints import EntitiesEndpoints
+from inventaire.server.pipelines import resolve_entries, resolve_file
+
+
+def fake_resolve(entries, **flags):
+    if any(entry.get("edition", {}).get("isbn") == "bad" for entry in entries):
+        raise ValueError("bad batch")
+    return {
+        "entries": [
+            {
+                "edition": {"uri": f"isbn:{entry['edition']['isbn']}"},
+                "works": [{"uri": "wd:Q1"}],
+                "authors": [],
+            }
+            for entry in entries
+        ]
+    }
+
+
+@pytest.mark.unit
+class TestResolvePipeline:
+    def test_resolve_csv_file(self, session, tmp_path, mocker):
+        source = tmp_path / "books.csv"
+        rows = ["isbn,title,authors"] + [f"978{i:010d},Title {i},A|B" for i in range(7)]
+        rows.insert(4, "bad,Broken,")
+        source.write_text("\n".join(rows) + "\n", encoding="utf-8")
+        destination = tmp_path / "resolved.jsonl"
+        entities = EntitiesEndpoints(session)
+        mocker.patch.object(entities, "resolve_entity", side_effect=fake_resolve)
+
+        count = resolve_file(
+            entities, str(source), str(destination), batch_size=2, max_workers=3
+        )
+
+        results = [json.loads(line) for line in destination.read_text().splitlines()]
+        assert count == 8
+        assert [result["index"] for result in results] == list(range(8))
+        assert "error" in results[2] and "error" in results[3]
+        assert results[0]["edition"] == "isbn:9780000000000"
+        first_entry = entities.resolve_entity.call_args_list[0].args[0][0]
+        assert first_entry["authors"] == [
+            {"labels": {"en": "A"}},
+            {"labels": {"en": "B"}},
+        ]
+
+    def test_async_sessions_are_rejected(self, async_session, mocker):
+        entities = EntitiesEndpoints(async_session)
+        resolve_mock = mocker.patch.object(entities, "resolve_entity")
+
+        with pytest.raises(TypeError, match="resolve_entries"):
+            resolve_entries(entities, [{"edition": {"isbn": "9782253138938"}}])
+
+        resolve_mock.assert_not_called()
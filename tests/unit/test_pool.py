@@ -0,0 +1,44 @@
+import socket
+
+import pytest
+
+from inventaire.inventaire import DEFAULT_BASE_URL
+from inventaire.utils.pool import ConnectionPool, keepalive_socket_options
+
+from .conftest import make_session
+
+
+@pytest.mark.unit
+class TestConnectionPool:
+    def test_pool_shared_between_sessions(self):
+        pool = ConnectionPool(pool_maxsize=32, pool_block=True, tcp_keepalive=True)
+        first = make_session(pool=pool)
+        second = make_session(pool=pool)
+
+        assert first._session.get_adapter(DEFAULT_BASE_URL) is pool.adapter
+        assert second._session.get_adapter(DEFAULT_BASE_URL) is pool.adapter
+        assert pool.adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+        assert pool.adapter.poolmanager.connection_pool_kw["block"] is True
+
+    def test_pool_from_settings(self):
+        session = make_session(pool={"pool_maxsize": 4})
+
+        assert session.pool.adapter._pool_maxsize == 4
+
+    def test_idle_connections_are_dropped(self, mocker):
+        pool = ConnectionPool(idle_timeout=0)
+        clear_mock = mocker.patch.object(pool.adapter.poolmanager, "clear")
+
+        pool.touch()
+
+        clear_mock.assert_called_once()
+
+    @pytest.mark.skipif(
+        not hasattr(socket, "TCP_KEEPIDLE"), reason="TCP_KEEPIDLE not supported"
+    )
+    def test_keepalive_idle(self):
+        pool = ConnectionPool(idle_timeout=0.5, tcp_keepalive=True, keepalive_idle=0.5)
+        keepidle = (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 1)
+
+        assert keepidle in pool.adapter.socket_options
+        assert keepidle not in keepalive_socket_options()
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from inventaire.utils.rate_limit import FileTokenBucket, RateLimiter, TokenBucket
+
+from .conftest import FakeClock
+
+
+@pytest.mark.unit
+class TestRateLimit:
+    def test_token_bucket_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+        assert bucket.try_acquire() == 0
+        assert bucket.try_acquire() == 0
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert bucket.try_acquire() == 0
+
+    def test_file_bucket_is_shared(self, tmp_path):
+        path = str(tmp_path / "bucket")
+        first = FileTokenBucket(path, rate=0.001, capacity=2)
+        second = FileTokenBucket(path, rate=0.001, capacity=2)
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0
+
+    def test_clocks(self, tmp_path):
+        assert TokenBucket(rate=1)._clock is time.monotonic
+        assert FileTokenBucket(str(tmp_path / "bucket"), rate=1)._clock is time.time
+
+    def test_file_bucket_requires_posix_locks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("inventaire.utils.rate_limit.fcntl", None)
+
+        with pytest.raises(OSError, match="POSIX"):
+            FileTokenBucket(str(tmp_path / "bucket"), rate=1)
+
+    def test_group_for(self):
+        limiter = RateLimiter.from_rates({"entities": 10, "writes": 1, "default": 5})
+
+        assert limiter.group_for("get", "entities/by-uris") == "entities"
+        assert limiter.group_for("post", "entities/create") == "writes"
+        assert limiter.group_for("get", "search") == "default"
+        assert RateLimiter({}).acquire("get", "search") == 0
@@ -0,0 +1,95 @@
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+from requests import HTTPError
+
+from inventaire.utils.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+from .conftest import FakeResponse, make_session
+
+SLEEP_PATH = "inventaire.session.time.sleep"
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    def test_backoff_bounds_and_retry_after(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        assert 0 <= policy.backoff(1) <= 2
+        assert policy.backoff(10) <= 5
+        assert policy.backoff(0, retry_after="3") == 3
+        assert policy.backoff(0, retry_after="120") == 120
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+
+        assert policy.should_retry("get", 0, 503)
+        assert policy.should_retry("get", 1, None)
+        assert not policy.should_retry("get", 2, 503)
+        assert not policy.should_retry("get", 0, 404)
+        assert not policy.should_retry("post", 0, 503)
+
+
+@pytest.mark.unit
+class TestSessionRetry:
+    def test_retries_until_success(self, mocker):
+        sleep_mock = mocker.patch(SLEEP_PATH)
+        session = make_session(retry=RetryPolicy(max_retries=3))
+        request_mock = mocker.patch.object(
+            session._session,
+            "request",
+            side_effect=[
+                RequestsConnectionError("reset"),
+                FakeResponse(status_code=429, headers={"Retry-After": "2"}),
+                FakeResponse(status_code=200),
+            ],
+        )
+
+        assert session.get("user") == {}
+        assert request_mock.call_count == 3
+        assert sleep_mock.call_args_list[-1].args == (2.0,)
+
+    def test_gives_up_after_max_retries(self, mocker):
+        mocker.patch(SLEEP_PATH)
+        session = make_session(retry=RetryPolicy(max_retries=2))
+        request_mock = mocker.patch.object(
+            session._session, "request", return_value=FakeResponse(status_code=503)
+        )
+
+        with pytest.raises(HTTPError):
+            session.get("user")
+        assert request_mock.call_count == 3
+
+    def test_gives_up_when_retry_after_exceeds_max_total_time(self, mocker):
+        sleep_mock = mocker.patch(SLEEP_PATH)
+        session = make_session(retry=RetryPolicy(max_total_time=60))
+        request_mock = mocker.patch.object(
+            session._session,
+            "request",
+            return_value=FakeResponse(status_code=503, headers={"Retry-After": "120"}),
+        )
+
+        with pytest.raises(HTTPError):
+            session.get("user")
+        assert request_mock.call_count == 1
+        sleep_mock.assert_not_called()
+
+    def test_circuit_breaker_fails_fast(self, mocker):
+        session = make_session(
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        )
+        request_mock = mocker.patch.object(
+            session._session, "request", return_value=FakeResponse(status_code=502)
+        )
+
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                session.get("user")
+        with pytest.raises(CircuitOpenError):
+            session.get("user")
+        assert request_mock.call_count == 2
@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests import HTTPError
+
+from .conftest import make_session
+
+
+
+class SlowResponse:
+    def __init__(self, status_code=200):
+        time.sleep(0.05)
+        self.status_code = status_code
+        self.content = b'{"results": []}'
+
+
+@pytest.fixture(name="session")
+def fixture_session():
+    return make_session(single_flight=True)
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    def test_concurrent_identical_gets_share_one_request(self, session, mocker):
+        request_mock = mocker.patch.object(
+            session._session, "request", side_effect=lambda **kw: SlowResponse()
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: session.get("search", params={"search": "dune"}),
+                    range(8),
+                )
+            )
+
+        assert request_mock.call_count == 1
+        assert results == [{"results": []}] * 8
+        assert results[0] is not results[1]
+        assert len(session.single_flight) == 0
+
+    def test_shared_error(self, session, mocker):
+        mocker.patch.object(
+            session._session, "request", side_effect=lambda **kw: SlowResponse(500)
+        )
+        errors = []
+
+        def call():
+            try:
+                session.get("search", params={"search": "dune"})
+            except HTTPError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
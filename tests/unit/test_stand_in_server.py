@@ -0,0 +1,131 @@
+import pytest
+from requests import HTTPError
+
+from inventaire.inventaire import Inventaire
+from inventaire.testing.server import Faults, StandInServer, SyntheticApi
+from inventaire.utils.cache import ResponseCache
+from inventaire.utils.retry import RetryPolicy
+
+
+def make_inventaire(server, **kwargs):
+    return Inventaire(base_url=server.url, username="user", password="pwd", **kwargs)
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.mark.unit
+class TestStandInServer:
+    def test_endpoints_against_synthetic_api(self, server):
+        api = make_inventaire(server).api
+
+        entities = api.entities.get_entities_by_uris(["wd:Q1", "isbn:9782253138938"])
+        items = api.items.get_items_by_users("u1", limit=10, offset=45)
+        group = api.groups.get_group_by_id("g1")
+        upload = api.images.upload(image_data=b"jpeg")
+
+        assert set(entities["entities"]) == {"wd:Q1", "isbn:9782253138938"}
+        assert entities["entities"]["isbn:9782253138938"]["type"] == "edition"
+        assert len(items["items"]) == 5
+        assert group["group"]["slug"] == "g1"
+        assert upload["url"].startswith("/img/entities/")
+        assert server.requests[("GET", "entities/by-uris")] == 1
+
+    def test_paginated_collections_are_finite(self):
+        api = SyntheticApi(search_results=45, public_items=30)
+        with StandInServer(api=api) as server:
+            endpoints = make_inventaire(server).api
+            results = list(endpoints.search.iter_search("dune", page_size=20))
+            users = list(endpoints.users.iter_search("alice", page_size=20))
+            items = list(endpoints.items.iter_last_public_items(page_size=20))
+            page = endpoints.search.search("dune", limit=20, data={"offset": 40})
+
+        assert len({result["uri"] for result in results}) == 45
+        assert len(users) == 45
+        assert len({item["_id"] for item in items}) == 30
+        assert len(page["results"]) == 5
+        assert page["total"] == 45
+
+    def test_unknown_route(self, server):
+        with pytest.raises(HTTPError):
+            make_inventaire(server).api.session.get("nothing/here")
+
+    def test_etag_revalidation(self, server):
+        cache = ResponseCache(ttls={"entities/by-uris": 0})
+        entities = make_inventaire(server, cache=cache).api.entities
+
+        first = entities.get_entities_by_uris(["wd:Q1"])
+        second = entities.get_entities_by_uris(["wd:Q1"])
+
+        assert first == second
+        assert server.not_modified == 1
+        assert cache.stats["revalidations"] == 1
+
+    def test_last_modified_revalidation(self, server):
+        session = make_inventaire(server).api.session
+        params = {"uris": "wd:Q1"}
+
+        first = session.get("entities/by-uris", params=params, return_raw=True)
+        last_modified = first.headers["Last-Modified"]
+        unchanged = session.get(
+            "entities/by-uris",
+            params=params,
+            return_raw=True,
+            headers={"If-Modified-Since": last_modified},
+        )
+        older = session.get(
+            "entities/by-uris",
+            params=params,
+            return_raw=True,
+            headers={"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+
+        assert unchanged.status_code == 304
+        assert unchanged.headers["Last-Modified"] == last_modified
+        assert older.status_code == 200
+        assert server.not_modified == 1
+
+    def test_fixtures_override_routes(self):
+        fixtures = {"GET search?search=dune": {"status": 200, "body": '{"results": []}'}}
+        with StandInServer(fixtures=fixtures) as server:
+            session = make_inventaire(server).api.session
+
+            assert session.get("search", params={"search": "dune"}) == {"results": []}
+
+    def test_fixture_entities(self):
+        entity = {"uri": "wd:Q1", "type": "human", "claims": {}}
+        with StandInServer(api=SyntheticApi(entities={"wd:Q1": entity})) as server:
+            response = make_inventaire(server).api.entities.get_entities_by_uris("wd:Q1")
+
+        assert response["entities"]["wd:Q1"] == entity
+
+    def test_throttling_is_retried(self):
+        faults = Faults(throttle_rate=0.5, retry_after=0, seed=1)
+        with StandInServer(faults=faults) as server:
+            session = make_inventaire(
+                server, retry=RetryPolicy(max_retries=10, backoff_factor=0)
+            ).api.session
+            for _ in range(10):
+                session.get("search", params={"search": "dune"})
+
+        assert server.faults_served["throttle"] > 0
+        assert server.requests[("GET", "search")] == 10 + server.faults_served["throttle"]
+
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "fixtures.json")
+        with StandInServer() as upstream:
+            with StandInServer(upstream=upstream.url) as recorder:
+                recorded = make_inventaire(recorder).api.session.get(
+                    "users/by-ids", params={"ids": "u1"}
+                )
+                recorder.save_fixtures(path)
+
+        with StandInServer(fixtures=path, api=SyntheticApi(items_per_user=0)) as replay:
+            replayed = make_inventaire(replay).api.session.get(
+                "users/by-ids", params={"ids": "u1"}
+            )
+
+        assert replayed == recorded
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+from inventaire.inventaire import DEFAULT_BASE_URL, InventaireSession
+from inventaire.server.server_api import InventaireApiWrapper
+
+# Optional or slow to import modules the client must only load when used.
+# Import time itself is measured by the benchmarks suite
+HEAVY_MODULES = (
+    "aiohttp",
+    "asyncio",
+    "http.server",
+    "inventaire.async_session",
+    "inventaire.testing",
+    "orjson",
+    "pyarrow",
+    "sqlite3",
+    "ujson",
+)
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+
+
+@pytest.mark.unit
+class TestStartup:
+    def test_package_import_is_lazy(self):
+        loaded = run_python(
+            "import sys, inventaire; "
+            "print(sorted(m for m in sys.modules "
+            "if m.startswith(('inventaire.', 'requests', 'aiohttp'))))"
+        )
+
+        assert loaded.strip() == "[]"
+
+    def test_client_import_skips_heavy_modules(self):
+        loaded = run_python(
+            "import sys; from inventaire import Inventaire; "
+            f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+
+        assert loaded.strip() == "[]"
+
+    def test_endpoints_are_built_once(self):
+        session = InventaireSession(DEFAULT_BASE_URL, username="user", password="pwd")
+        api = InventaireApiWrapper(session)
+
+        assert api.entities is api.entities
+        assert api.items is not api.entities
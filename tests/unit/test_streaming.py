@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from inventaire.server.endpoints import ItemsEndpoints
+from inventaire.utils.streaming import iter_json_records
+
+from .conftest import make_session
+
+PAYLOAD = {
+    "entities": {f"wd:Q{i}": {"uri": f"wd:Q{i}", "rank": i * 10} for i in range(30)},
+    "redirects": {"isbn:9782253138938": "wd:Q1"},
+    "notFound": ["wd:Q0"],
+}
+
+
+def chunked(payload, size):
+    raw = json.dumps(payload).encode()
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+class FakeStreamResponse:
+    status_code = 200
+    content = b""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+@pytest.mark.unit
+class TestStreaming:
+    @pytest.mark.parametrize("size", [1, 7, 4096])
+    def test_object_records(self, size):
+        records = list(iter_json_records(chunked(PAYLOAD, size), "entities"))
+
+        assert dict(records) == PAYLOAD["entities"]
+
+    def test_several_keys(self):
+        records = iter_json_records(chunked(PAYLOAD, 5), ("notFound", "redirects"))
+
+        assert list(records) == [
+            ("redirects", ("isbn:9782253138938", "wd:Q1")),
+            ("notFound", "wd:Q0"),
+        ]
+
+    @pytest.mark.parametrize(
+        "chunks, key, expected",
+        [
+            ([b'{"scores": {"a": 1.', b'5}}'], "scores", [("a", 1.5)]),
+            ([b'{"xs": [1e', b"3]}"], "xs", [1000.0]),
+            ([b'{"xs": [-2.5E', b"+", b"2, 7]}"], "xs", [-250.0, 7]),
+            ([b'{"xs": [1', b"2.", b"25]}"], "xs", [12.25]),
+        ],
+    )
+    def test_number_split_across_chunks(self, chunks, key, expected):
+        assert list(iter_json_records(chunks, key)) == expected
+
+    def test_truncated_stream(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records([b'{"items": [{"a": 1},'], "items"))
+
+    def test_endpoint_stream(self, mocker):
+        session = make_session()
+        items = [{"_id": str(i)} for i in range(5)]
+        mocker.patch.object(
+            session._session,
+            "request",
+            return_value=FakeStreamResponse(chunked({"items": items}, 3)),
+        )
+
+        result = ItemsEndpoints(session).get_last_public_items(stream=True, limit=5)
+
+        assert list(result) == items